@@ -1,3 +1,4 @@
+import sys
 import pandas as pd
 from pathlib import Path
 import plotly.express as px
@@ -6,14 +7,24 @@ import streamlit as st
 st.set_page_config(page_title="IA-FINANCIERA Dashboard", layout="wide")
 
 CSV = Path("models/prob_summary.csv")
-if not CSV.exists():
-    st.error("No existe models/prob_summary.csv. Corre primero el pipeline.")
+DB = Path("data/warehouse.db")
+if DB.exists():
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from etl.warehouse import latest_signals
+    df = latest_signals(DB)
+    SOURCE = str(DB)
+elif CSV.exists():
+    df = pd.read_csv(CSV)
+    SOURCE = str(CSV)
+else:
+    st.error("No existe data/warehouse.db ni models/prob_summary.csv. Corre primero el pipeline.")
     st.stop()
 
-df = pd.read_csv(CSV)
 df = df.drop_duplicates(subset=["ticker"], keep="last").copy()
 df["confianza"] = (df["proba_ens"] - 0.5).abs()
 df = df.sort_values("confianza", ascending=False).reset_index(drop=True)
+# miembros del ensemble presentes (logreg / rf / hgb ...) + ensemble al final
+proba_cols = [c for c in df.columns if c.startswith("proba_") and c != "proba_ens"] + ["proba_ens"]
 
 st.title("📊 IA-FINANCIERA — Resumen de Probabilidades")
 
@@ -32,14 +43,13 @@ with col1:
                            title=f"Top‑{topn} Bajistas (ENS)"), use_container_width=True)
 
 with col2:
-    st.subheader("Mapa de calor (LogReg / RF / Ensemble)")
-    show_cols = ["proba_logreg","proba_rf","proba_ens"]
-    df_heat = df[["ticker"]+show_cols].copy().set_index("ticker")
+    st.subheader("Mapa de calor (modelos / Ensemble)")
+    df_heat = df[["ticker"]+proba_cols].copy().set_index("ticker")
     st.plotly_chart(px.imshow(df_heat.T, aspect="auto", color_continuous_scale="Viridis",
                               labels=dict(x="Ticker", y="Modelo", color="Proba subir")),
                     use_container_width=True)
 
 st.subheader("Tabla detallada")
-st.dataframe(df[["ticker","proba_logreg","proba_rf","proba_ens","pred","confianza"]],
+st.dataframe(df[["ticker",*proba_cols,"pred","confianza"]],
              use_container_width=True)
-st.caption("Fuente: models/prob_summary.csv")
+st.caption(f"Fuente: {SOURCE}")
@@ -0,0 +1,78 @@
+"""In-process registry of transformed frames: ETL → training handoff without a CSV round-trip.
+
+ETL registers each merged frame under its CSV path and hands the disk write to a
+single background writer thread; trainers look the path up here before parsing the file.
+"""
+from __future__ import annotations
+import fnmatch
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+import pandas as pd
+
+def _key(path: str | Path) -> str:
+    return str(Path(path).resolve())
+
+class DatasetRegistry:
+    def __init__(self):
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+        self._writer: ThreadPoolExecutor | None = None
+
+    def put(self, path: str | Path, df: pd.DataFrame) -> None:
+        with self._lock:
+            self._frames[_key(path)] = df
+
+    def get(self, path: str | Path) -> pd.DataFrame | None:
+        with self._lock:
+            return self._frames.get(_key(path))
+
+    def __contains__(self, path) -> bool:
+        return self.get(path) is not None
+
+    def paths(self, folder: str | Path, pattern: str) -> List[Path]:
+        folder = _key(folder)
+        with self._lock:
+            keys = list(self._frames)
+        return [Path(k) for k in keys if str(Path(k).parent) == folder and fnmatch.fnmatch(Path(k).name, pattern)]
+
+    def persist(self, path: str | Path, write: Callable[[], object]) -> Future:
+        """Schedules ``write`` on the background writer (one thread: writes keep submission order)."""
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dataset-writer")
+            fut = self._writer.submit(write)
+            self._pending.append(fut)
+        return fut
+
+    def flush(self) -> int:
+        """Waits for pending writes; returns how many failed (errors are logged, not raised)."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        failed = 0
+        for fut in pending:
+            try:
+                fut.result()
+            except Exception as e:
+                failed += 1
+                logging.error(f"Escritura en segundo plano falló: {e}")
+        return failed
+
+    def clear(self) -> None:
+        self.flush()
+        with self._lock:
+            self._frames.clear()
+            if self._writer is not None:
+                self._writer.shutdown(wait=True); self._writer = None
+
+REGISTRY = DatasetRegistry()
+
+def dataset_paths(folder: str | Path, pattern: str, registry: DatasetRegistry = REGISTRY) -> List[Path]:
+    """Files on disk plus frames registered but possibly not yet written, sorted by name."""
+    found = {_key(p): Path(p) for p in Path(folder).glob(pattern)}
+    for p in registry.paths(folder, pattern):
+        found.setdefault(_key(p), p)
+    return sorted(found.values(), key=lambda p: p.name)
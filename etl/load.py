@@ -1,8 +1,11 @@
 from __future__ import annotations
 from pathlib import Path
 import logging
-from typing import List
+from typing import Callable, List
 import pandas as pd
+from etl.readers import read_ohlcv
+from etl.dataset_registry import DatasetRegistry, REGISTRY
+from etl.validate import dedupe_and_validate, append_report
 
 def _strip_cols(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy(); df.columns = [str(c).strip() for c in df.columns]; return df
@@ -26,39 +29,72 @@ def _coerce_keys(df: pd.DataFrame, out_path: Path, ticker_hint: str | None = Non
         df["Ticker"] = ticker
     return _strip_cols(df)
 
-def save_csv_idempotent(df: pd.DataFrame, out_path: str | Path, dedupe_keys: List[str] = ["Datetime","Ticker"]) -> Path:
-    out_path = Path(out_path); out_path.parent.mkdir(parents=True, exist_ok=True)
+def merge_idempotent(df: pd.DataFrame, out_path: str | Path, dedupe_keys: List[str] = ["Datetime","Ticker"],
+                     quality_log: str | Path | None = None, old: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Merges ``df`` with the existing data for ``out_path`` (``old`` or the CSV on disk), dedupes and validates."""
+    out_path = Path(out_path)
     df = _coerce_keys(df.copy(), out_path)
-    if out_path.exists():
+    if old is not None:
+        merged = pd.concat([old, df], ignore_index=True)
+    elif out_path.exists():
         try:
-            old = pd.read_csv(out_path)
+            old = read_ohlcv(out_path)
             old = _coerce_keys(old, out_path)
             merged = pd.concat([old, df], ignore_index=True)
         except Exception as e:
             logging.warning(f"Problema leyendo {out_path}: {e}; guardo solo DF nuevo.")
-            merged = df.copy()
+            merged = df
     else:
-        merged = df.copy()
-    merged = _coerce_keys(merged, out_path)
+        merged = df
     available_keys = [k for k in dedupe_keys if k in merged.columns]
     logging.info(f"Claves para dedupe: {available_keys}")
-    if available_keys:
-        merged = merged.drop_duplicates(subset=available_keys, keep="last")
+    if set(available_keys) == {"Datetime","Ticker"}:
+        # motor vectorizado: claves int64 (ticker_id, epoch_ns), dedupe + validación en una pasada
+        merged, report = dedupe_and_validate(merged)
+        if quality_log:
+            append_report(report, quality_log, file=out_path.name)
     else:
-        merged = merged.drop_duplicates(keep="last")
-    if "Datetime" in merged.columns:
-        merged = merged.sort_values(["Ticker","Datetime"] if "Ticker" in merged.columns else ["Datetime"])
-    merged = merged.reset_index(drop=True)
-    if "Datetime" in merged.columns and merged["Datetime"].isna().any():
-        raise ValueError("NaT en 'Datetime' tras normalizar")
-    if "Datetime" in merged.columns:
-        if "Ticker" in merged.columns:
-            for t, grp in merged.groupby("Ticker"):
-                if not grp["Datetime"].is_monotonic_increasing:
-                    raise ValueError(f"Datetime no ascendente para Ticker={t}")
-        else:
-            if not merged["Datetime"].is_monotonic_increasing:
-                raise ValueError("Datetime no ascendente")
-    merged.to_csv(out_path, index=False)
+        merged = merged.drop_duplicates(subset=available_keys or None, keep="last")
+        if "Datetime" in merged.columns:
+            merged = merged.sort_values(["Ticker","Datetime"] if "Ticker" in merged.columns else ["Datetime"])
+        merged = merged.reset_index(drop=True)
+        if "Datetime" in merged.columns and merged["Datetime"].isna().any():
+            raise ValueError("NaT en 'Datetime' tras normalizar")
+    return merged
+
+def _write_csv(merged: pd.DataFrame, out_path: Path) -> Path:
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    merged.to_csv(tmp, index=False)
+    tmp.replace(out_path)  # los lectores nunca ven un CSV a medio escribir
     logging.info(f"Saved: {out_path} ({len(merged)} rows)")
     return out_path
+
+def save_csv_idempotent(df: pd.DataFrame, out_path: str | Path, dedupe_keys: List[str] = ["Datetime","Ticker"],
+                        quality_log: str | Path | None = None) -> Path:
+    out_path = Path(out_path); out_path.parent.mkdir(parents=True, exist_ok=True)
+    merged = merge_idempotent(df, out_path, dedupe_keys=dedupe_keys, quality_log=quality_log)
+    return _write_csv(merged, out_path)
+
+def stage_csv_idempotent(df: pd.DataFrame, out_path: str | Path, dedupe_keys: List[str] = ["Datetime","Ticker"],
+                         quality_log: str | Path | None = None, registry: DatasetRegistry = REGISTRY) -> Path:
+    """Like ``save_csv_idempotent`` but the merged frame is registered in memory for the
+    trainers right away and the CSV is written by the registry's background writer."""
+    out_path = Path(out_path); out_path.parent.mkdir(parents=True, exist_ok=True)
+    merged = merge_idempotent(df, out_path, dedupe_keys=dedupe_keys, quality_log=quality_log,
+                              old=registry.get(out_path))
+    registry.put(out_path, merged)
+    registry.persist(out_path, lambda: _write_csv(merged, out_path))
+    return out_path
+
+def restage_frames(paths: List[Path], fn: Callable[[dict], dict], registry: DatasetRegistry = REGISTRY) -> int:
+    """Loads the staged frames of ``paths`` as one ``{path: frame}`` dict, passes it to ``fn``
+    (a whole-universe stage such as the cross-sectional features) and re-stages what it returns;
+    returns the file count. Runs after every ticker is merged, so ``fn`` sees the full universe."""
+    frames = {}
+    for p in map(Path, paths):
+        df = registry.get(p)
+        frames[p] = df if df is not None else _coerce_keys(read_ohlcv(p), p)
+    for p, df in fn(frames).items():
+        registry.put(p, df)
+        registry.persist(p, lambda df=df, p=p: _write_csv(df, p))
+    return len(frames)
@@ -0,0 +1,111 @@
+"""Columnar prediction store: one partitioned Parquet dataset instead of a CSV per model per split.
+
+Layout: ``<root>/run_id=<id>/ticker=<T>/part-<uuid>.parquet`` (hive partitioning), columns
+(model, split, interval, Datetime, y_true, y_pred). Writers buffer rows and write one file per
+ticker on flush, so parallel training processes never touch the same file.
+"""
+from __future__ import annotations
+import uuid
+from pathlib import Path
+from urllib.parse import quote, unquote
+from typing import List, Sequence
+import pandas as pd
+try:
+    import pyarrow as pa  # optional
+    import pyarrow.dataset as pads
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+    SCHEMA = pa.schema([("model", pa.string()), ("split", pa.int32()), ("interval", pa.string()),
+                        ("Datetime", pa.timestamp("ns", tz="UTC")), ("y_true", pa.float64()), ("y_pred", pa.float64())])
+except Exception:
+    HAS_PYARROW = False
+
+DEFAULT_ROOT = Path("data/preds/store")
+COLUMNS = ["model", "split", "interval", "Datetime", "y_true", "y_pred"]
+PARTITIONS = ["run_id", "ticker"]
+
+def _require_pyarrow() -> None:
+    if not HAS_PYARROW:
+        raise ImportError("El almacén de predicciones requiere pyarrow (pip install pyarrow)")
+
+class PredictionWriter:
+    """Buffered appender for one run; ``append`` frames with Ticker/Datetime/model/split/y_true/y_pred."""
+    def __init__(self, run_id: str, root: str | Path = DEFAULT_ROOT, buffer_rows: int = 200_000):
+        _require_pyarrow()
+        self.run_id = str(run_id)
+        self.root = Path(root)
+        self.buffer_rows = buffer_rows
+        self._frames: List[pd.DataFrame] = []
+        self._rows = 0
+        self.written = 0
+
+    def append(self, df: pd.DataFrame, interval: str | None = None) -> None:
+        if df is None or df.empty:
+            return
+        out = pd.DataFrame({
+            "ticker": df["Ticker"].astype(str).to_numpy(),
+            "model": df["model"].astype(str).to_numpy(),
+            "split": df["split"].astype("int32").to_numpy(),
+            "interval": interval if interval is not None else df.get("Interval", pd.Series([None] * len(df))).to_numpy(),
+            "Datetime": pd.to_datetime(df["Datetime"], utc=True).to_numpy(),
+            "y_true": df["y_true"].astype(float).to_numpy(),
+            "y_pred": df["y_pred"].astype(float).to_numpy(),
+        })
+        self._frames.append(out); self._rows += len(out)
+        if self._rows >= self.buffer_rows:
+            self.flush()
+
+    def flush(self) -> int:
+        if not self._frames:
+            return 0
+        df = pd.concat(self._frames, ignore_index=True)
+        self._frames, self._rows = [], 0
+        # ordenar por modelo: estadísticas de row group útiles para filtrar por modelo
+        df["Datetime"] = pd.to_datetime(df["Datetime"], utc=True)
+        for ticker, part in df.sort_values(["ticker", "model", "split", "Datetime"], kind="stable").groupby("ticker", sort=False):
+            # segmentos codificados como URI (p. ej. "EURUSD=X"); pyarrow los decodifica al leer
+            d = self.root / f"run_id={quote(self.run_id, safe='')}" / f"ticker={quote(str(ticker), safe='')}"
+            d.mkdir(parents=True, exist_ok=True)
+            tmp = d / f".part-{uuid.uuid4().hex}.tmp"
+            pq.write_table(pa.Table.from_pandas(part[COLUMNS], schema=SCHEMA, preserve_index=False), tmp)
+            tmp.replace(d / f"part-{uuid.uuid4().hex}.parquet")
+        self.written += len(df)
+        return len(df)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "PredictionWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def _dataset(root: str | Path):
+    _require_pyarrow()
+    part = pads.partitioning(pa.schema([("run_id", pa.string()), ("ticker", pa.string())]), flavor="hive")
+    return pads.dataset(str(root), schema=pa.unify_schemas([SCHEMA, part.schema]), format="parquet",
+                        partitioning=part, ignore_prefixes=[".", "_"])
+
+def _isin(field: str, value) -> "pads.Expression":
+    values = [value] if isinstance(value, str) else list(value)
+    return pads.field(field).isin(values)
+
+def read_predictions(root: str | Path = DEFAULT_ROOT, run_id: str | None = None,
+                     ticker: str | Sequence[str] | None = None, model: str | Sequence[str] | None = None,
+                     columns: Sequence[str] | None = None) -> pd.DataFrame:
+    """Predictions filtered by run / ticker(s) / model(s); partition filters skip whole directories."""
+    root = Path(root)
+    if not root.exists():
+        return pd.DataFrame(columns=PARTITIONS + COLUMNS)
+    flt = None
+    for field, value in (("run_id", run_id), ("ticker", ticker), ("model", model)):
+        if value is not None:
+            e = _isin(field, value)
+            flt = e if flt is None else flt & e
+    table = _dataset(root).to_table(columns=list(columns) if columns else None, filter=flt)
+    return table.to_pandas()
+
+def list_runs(root: str | Path = DEFAULT_ROOT) -> List[str]:
+    root = Path(root)
+    return sorted(unquote(p.name.split("=", 1)[1]) for p in root.glob("run_id=*") if p.is_dir()) if root.exists() else []
@@ -0,0 +1,60 @@
+"""Fast OHLCV/feature CSV reader: pyarrow CSV engine, declared schema, column projection."""
+from __future__ import annotations
+import csv
+import logging
+from pathlib import Path
+from typing import Sequence
+import pandas as pd
+try:
+    import pyarrow as pa  # optional
+    import pyarrow.csv as pacsv
+    HAS_PYARROW = True
+except Exception:
+    HAS_PYARROW = False
+
+STRING_COLS = ("Ticker", "Interval")
+TIME_COL = "Datetime"
+
+def read_header(path: str | Path) -> list[str]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return [c.strip() for c in next(csv.reader(f), [])]
+
+def ohlcv_schema(columns: Sequence[str]) -> dict:
+    """Datetime → timestamp[ns, UTC], Ticker/Interval → string, everything else → float64."""
+    schema = {}
+    for c in columns:
+        if c == TIME_COL:
+            schema[c] = pa.timestamp("ns", tz="UTC")
+        elif c in STRING_COLS:
+            schema[c] = pa.string()
+        else:
+            schema[c] = pa.float64()
+    return schema
+
+def _read_pandas(path: Path, columns: Sequence[str] | None) -> pd.DataFrame:
+    df = pd.read_csv(path, usecols=list(columns) if columns else None)
+    if TIME_COL in df.columns:
+        df[TIME_COL] = pd.to_datetime(df[TIME_COL], utc=True, errors="coerce")
+    return df
+
+def read_ohlcv(path: str | Path, columns: Sequence[str] | None = None) -> pd.DataFrame:
+    """Reads a pipeline CSV with multithreaded parsing and only the requested columns.
+
+    Falls back to the pandas C parser when pyarrow is missing or the file does not
+    match the declared schema (e.g. mixed timestamp formats or extra text columns).
+    """
+    path = Path(path)
+    if not HAS_PYARROW:
+        return _read_pandas(path, columns)
+    cols = list(columns) if columns else read_header(path)
+    try:
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 24),
+            convert_options=pacsv.ConvertOptions(column_types=ohlcv_schema(cols), include_columns=cols,
+                                                 strings_can_be_null=True),
+        )
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, KeyError) as e:
+        logging.debug(f"read_ohlcv: esquema no aplicable a {path.name} ({e}); uso parser de pandas")
+        return _read_pandas(path, columns)
+    return table.to_pandas()
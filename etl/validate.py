@@ -0,0 +1,67 @@
+"""Vectorized key validation and deduplication on int64 (ticker_id, epoch_ns) keys."""
+from __future__ import annotations
+import json
+import logging
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+_NAT = np.iinfo(np.int64).min
+
+def encode_keys(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns (ticker_id, epoch_ns, ticker_labels); NaT is encoded as int64 min."""
+    dt = pd.to_datetime(df["Datetime"], utc=True, errors="coerce")
+    epoch = dt.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    if "Ticker" in df.columns:
+        codes, labels = pd.factorize(df["Ticker"].astype(str), sort=True)
+        tid = codes.astype(np.int64)
+    else:
+        tid, labels = np.zeros(len(df), dtype=np.int64), np.array([], dtype=object)
+    return tid, epoch, np.asarray(labels)
+
+def dedupe_and_validate(df: pd.DataFrame, gap_factor: float = 5.0) -> tuple[pd.DataFrame, dict]:
+    """Keeps the last row per (Ticker, Datetime), sorts by key and checks NaT,
+    monotonicity and gaps in one pass over the encoded keys."""
+    tid, epoch, labels = encode_keys(df)
+    n = len(epoch)
+    nat = int((epoch == _NAT).sum())
+    if nat:
+        raise ValueError("NaT en 'Datetime' tras normalizar")
+    # orden de entrada: filas que retroceden en el tiempo dentro del mismo ticker
+    same_in = tid[1:] == tid[:-1]
+    out_of_order = int((same_in & (epoch[1:] < epoch[:-1])).sum())
+
+    order = np.lexsort((epoch, tid))  # estable: a igual clave conserva el orden original
+    t_s, e_s = tid[order], epoch[order]
+    dup_next = (t_s[1:] == t_s[:-1]) & (e_s[1:] == e_s[:-1])
+    keep = np.ones(n, dtype=bool); keep[:-1] = ~dup_next  # keep="last"
+    rows = order[keep]; t_k, e_k = t_s[keep], e_s[keep]
+
+    same = t_k[1:] == t_k[:-1]
+    steps = (e_k[1:] - e_k[:-1])[same]
+    median_step = int(np.median(steps)) if len(steps) else 0
+    gap_mask = steps > gap_factor * median_step if median_step else np.zeros(0, dtype=bool)
+
+    out = df.iloc[rows].reset_index(drop=True)
+    report = {
+        "rows_in": int(n),
+        "rows_out": int(len(rows)),
+        "duplicates": int(n - len(rows)),
+        "nat": nat,
+        "out_of_order": out_of_order,
+        "tickers": [str(x) for x in labels],
+        "median_step_s": median_step / 1e9,
+        "gaps": int(gap_mask.sum()),
+        "max_gap_s": float(steps.max() / 1e9) if len(steps) else 0.0,
+        "first": str(out["Datetime"].iloc[0]) if len(out) else None,
+        "last": str(out["Datetime"].iloc[-1]) if len(out) else None,
+    }
+    return out, report
+
+def append_report(report: dict, path: str | Path, **extra) -> Path:
+    """Appends one JSON line per save (e.g. logs/data_quality.jsonl)."""
+    path = Path(path); path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps({**extra, **report}) + "\n")
+    logging.info(f"Data quality: {extra} {report['rows_out']} filas, {report['duplicates']} duplicados, {report['gaps']} huecos")
+    return path
@@ -0,0 +1,161 @@
+"""Local SQLite warehouse implementing the SIGNALS/TICKER/DATE/MODEL star schema."""
+from __future__ import annotations
+import sqlite3
+from pathlib import Path
+from typing import Iterable
+import pandas as pd
+
+DEFAULT_DB = Path("data/warehouse.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dim_ticker (
+    ticker      TEXT PRIMARY KEY,
+    asset_class TEXT
+);
+CREATE TABLE IF NOT EXISTS dim_date (
+    datetime TEXT PRIMARY KEY,
+    year     INTEGER,
+    month    INTEGER,
+    day      INTEGER
+);
+CREATE TABLE IF NOT EXISTS dim_model (
+    name  TEXT PRIMARY KEY,
+    type  TEXT,
+    notes TEXT
+);
+CREATE TABLE IF NOT EXISTS signals (
+    ticker   TEXT NOT NULL,
+    datetime TEXT NOT NULL,
+    model    TEXT NOT NULL,
+    proba_up REAL,
+    pred     TEXT,
+    y_true   INTEGER,
+    PRIMARY KEY (ticker, datetime, model)
+);
+CREATE TABLE IF NOT EXISTS predictions (
+    ticker   TEXT NOT NULL,
+    datetime TEXT NOT NULL,
+    model    TEXT NOT NULL,
+    run_id   TEXT NOT NULL,
+    split    INTEGER,
+    y_true   REAL,
+    y_pred   REAL,
+    PRIMARY KEY (ticker, datetime, model, run_id)
+);
+CREATE INDEX IF NOT EXISTS ix_signals_model_dt ON signals (model, datetime);
+CREATE INDEX IF NOT EXISTS ix_predictions_run ON predictions (run_id, ticker, model);
+"""
+
+def connect(db_path: str | Path = DEFAULT_DB) -> sqlite3.Connection:
+    db_path = Path(db_path); db_path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(db_path, timeout=60)  # varios procesos de entrenamiento escriben a la vez
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript(_SCHEMA)
+    return con
+
+def _iso(dt: pd.Series) -> pd.Series:
+    # UTC en texto ISO: el orden lexicográfico coincide con el temporal
+    return pd.to_datetime(dt, utc=True, errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
+
+def _asset_class(ticker: str) -> str:
+    return "crypto" if ticker.upper().endswith("-USD") else "equity"
+
+def _upsert_dims(con: sqlite3.Connection, tickers: Iterable[str], datetimes: Iterable[str],
+                 models: Iterable[str], model_type: str):
+    con.executemany("INSERT OR IGNORE INTO dim_ticker VALUES (?, ?)",
+                    [(t, _asset_class(t)) for t in set(tickers)])
+    con.executemany("INSERT OR IGNORE INTO dim_date VALUES (?, ?, ?, ?)",
+                    [(d, int(d[:4]), int(d[5:7]), int(d[8:10])) for d in set(datetimes)])
+    con.executemany("INSERT OR IGNORE INTO dim_model VALUES (?, ?, ?)",
+                    [(m, model_type, None) for m in set(models)])
+
+def write_signals(rows: list[dict] | pd.DataFrame, db_path: str | Path = DEFAULT_DB) -> int:
+    """Bulk-insert classifier trace rows (wide ``proba_<model>`` columns) as long SIGNALS facts."""
+    wide = pd.DataFrame(rows)
+    if wide.empty:
+        return 0
+    proba_cols = [c for c in wide.columns if c.startswith("proba_")]
+    long = wide.melt(id_vars=["Datetime","ticker"] + (["y_true_next"] if "y_true_next" in wide.columns else []),
+                     value_vars=proba_cols, var_name="model", value_name="proba_up")
+    long["model"] = long["model"].str.slice(len("proba_"))
+    long["datetime"] = _iso(long["Datetime"])
+    long = long.dropna(subset=["datetime","proba_up"])
+    long["pred"] = (long["proba_up"] >= 0.5).map({True: "UP", False: "DOWN"})
+    y_true = long["y_true_next"].astype("Int64") if "y_true_next" in long.columns else pd.Series(pd.NA, index=long.index)
+    recs = list(zip(long["ticker"], long["datetime"], long["model"], long["proba_up"].astype(float),
+                    long["pred"], [None if pd.isna(v) else int(v) for v in y_true]))
+    con = connect(db_path)
+    try:
+        with con:
+            _upsert_dims(con, long["ticker"], long["datetime"], long["model"], "classifier")
+            con.executemany("INSERT OR REPLACE INTO signals VALUES (?, ?, ?, ?, ?, ?)", recs)
+    finally:
+        con.close()
+    return len(recs)
+
+def write_predictions(df: pd.DataFrame, run_id: str, db_path: str | Path = DEFAULT_DB) -> int:
+    """Bulk-insert regression predictions (Datetime, Ticker, model, split, y_true, y_pred)."""
+    if df is None or df.empty:
+        return 0
+    dt = _iso(df["Datetime"])
+    recs = list(zip(df["Ticker"].astype(str), dt, df["model"].astype(str), [run_id] * len(df),
+                    df["split"].astype(int), df["y_true"].astype(float), df["y_pred"].astype(float)))
+    con = connect(db_path)
+    try:
+        with con:
+            _upsert_dims(con, df["Ticker"].astype(str), dt, df["model"].astype(str), "regressor")
+            con.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?, ?)", recs)
+    finally:
+        con.close()
+    return len(recs)
+
+def _where(ticker=None, model=None, start=None, end=None, run_id=None) -> tuple[str, list]:
+    cond, args = [], []
+    if ticker is not None: cond.append("ticker = ?"); args.append(ticker)
+    if model is not None: cond.append("model = ?"); args.append(model)
+    if run_id is not None: cond.append("run_id = ?"); args.append(run_id)
+    if start is not None: cond.append("datetime >= ?"); args.append(_iso(pd.Series([start])).iloc[0])
+    if end is not None: cond.append("datetime <= ?"); args.append(_iso(pd.Series([end])).iloc[0])
+    return (" WHERE " + " AND ".join(cond)) if cond else "", args
+
+def query_signals(db_path: str | Path = DEFAULT_DB, ticker: str | None = None, model: str | None = None,
+                  start=None, end=None) -> pd.DataFrame:
+    where, args = _where(ticker=ticker, model=model, start=start, end=end)
+    con = connect(db_path)
+    try:
+        df = pd.read_sql_query(f"SELECT * FROM signals{where} ORDER BY ticker, datetime, model", con, params=args)
+    finally:
+        con.close()
+    df["datetime"] = pd.to_datetime(df["datetime"], utc=True)
+    return df
+
+def query_predictions(db_path: str | Path = DEFAULT_DB, ticker: str | None = None, model: str | None = None,
+                      run_id: str | None = None, start=None, end=None) -> pd.DataFrame:
+    where, args = _where(ticker=ticker, model=model, start=start, end=end, run_id=run_id)
+    con = connect(db_path)
+    try:
+        df = pd.read_sql_query(f"SELECT * FROM predictions{where} ORDER BY ticker, datetime, model", con, params=args)
+    finally:
+        con.close()
+    df["datetime"] = pd.to_datetime(df["datetime"], utc=True)
+    return df
+
+def latest_signals(db_path: str | Path = DEFAULT_DB) -> pd.DataFrame:
+    """Última señal por ticker en formato ancho (mismo layout que prob_summary.csv)."""
+    con = connect(db_path)
+    try:
+        df = pd.read_sql_query(
+            "SELECT s.ticker, s.datetime, s.model, s.proba_up FROM signals s "
+            "JOIN (SELECT ticker, MAX(datetime) AS datetime FROM signals GROUP BY ticker) l "
+            "ON s.ticker = l.ticker AND s.datetime = l.datetime", con)
+    finally:
+        con.close()
+    if df.empty:
+        return pd.DataFrame(columns=["ticker","last_date","proba_ens","pred"])
+    wide = df.pivot(index=["ticker","datetime"], columns="model", values="proba_up")
+    wide.columns = [f"proba_{c}" for c in wide.columns]
+    wide = wide.reset_index().rename(columns={"datetime":"last_date"})
+    if "proba_ens" in wide.columns:
+        wide["pred"] = (wide["proba_ens"] >= 0.5).map({True: "UP", False: "DOWN"})
+    return wide
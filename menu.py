@@ -7,11 +7,15 @@ from utils.logging_cfg import setup_logging
 from utils.log_cleanup import cleanup_logs  
 from etl.extract import fetch_tickers
 from etl.transform import transform_frame
-from etl.load import save_csv_idempotent
+from etl.load import restage_frames, stage_csv_idempotent
+from etl.dataset_registry import REGISTRY, dataset_paths
+from models.features import add_cross_sectional_features
 # Regresión
 from models.train_all import run_for_folder as run_regression_folder
 # Clasificación direccional 
 from models.train_direction import run_folder as run_classif_folder
+# Ambos en una sola pasada por ticker (una carga y un calendario de folds)
+from models.train_fused import run_fused_folder
 
 # Intervalos válidos 
 VALID_INTERVALS = {
@@ -67,6 +71,14 @@ def run_everything_once(cfg, logger):
     top_n = int(cfg.get("default_top_n", 10))
     data_dir = Path(cfg.get("data_dir","data/raw")); data_dir.mkdir(parents=True, exist_ok=True)
     features = cfg.get("features",{})
+    warehouse = Path(cfg.get("warehouse","data/warehouse.db"))
+    quality_log = Path(cfg.get("logs_dir","logs")) / "data_quality.jsonl"
+    artifacts = cfg.get("artifacts")  # estimadores ajustados reutilizables (None = desactivado)
+    # folds anclados + caché persistente: una corrida diaria solo ajusta los folds nuevos
+    initial_train = cfg.get("initial_train")
+    fold_cache = cfg.get("fold_cache")
+    signal_mode = cfg.get("signal_mode", "nowcast")  # nowcast: solo la señal de la última barra (walk-forward: opción 2)
+    registry = cfg.get("registry")  # modelos versionados para nowcast (None = reentrenar siempre)
 
     # Universos de mercados 
     tickers = _all_tickers_from_presets()
@@ -87,7 +99,7 @@ def run_everything_once(cfg, logger):
             if "Interval" not in df_tf.columns:
                 df_tf["Interval"] = interval
             out_path = data_dir / f"{t}_{interval}.csv"
-            save_csv_idempotent(df_tf, out_path, dedupe_keys=["Datetime","Ticker"])
+            stage_csv_idempotent(df_tf, out_path, dedupe_keys=["Datetime","Ticker"], quality_log=quality_log)
             print(f"  ✅ {out_path}")
             ok += 1
         except Exception as e:
@@ -110,7 +122,7 @@ def run_everything_once(cfg, logger):
                 if "Interval" not in df_tf.columns:
                     df_tf["Interval"] = interval
                 out_path = data_dir / f"{t}_{interval}.csv"
-                save_csv_idempotent(df_tf, out_path, dedupe_keys=["Datetime","Ticker"])
+                stage_csv_idempotent(df_tf, out_path, dedupe_keys=["Datetime","Ticker"], quality_log=quality_log)
                 print(f"  ✅ {out_path} (reintento)")
                 ok += 1
             except Exception as e:
@@ -124,6 +136,43 @@ def run_everything_once(cfg, logger):
         print("No hubo CSVs transformados. Abortando.")
         return
 
+    # Features cross-sectional (rank / z-score / residuo de mercado por fecha) con el universo completo
+    cs_cfg = features.get("cross_sectional")
+    if cs_cfg:
+        n_cs = restage_frames(dataset_paths(data_dir, f"*_{interval}.csv"),
+                              lambda frames: add_cross_sectional_features(frames, **cs_cfg))
+        print(f"  ✅ Features cross-sectional en {n_cs} CSVs")
+
+    members = tuple(cfg.get("classifiers", ["logreg", "rf"]))
+    if cfg.get("fused") and signal_mode == "walkforward":
+        print("\n→ Entrenando regresión + clasificación en una pasada (Top‑N + CSV opcional + trazas)...")
+        run_fused_folder(
+            folder=data_dir,
+            pattern=f"*_{interval}.csv",
+            horizon=1,
+            embargo=5,
+            initial_train=initial_train,
+            fold_cache=fold_cache,
+            test_size=200,
+            save_preds=True,
+            save_trace=True,
+            trace_dir=Path("models/traces"),
+            warehouse=warehouse,
+            top_n=top_n,
+            save_summary=save_csv,
+            summary_path=Path("models/prob_summary.csv"),
+            artifacts=artifacts,
+            svr=cfg.get("svr", "auto"),
+            members=members
+        )
+        print("  ✅ Métricas regresión: models/metrics_full.csv")
+        if save_csv:
+            print("  ✅ Resumen: models/prob_summary.csv")
+        _flush_registry()
+        return
+    if cfg.get("fused"):
+        print("  ⚠ fused solo aplica con signal_mode: walkforward; entrenando por separado")
+
     # Entrenamiento de regresión 
     print("\n→ Entrenando regresión (silencioso, guardando predicciones)...")
     run_regression_folder(
@@ -131,27 +180,74 @@ def run_everything_once(cfg, logger):
         target="ret",
         horizon=1,
         embargo=5,
-        save_preds=True   
+        save_preds=True,
+        warehouse=warehouse,
+        svr=cfg.get("svr", "auto"),
+        initial_train=initial_train,
+        fold_cache=fold_cache,
+        artifacts=artifacts
     )
     print("  ✅ Métricas regresión: models/metrics_full.csv")
 
-    # Entrenamiento de clasificación (Top‑N + colores + CSV opcional + trazas)
-    print("\n→ Entrenando clasificación (Top‑N + CSV opcional + trazas)...")
+    # Entrenamiento de clasificación (Top‑N + colores + CSV opcional; trazas solo en walk-forward)
+    walkforward = signal_mode == "walkforward"
+    print(f"\n→ Entrenando clasificación (Top‑N + CSV opcional{' + trazas' if walkforward else ', señal de la última barra'})...")
     run_classif_folder(
         folder=data_dir,
         pattern=f"*_{interval}.csv",
         horizon=1,
-        initial_train=None,
+        initial_train=initial_train,
+        fold_cache=fold_cache,
         test_size=200,
         top_n=top_n,
         save_summary=save_csv,
         summary_path=Path("models/prob_summary.csv"),
         print_summary=True,
-        save_trace=True,                   
-        trace_dir=Path("models/traces")
+        save_trace=walkforward,
+        trace_dir=Path("models/traces") if walkforward else None,
+        warehouse=warehouse,
+        artifacts=artifacts,
+        mode=signal_mode,
+        registry=registry,
+        members=members,
+        cascade=cfg.get("cascade_band")
     )
     if save_csv:
         print("  ✅ Resumen: models/prob_summary.csv")
+    _flush_registry()
+
+def run_evaluation(cfg):
+    """Walk-forward evaluation on the CSVs already in ``data_dir`` (traces + SIGNALS history), on demand:
+    the daily pipeline only nowcasts the newest bar."""
+    interval = (cfg.get("interval","1d") or "1d").lower()
+    data_dir = Path(cfg.get("data_dir","data/raw"))
+    print("\n======== IA-FINANCIERA — EVALUACIÓN WALK-FORWARD ========")
+    run_classif_folder(
+        folder=data_dir,
+        pattern=f"*_{interval}.csv",
+        horizon=1,
+        initial_train=cfg.get("initial_train"),
+        fold_cache=cfg.get("fold_cache"),
+        test_size=200,
+        top_n=int(cfg.get("default_top_n", 10)),
+        save_summary=False,  # prob_summary.csv es la señal diaria
+        print_summary=True,
+        save_trace=True,
+        trace_dir=Path("models/traces"),
+        warehouse=Path(cfg.get("warehouse","data/warehouse.db")),
+        artifacts=cfg.get("artifacts"),
+        mode="walkforward",
+        members=tuple(cfg.get("classifiers", ["logreg", "rf"])),
+        cascade=cfg.get("cascade_band")
+    )
+    print("  ✅ Trazas: models/traces/ (backtest: python -m models.backtest)")
+
+def _flush_registry():
+    # Los CSV de data/raw se escriben en segundo plano; esperar antes de salir
+    failed_writes = REGISTRY.flush()
+    if failed_writes:
+        print(f"  ⚠ {failed_writes} CSV no se pudieron escribir (ver logs)")
+    REGISTRY.clear()
 
 def main():
     setup_logging()
@@ -166,8 +262,12 @@ def main():
         print(f"❌ No pude cargar config.yaml: {e}")
         return
 
-    # Ejecuta una sola vez el pipeline completo
-    run_everything_once(cfg, logger)
+    print("\n1) Pipeline completo (ETL → entrenamiento → señales)")
+    print("2) Evaluación walk-forward (trazas e historial de SIGNALS con los CSV existentes)")
+    if _input("Opción", "1") == "2":
+        run_evaluation(cfg)
+    else:
+        run_everything_once(cfg, logger)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,161 @@
+"""On-disk cache of fitted estimators: skip a (ticker, model, fold) fit when its inputs are unchanged.
+
+Key = hash(training slice X/y, feature columns, estimator hyperparameters). Artifacts are plain
+(uncompressed) joblib files so large arrays (forest nodes) load with ``mmap_mode="r"``; the cache
+is capped at ``max_bytes`` and ``enforce_limit`` evicts least-recently-used files (the runners
+wrap each file in ``evicting``: it scans the whole cache). Forests are tens of MB each, so size the cap
+to the working set (tickers × folds × models) or the LRU evicts them before reuse. Lookups happen in the parent, so
+``hits``/``misses`` are exact even when misses are fitted in worker processes.
+"""
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Sequence
+import joblib
+import numpy as np
+from models.fold_cache import model_digest, prefix_digests
+from utils.parallel import map_folds
+
+DEFAULT_DIR = Path("models/cache/artifacts")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+def features_digest(columns: Sequence[str], extra: object = None) -> str:
+    return hashlib.blake2b(repr((list(columns), extra)).encode(), digest_size=16).hexdigest()
+
+class ArtifactCache:
+    def __init__(self, root: str | Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root); self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0; self.misses = 0
+
+    @staticmethod
+    def key(x_digest: str, y_digest: str, model_fp: str, features_fp: str) -> str:
+        return hashlib.blake2b(repr((x_digest, y_digest, model_fp, features_fp)).encode(), digest_size=20).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.joblib"
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def load(self, key: str):
+        """Fitted estimator or None; counts the lookup and refreshes the file's LRU time."""
+        p = self._path(key)
+        try:
+            est = joblib.load(p, mmap_mode="r")
+            os.utime(p)
+        except (FileNotFoundError, EOFError, OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return est
+
+    def save(self, key: str, estimator) -> None:
+        p = self._path(key); p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(f".{p.stem}.{uuid.uuid4().hex}.tmp")
+        joblib.dump(estimator, tmp, compress=0)
+        tmp.replace(p)
+
+    def size_bytes(self) -> int:
+        return sum(f.stat().st_size for f in self.root.glob("*/*.joblib"))
+
+    def enforce_limit(self) -> int:
+        """Deletes least-recently-used artifacts until the cache fits ``max_bytes``; returns files removed."""
+        files = []
+        for f in self.root.glob("*/*.joblib"):
+            try:
+                st = f.stat(); files.append((st.st_mtime, st.st_size, f))
+            except FileNotFoundError:
+                continue  # otro proceso lo desalojó
+        total = sum(s for _, s, _ in files)
+        removed = 0
+        for _, size, f in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                f.unlink(); removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return removed
+
+    @property
+    def hit_rate(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else float("nan")
+
+    def report(self) -> str:
+        return (f"artefactos: {self.hits} aciertos / {self.hits + self.misses} "
+                f"({100 * self.hit_rate:.0f}%), {self.size_bytes() / 1e6:.0f} MB en {self.root}")
+
+@contextmanager
+def evicting(artifacts: ArtifactCache | None):
+    """Runs the block, then one ``enforce_limit`` pass (even if it raised); no-op without a cache."""
+    try:
+        yield artifacts
+    finally:
+        if artifacts is not None:
+            artifacts.enforce_limit()  # una pasada por archivo, no por artefacto guardado
+
+def train_key(X: np.ndarray, y: np.ndarray, stop: int, model, features_fp: str) -> str:
+    """Key of ``model`` fitted on ``X[:stop], y[:stop]`` (same digests as ``map_folds_artifacts``)."""
+    return ArtifactCache.key(prefix_digests(X, [stop])[stop], prefix_digests(y, [stop])[stop],
+                             model_digest(model), features_fp)
+
+def store_fitted(artifacts: ArtifactCache | None, arrays: Dict[str, np.ndarray], tr: slice, model, fitted,
+                 features_fp: str = "") -> None:
+    """Called by fold fit functions after fitting ``model`` (unfitted original) on ``tr``."""
+    if artifacts is None:
+        return
+    if (tr.start or 0) != 0:
+        return  # solo ventanas desde 0 (las claves usan prefijos)
+    try:
+        artifacts.save(train_key(arrays["X"], arrays["y"], tr.stop, model, features_fp), fitted)
+    except OSError as e:
+        logging.warning(f"No se pudo guardar artefacto: {e}")
+
+def proba_up(est, X: np.ndarray) -> np.ndarray:
+    """P(class 1); one column per output for multi-output classifiers (``predict_proba`` → list)."""
+    p = est.predict_proba(X)
+    return np.column_stack([q[:, 1] for q in p]) if isinstance(p, list) else p[:, 1]
+
+def predict_output(est, X: np.ndarray, method: str) -> np.ndarray:
+    """``predict`` or, for ``method="predict_proba"``, P(class 1) (see ``proba_up``)."""
+    return proba_up(est, X) if method == "predict_proba" else est.predict(X)
+
+def map_folds_artifacts(fit_fn, arrays: Dict[str, np.ndarray], folds: list, models: dict,
+                        cache: ArtifactCache, features_fp: str = "", method: str = "predict",
+                        workers: int | None = 1, on_result=None, **kwargs) -> list:
+    """``map_folds`` that reloads fitted estimators from ``cache`` and only fits the misses
+    (``fit_fn`` receives ``artifacts=cache, features_fp=...`` and stores what it fits)."""
+    X, y = arrays["X"], arrays["y"]
+    stops = [tr.stop for tr, _ in folds]
+    xd, yd = prefix_digests(X, stops), prefix_digests(y, stops)
+    fps = {name: model_digest(m) for name, m in models.items()}
+    results: list = [{} for _ in folds]
+    todo: Dict[tuple, list] = {}
+    for i, (tr, te) in enumerate(folds):
+        missing = []
+        for name in models:
+            est = cache.load(ArtifactCache.key(xd[tr.stop], yd[tr.stop], fps[name], features_fp)) \
+                if (tr.start or 0) == 0 else None
+            if est is None:
+                missing.append(name)
+            else:
+                results[i][name] = predict_output(est, X[te], method)
+        if missing:
+            todo.setdefault(tuple(missing), []).append(i)
+        elif on_result is not None:
+            on_result(i, results[i])
+    for names, idxs in todo.items():
+        def done(j, res, idxs=idxs):
+            results[idxs[j]].update(res)
+            if on_result is not None:
+                on_result(idxs[j], results[idxs[j]])
+        map_folds(fit_fn, arrays, [folds[i] for i in idxs], workers=workers, on_result=done,
+                  models={n: models[n] for n in names}, artifacts=cache, features_fp=features_fp, **kwargs)
+    return results
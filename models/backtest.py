@@ -2,15 +2,23 @@ from __future__ import annotations
 from pathlib import Path
 import numpy as np
 import pandas as pd
+from etl.pred_store import DEFAULT_ROOT, list_runs, read_predictions
+from etl.readers import read_ohlcv
+from models.datasets import load_frame
 
 def backtest_signals(preds_file: str, threshold: float = 0.0, kind: str = "ret") -> pd.DataFrame:
     pf = Path(preds_file)
-    dfp = pd.read_csv(pf, parse_dates=["Datetime"])
+    dfp = read_ohlcv(pf)
     stem = pf.stem
     parts = stem.split("_")
     ticker = parts[0]
     interval = parts[1] if len(parts) > 1 else "1d"
-    base = pd.read_csv(Path("data/raw") / f"{ticker}_{interval}.csv", parse_dates=["Datetime"])
+    return backtest_frame(dfp, ticker, interval, threshold=threshold, kind=kind)
+
+def backtest_frame(dfp: pd.DataFrame, ticker: str, interval: str = "1d", threshold: float = 0.0,
+                   kind: str = "ret", raw_dir: Path = Path("data/raw")) -> pd.DataFrame:
+    """Backtest of an in-memory predictions frame (Datetime + y_pred/pred/proba_up) against raw returns."""
+    base = load_frame(Path(raw_dir) / f"{ticker}_{interval}.csv", columns=["Datetime","ret"])
     m = dfp.merge(base[["Datetime","ret"]], on="Datetime", how="left").dropna(subset=["ret"])
     pred_col = None
     for c in ["y_pred","pred","yhat","pred_ret"]:
@@ -33,3 +41,20 @@ def summarize_backtest(df: pd.DataFrame) -> dict:
     bench_total = df["bench"].iloc[-1] - 1.0
     sharpe = strat.mean() / (strat.std() + 1e-12) * (252 ** 0.5)
     return {"ret_total": float(ret_total), "bench_total": float(bench_total), "sharpe": float(sharpe)}
+
+def backtest_store(run_id: str | None = None, ticker=None, model=None, root: Path = DEFAULT_ROOT,
+                   threshold: float = 0.0, kind: str = "ret") -> pd.DataFrame:
+    """Summary per (ticker, interval, model) for one run of the Parquet prediction store (latest run by default)."""
+    run_id = run_id or (list_runs(root) or [None])[-1]
+    if run_id is None:
+        return pd.DataFrame()
+    preds = read_predictions(root, run_id=run_id, ticker=ticker, model=model)
+    rows = []
+    # cada intervalo es una serie distinta (1d y 1h del mismo ticker no se mezclan)
+    preds = preds.assign(interval=preds["interval"].fillna("1d").astype(str))
+    for (t, interval, mdl), g in preds.groupby(["ticker", "interval", "model"], sort=True):
+        bt = backtest_frame(g.sort_values("Datetime")[["Datetime","y_true","y_pred"]], t, interval,
+                            threshold=threshold, kind=kind)
+        if not bt.empty:
+            rows.append({"run_id": run_id, "ticker": t, "interval": interval, "model": mdl, **summarize_backtest(bt)})
+    return pd.DataFrame(rows)
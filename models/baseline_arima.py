@@ -7,11 +7,11 @@ from statsmodels.tsa.arima.model import ARIMA
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 import numpy as np
 import logging
+from models.datasets import load_frame
 
 def train_eval_arima(csv_path: str | Path, target: str="Close", order: Tuple[int,int,int]=(1,1,1), test_size: float=0.2) -> dict:
     p = Path(csv_path)
-    df = pd.read_csv(p, parse_dates=["Datetime"])
-    df = df.sort_values("Datetime")
+    df = load_frame(p, columns=["Datetime", target])
     y = df[target].astype(float).values
     n = len(y)
     split = int(n*(1-test_size))
@@ -0,0 +1,132 @@
+"""Run checkpoints for multi-ticker training: completed units survive a crash and ``--resume`` skips them.
+
+A run lives in ``<root>/<kind>/<run_id>/``:
+
+* ``params.json``: the run's arguments (a resume reuses the same ``run_id``);
+* ``units.jsonl``: one line per finished unit (a file), with its payload (metrics or summary)
+  or its error; appended and fsync'ed, so it is readable while the run is in progress;
+* ``partial.csv``: rows (metrics / summaries) appended as units finish;
+* ``folds/``: a ``FoldCache`` that stores each walk-forward fold as it finishes, so a resumed
+  file only refits the folds it had not completed (only when no persistent fold cache is
+  configured: that one already covers resumes and survives the run, see ``fold_cache``);
+* ``COMPLETE``: marker written when the run ends without failed units (``folds/`` is then removed).
+"""
+from __future__ import annotations
+import csv
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+DEFAULT_DIR = Path("models/runs")
+
+def new_run_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+class RunCheckpoint:
+    def __init__(self, run_id: str, kind: str, root: str | Path = DEFAULT_DIR):
+        self.run_id = run_id
+        self.dir = Path(root) / kind / run_id
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._units = self.dir / "units.jsonl"
+
+    @classmethod
+    def latest_incomplete(cls, kind: str, root: str | Path = DEFAULT_DIR) -> "RunCheckpoint | None":
+        base = Path(root) / kind
+        runs = sorted(d.name for d in base.iterdir() if d.is_dir() and not (d / "COMPLETE").exists()) if base.exists() else []
+        return cls(runs[-1], kind, root) if runs else None
+
+    @classmethod
+    def open(cls, kind: str, resume: bool | str = False, root: str | Path = DEFAULT_DIR) -> "RunCheckpoint":
+        """New run, or with ``resume`` the given run id / the latest incomplete run (new if none)."""
+        if isinstance(resume, str):
+            return cls(resume, kind, root)
+        if resume:
+            ckpt = cls.latest_incomplete(kind, root)
+            if ckpt is not None:
+                return ckpt
+        return cls(new_run_id(), kind, root)
+
+    @property
+    def fold_dir(self) -> Path:
+        return self.dir / "folds"
+
+    def fold_cache(self, persistent: str | Path | None = None) -> Path:
+        """The configured (cross-run) fold cache, or this run's ``folds/`` (removed on completion)."""
+        return Path(persistent) if persistent else self.fold_dir
+
+    def save_params(self, params: dict) -> None:
+        """Stores the run's arguments; resuming with different ones raises ``ValueError``."""
+        p = self.dir / "params.json"
+        params = json.loads(json.dumps(params, default=str))
+        if not p.exists():
+            p.write_text(json.dumps(params, indent=2), encoding="utf-8")
+            return
+        stored = json.loads(p.read_text(encoding="utf-8"))
+        diff = sorted(k for k in set(stored) | set(params) if stored.get(k) != params.get(k))
+        if diff:
+            raise ValueError(f"La corrida {self.run_id} se lanzó con otros parámetros ({', '.join(diff)}); "
+                             "no se puede reanudar con estos")
+
+    def record(self, unit: str, payload=None, error: str | None = None) -> None:
+        line = json.dumps({"unit": unit, "ok": error is None, "payload": payload, "error": error,
+                           "at": datetime.now(timezone.utc).isoformat()}, default=str)
+        with open(self._units, "a+b") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = "\n" + line  # cerrar una línea truncada por una caída anterior
+            f.write((line + "\n").encode("utf-8"))
+            f.flush(); os.fsync(f.fileno())
+
+    def append_rows(self, rows: List[dict], name: str = "partial.csv") -> None:
+        if not rows:
+            return
+        p = self.dir / name
+        new = not p.exists()
+        if new:
+            fields = list(rows[0].keys())
+        else:  # mismas columnas que la cabecera ya escrita
+            with open(p, newline="", encoding="utf-8") as f:
+                fields = next(csv.reader(f), None) or list(rows[0].keys())
+        with open(p, "a", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            if new:
+                w.writeheader()
+            w.writerows(rows)
+
+    def completed(self) -> Dict[str, object]:
+        """``{unit: payload}`` of units finished without error (a truncated last line is ignored)."""
+        done: Dict[str, object] = {}
+        if not self._units.exists():
+            return done
+        with open(self._units, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # línea a medio escribir al caer el proceso
+                if rec.get("ok"):
+                    done[rec["unit"]] = rec.get("payload")
+                else:
+                    done.pop(rec["unit"], None)
+        return done
+
+    def failed(self) -> List[str]:
+        out = {}
+        if self._units.exists():
+            with open(self._units, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    out[rec["unit"]] = rec.get("ok")
+        return [u for u, ok in out.items() if not ok]
+
+    def mark_complete(self) -> None:
+        (self.dir / "COMPLETE").write_text(datetime.now(timezone.utc).isoformat(), encoding="utf-8")
+        shutil.rmtree(self.fold_dir, ignore_errors=True)  # los folds solo sirven para reanudar
@@ -1,11 +1,97 @@
+"""Time series cross-validation: expanding, rolling and combinatorial purged splits, and the
+fold runner shared by every trainer.
 
-"""Time series cross-validation utilities (expanding walk-forward)."""
+A fold is ``(train, test)`` where each side is a ``slice`` or, when it spans several blocks
+(combinatorial splits), a tuple of slices: no index arrays are built and ``take`` returns a
+view for a single block. Labels look ``horizon`` bars ahead, so ``purge`` training rows right
+before every test block are dropped (their labels overlap the test period); ``embargo`` rows
+right after a test block are dropped too (serial correlation leaking back into training),
+which only matters when training data follows the test block.
+
+``cross_validate`` fits fresh clones per fold (shared imputer/scaler prefixes) in-process or
+in parallel over shared memory; forward folds (train is a prefix ending before the test
+block) also go through the fold / artifact caches and warm-started models.
+"""
 from __future__ import annotations
+import logging
+from functools import partial
+from itertools import combinations
+from math import comb
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
 import numpy as np
-from typing import Iterator, Tuple
+from models.artifact_cache import ArtifactCache, map_folds_artifacts, predict_output, store_fitted
+from models.fold_cache import FoldCache, map_folds_cached
+from models.incremental import fit_predict_warm, split_warm
+from models.preprocess import fit_shared
+from utils.parallel import as_slice, map_folds
+
+Blocks = Union[slice, Tuple[slice, ...]]
+
+def _blocks(b: Blocks) -> Tuple[slice, ...]:
+    return b if isinstance(b, tuple) else (b,)
+
+def take(a: np.ndarray, b: Blocks) -> np.ndarray:
+    """Rows of ``a`` in ``b``: a view for one slice, one concatenated copy for several."""
+    blocks = _blocks(b)
+    return a[blocks[0]] if len(blocks) == 1 else np.concatenate([a[s] for s in blocks])
+
+def block_rows(b: Blocks) -> int:
+    return sum(s.stop - (s.start or 0) for s in _blocks(b))
+
+def block_indices(b: Blocks) -> np.ndarray:
+    """Explicit row indices (only for reporting / joining predictions back)."""
+    return np.concatenate([np.arange(s.start or 0, s.stop) for s in _blocks(b)] or [np.arange(0)])
+
+def is_forward(fold: tuple) -> bool:
+    """Train is one prefix block ending before a single test block (walk-forward)."""
+    tr, te = fold
+    return isinstance(tr, slice) and isinstance(te, slice) and (tr.start or 0) == 0 and tr.stop <= te.start
+
+def _merge(slices) -> Blocks:
+    """Sorted slices with adjacent ones fused; a single slice when they are contiguous."""
+    merged: List[slice] = []
+    for s in sorted(slices, key=lambda s: s.start or 0):
+        if merged and merged[-1].stop == (s.start or 0):
+            merged[-1] = slice(merged[-1].start, s.stop)
+        else:
+            merged.append(slice(s.start or 0, s.stop))
+    return merged[0] if len(merged) == 1 else tuple(merged)
+
+def purged_train(n: int, test: Blocks, purge: int = 0, embargo: int = 0) -> Blocks:
+    """Complement of ``test`` in ``[0, n)`` without ``purge`` rows before and ``embargo`` rows after each block."""
+    out, start = [], 0
+    for s in _blocks(_merge(_blocks(test))):
+        stop = max(start, s.start - purge)
+        if stop > start:
+            out.append(slice(start, stop))
+        start = max(start, min(n, s.stop + embargo))
+    if start < n:
+        out.append(slice(start, n))
+    return _merge(out) if out else slice(0, 0)
+
+def walk_forward(n: int, initial_train: int, test_size: int, purge: int = 0, step: int | None = None,
+                 train_size: int | None = None, tail: bool = True, min_train: int = 1) -> List[tuple]:
+    """Forward ``(train slice, test slice)`` windows from ``initial_train``.
+
+    Training ends ``purge`` rows before the test block; ``train_size`` makes the window rolling
+    (expanding otherwise). ``tail`` keeps a shorter last test block; folds with fewer than
+    ``min_train`` training rows are skipped."""
+    step = step or test_size
+    out, start = [], int(initial_train)
+    while start < n:
+        stop = min(n, start + test_size)
+        if stop - start < test_size and not tail:
+            break
+        tr_stop = max(0, start - purge)
+        tr = slice(max(0, tr_stop - train_size) if train_size else 0, tr_stop)
+        if tr.stop - tr.start >= min_train:
+            out.append((tr, slice(start, stop)))
+        start += step
+    return out
 
 class ExpandingWindowSplit:
-    """Generates train/test indices for walk-forward validation.
+    """Generates train/test slices for walk-forward validation.
     Parameters
     ----------
     n_splits : int
@@ -16,20 +102,118 @@ class ExpandingWindowSplit:
         Size of the initial training window.
     step_size : int | None
         Step to move the window; if None uses test_size.
+    purge : int
+        Training rows dropped before each test fold (label horizon).
     """
-    def __init__(self, n_splits: int, test_size: int, initial_train_size: int, step_size: int | None = None):
+    def __init__(self, n_splits: int, test_size: int, initial_train_size: int, step_size: int | None = None,
+                 purge: int = 0):
         self.n_splits = n_splits
         self.test_size = test_size
         self.initial_train_size = initial_train_size
         self.step_size = step_size or test_size
+        self.purge = purge
+
+    def split(self, n_samples: int) -> Iterator[Tuple[slice, slice]]:
+        folds = walk_forward(n_samples, self.initial_train_size, self.test_size, purge=self.purge,
+                             step=self.step_size, tail=False)
+        yield from folds[:self.n_splits]
+
+class RollingWindowSplit:
+    """Walk-forward with a fixed-length training window of ``train_size`` rows (older rows drop out)."""
+    def __init__(self, train_size: int, test_size: int, step_size: int | None = None, purge: int = 0,
+                 n_splits: int | None = None):
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step_size = step_size or test_size
+        self.purge = purge
+        self.n_splits = n_splits
+
+    def split(self, n_samples: int) -> Iterator[Tuple[slice, slice]]:
+        folds = walk_forward(n_samples, self.train_size + self.purge, self.test_size, purge=self.purge,
+                             step=self.step_size, train_size=self.train_size, tail=False)
+        yield from folds[:self.n_splits] if self.n_splits else folds
+
+class CombinatorialPurgedSplit:
+    """Combinatorial purged CV: ``n_groups`` contiguous groups, every choice of ``n_test_groups``
+    as the test set and the rest (purged / embargoed around each test block) as training.
+
+    Each group is tested ``n_paths`` times, so the out-of-sample predictions form that many
+    complete backtest paths instead of one."""
+    def __init__(self, n_groups: int = 6, n_test_groups: int = 2, purge: int = 0, embargo: int = 0):
+        if not 0 < n_test_groups < n_groups:
+            raise ValueError("n_test_groups debe estar entre 1 y n_groups - 1")
+        self.n_groups = n_groups
+        self.n_test_groups = n_test_groups
+        self.purge = purge
+        self.embargo = embargo
+
+    @property
+    def n_splits(self) -> int:
+        return comb(self.n_groups, self.n_test_groups)
+
+    @property
+    def n_paths(self) -> int:
+        return comb(self.n_groups - 1, self.n_test_groups - 1)
+
+    def groups(self, n_samples: int) -> List[slice]:
+        bounds = np.linspace(0, n_samples, self.n_groups + 1).astype(int)
+        return [slice(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def split(self, n_samples: int) -> Iterator[Tuple[Blocks, Blocks]]:
+        groups = self.groups(n_samples)
+        for chosen in combinations(range(self.n_groups), self.n_test_groups):
+            test = _merge([groups[g] for g in chosen])
+            yield purged_train(n_samples, test, self.purge, self.embargo), test
+
+def _fit_fold(arrays: dict, fold: tuple, models: dict, method: str, n_jobs: int = -1,
+              artifacts: ArtifactCache | None = None, features_fp: str = "") -> dict:
+    tr, te = fold
+    X, y = arrays["X"], arrays["y"]
+    out = {}
+    # imputer/scaler comunes se ajustan una vez por fold (models/preprocess.py)
+    for name, m, head, Xte in fit_shared(models, take(X, tr), take(y, tr), take(X, te), n_jobs=n_jobs):
+        if isinstance(tr, slice):
+            store_fitted(artifacts, arrays, tr, models[name], m, features_fp)
+        out[name] = predict_output(head, Xte, method)
+    return out
+
+def fit_predict_fold(arrays: dict, fold: tuple, models: dict, n_jobs: int = -1,
+                     artifacts: ArtifactCache | None = None, features_fp: str = "") -> dict:
+    """Fits fresh clones on the train rows and returns ``{model: y_pred}`` for the test rows."""
+    return _fit_fold(arrays, fold, models, "predict", n_jobs, artifacts, features_fp)
+
+def fit_proba_fold(arrays: dict, fold: tuple, models: dict, n_jobs: int = -1,
+                   artifacts: ArtifactCache | None = None, features_fp: str = "") -> dict:
+    """As ``fit_predict_fold`` with ``{model: P(class 1)}``."""
+    return _fit_fold(arrays, fold, models, "predict_proba", n_jobs, artifacts, features_fp)
+
+FIT_FOLD = {"predict": fit_predict_fold, "predict_proba": fit_proba_fold}
+
+def cross_validate(models: dict, X: np.ndarray, y: np.ndarray, folds, method: str = "predict",
+                   workers: int | None = 1, n_jobs: int = -1, fold_cache: str | Path | FoldCache | None = None,
+                   artifacts: str | Path | ArtifactCache | None = None, features_fp: str = "",
+                   warm: tuple = ()) -> List[Dict[str, np.ndarray]]:
+    """``{model: output}`` per fold, in fold order (``folds``: a list or a splitter with ``split``).
 
-    def split(self, n_samples: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
-        start = self.initial_train_size
-        for i in range(self.n_splits):
-            train_end = start + i*self.step_size
-            test_end = train_end + self.test_size
-            if test_end > n_samples:
-                break
-            train_idx = np.arange(0, train_end)
-            test_idx = np.arange(train_end, test_end)
-            yield train_idx, test_idx
+    Folds are independent and run in parallel with ``workers`` processes (arrays in shared
+    memory). Forward folds use the fold cache (only new or invalidated folds are fitted), the
+    artifact cache (reload estimators fitted on the same prefix) and carry ``warm`` models
+    across folds; other folds (rolling, combinatorial) are always fitted."""
+    if hasattr(folds, "split"):
+        folds = list(folds.split(len(X)))
+    arrays = {"X": X, "y": y}
+    fit_fn = FIT_FOLD[method]
+    if not all(is_forward(f) for f in folds):
+        if fold_cache or artifacts or warm:
+            logging.info("cross_validate: folds no walk-forward; sin caché de folds/artefactos ni warm start")
+        return map_folds(fit_fn, arrays, folds, workers=workers, models=models, n_jobs=n_jobs)
+    folds = [(as_slice(tr), as_slice(te)) for tr, te in folds]
+    cold, warm_models = split_warm(models, warm)
+    art = ArtifactCache(artifacts) if isinstance(artifacts, (str, Path)) else artifacts
+    mapper = partial(map_folds_artifacts, cache=art, features_fp=features_fp, method=method) if art else map_folds
+    cache = FoldCache(fold_cache) if isinstance(fold_cache, (str, Path)) else fold_cache
+    out = map_folds_cached(fit_fn, arrays, folds, cold, cache=cache, workers=workers, mapper=mapper, n_jobs=n_jobs)
+    if warm_models:
+        warm_out = fit_predict_warm(arrays, folds, warm_models, n_jobs=n_jobs, method=method)
+        out = [{**c, **w} for c, w in zip(out, warm_out)]
+    return out
@@ -0,0 +1,78 @@
+"""Shared dataset loader for every model entry point, with a process-level LRU cache.
+
+Frames are keyed by (resolved path, mtime, size, columns): a rewritten file is re-parsed,
+an unchanged one costs a single parse per process. Frames staged by the ETL in
+``etl.dataset_registry.REGISTRY`` take precedence over the file on disk.
+"""
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Sequence
+import numpy as np
+import pandas as pd
+from etl.readers import read_ohlcv
+from etl.dataset_registry import REGISTRY
+
+MAX_ENTRIES = 64
+
+_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    if "Datetime" in df.columns and not df["Datetime"].is_monotonic_increasing:
+        df = df.sort_values("Datetime", kind="stable")
+    return df.reset_index(drop=True)
+
+def _get(key: tuple) -> pd.DataFrame | None:
+    with _lock:
+        df = _cache.get(key)
+        if df is not None:
+            _cache.move_to_end(key)
+        return df
+
+def _put(key: tuple, df: pd.DataFrame) -> None:
+    with _lock:
+        _cache[key] = df
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+def load_frame(path: str | Path, columns: Sequence[str] | None = None) -> pd.DataFrame:
+    """Returns the file as a Datetime-sorted, typed frame. Treat the result as read-only:
+    it is a shallow copy of the cached frame."""
+    staged = REGISTRY.get(path)
+    if staged is not None:
+        df = _sorted(staged)
+        return (df[list(columns)] if columns else df).copy(deep=False)
+    p = Path(path).resolve()
+    st = p.stat()
+    cols = tuple(columns) if columns else None
+    key = (str(p), st.st_mtime_ns, st.st_size, cols)
+    df = _get(key)
+    if df is None and cols is not None:
+        full = _get(key[:3] + (None,))
+        if full is not None:
+            df = full[list(cols)]
+            _put(key, df)
+    hit = df is not None
+    with _lock:
+        _stats["hits" if hit else "misses"] += 1
+    if not hit:
+        df = _sorted(read_ohlcv(p, columns=cols))
+        _put(key, df)
+    return df.copy(deep=False)
+
+def load_arrays(path: str | Path, columns: Sequence[str], dtype=float) -> np.ndarray:
+    """Numeric columns as a 2-D array (rows sorted by Datetime)."""
+    return load_frame(path, columns=list(columns)).to_numpy(dtype=dtype)
+
+def cache_info() -> dict:
+    with _lock:
+        return {**_stats, "entries": len(_cache), "max_entries": MAX_ENTRIES}
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
+        _stats.update(hits=0, misses=0)
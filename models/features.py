@@ -49,6 +49,11 @@ def add_atr(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     df[f"atr_{period}"] = tr.ewm(span=period, adjust=False).mean()
     return df
 
+def add_volatility(df: pd.DataFrame, window: int = 20, col: str = "ret") -> pd.DataFrame:
+    df = df.copy()
+    df[f"vol_{window}"] = df[col].rolling(window, min_periods=window).std(ddof=0)
+    return df
+
 def add_lags(df: pd.DataFrame, lags: list[int], col: str = "ret") -> pd.DataFrame:
     df = df.copy()
     for k in lags:
@@ -73,7 +78,113 @@ def add_technical_features(df: pd.DataFrame, cfg: dict) -> pd.DataFrame:
     atr_w = cfg.get("atr_window")
     if atr_w:
         df = add_atr(df, period=int(atr_w))
+    vol_w = cfg.get("vol_window")
+    if vol_w and "ret" in df.columns:
+        df = add_volatility(df, window=int(vol_w))
     lags = cfg.get("lags", [])
     if lags:
         df = add_lags(df, lags=list(map(int, lags)), col="ret")
     return df
+
+# === Cross-sectional: por fecha, a través del universo (matriz fecha × ticker) ===
+CS_COLUMNS = ("ret", "rsi_14", "vol_20")
+CS_PREFIXES = ("cs_rank_", "cs_z_", "cs_res_")
+
+def _dates(df: pd.DataFrame) -> np.ndarray:
+    """Date-axis keys of one file: the exact UTC timestamp for intraday bars, the trading date
+    for daily (or coarser) bars, so a stock stamped at local midnight (04:00/05:00 UTC) and a
+    crypto bar at 00:00 UTC land on the same row."""
+    dt = pd.to_datetime(df["Datetime"], utc=True).dt.tz_convert(None)
+    keys = dt.to_numpy(dtype="datetime64[ns]")
+    if len(keys) > 1 and np.median(np.diff(keys)) >= np.timedelta64(20, "h"):
+        keys = dt.dt.round("D").to_numpy(dtype="datetime64[ns]")  # medianoche local ±12 h → su fecha
+    return keys
+
+def date_ticker_matrix(frames: dict, cols) -> tuple[np.ndarray, list, list, dict]:
+    """(sorted union of the trading dates (see ``_dates``), tickers, each ticker's row positions on the date axis,
+    ``{col: (dates × tickers) float matrix}``); NaN where a ticker has no value."""
+    tickers = list(frames)
+    dates = np.unique(np.concatenate([_dates(frames[t]) for t in tickers]))
+    pos = [np.searchsorted(dates, _dates(frames[t])) for t in tickers]
+    mats = {}
+    for c in cols:
+        MT = np.full((len(tickers), len(dates)), np.nan)  # se llena por ticker (escrituras contiguas)
+        for j, t in enumerate(tickers):
+            if c in frames[t].columns:
+                MT[j, pos[j]] = frames[t][c].to_numpy(dtype=float)
+        mats[c] = np.ascontiguousarray(MT.T)
+    return dates, tickers, pos, mats
+
+def _row_stats(M: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-date count, mean and std (ddof=0) of the finite values, without all-NaN warnings."""
+    valid = np.isfinite(M)
+    n = valid.sum(axis=1, keepdims=True)
+    safe_n = np.maximum(n, 1)
+    mean = np.where(valid, M, 0.0).sum(axis=1, keepdims=True) / safe_n
+    var = (np.where(valid, M - mean, 0.0) ** 2).sum(axis=1, keepdims=True) / safe_n
+    return n, mean, np.sqrt(var)
+
+def cs_rank(M: np.ndarray) -> np.ndarray:
+    """Percentile rank in [0, 1] of each value within its date (row); NaN stays NaN, ties are ordinal."""
+    valid = np.isfinite(M)
+    order = np.argsort(np.where(valid, M, np.inf), axis=1, kind="stable")  # NaN al final
+    ranks = np.empty_like(M, dtype=float)
+    np.put_along_axis(ranks, order, np.broadcast_to(np.arange(M.shape[1], dtype=float), M.shape), axis=1)
+    n = valid.sum(axis=1, keepdims=True)
+    out = np.where(n > 1, ranks / np.maximum(n - 1, 1), 0.5)
+    return np.where(valid, out, np.nan)
+
+def cs_zscore(M: np.ndarray) -> np.ndarray:
+    """(value − date mean) / date std; 0 on dates where every ticker has the same value."""
+    _, mean, std = _row_stats(M)
+    return (M - mean) / np.where(std > 0, std, np.inf)  # std 0 → 0; NaN sigue NaN
+
+def cs_residual(M: np.ndarray, beta_window: int | None = None) -> np.ndarray:
+    """Value minus the equal-weight market (date mean); with ``beta_window`` minus beta × market,
+    beta from a trailing window of each ticker against the market (1 until it has half a window)."""
+    _, market, _ = _row_stats(M)
+    if not beta_window:
+        return M - market
+    valid = np.isfinite(M)
+    R = pd.DataFrame(M)
+    Mk = pd.DataFrame(np.where(valid, market, np.nan))  # mercado solo donde el ticker cotiza
+    roll = dict(window=beta_window, min_periods=max(2, beta_window // 2))
+    cov = (R * Mk).rolling(**roll).mean() - R.rolling(**roll).mean() * Mk.rolling(**roll).mean()
+    var = (Mk ** 2).rolling(**roll).mean() - Mk.rolling(**roll).mean() ** 2
+    beta = (cov / var.where(var > 1e-18)).to_numpy()
+    return M - np.where(np.isfinite(beta), beta, 1.0) * market
+
+def add_cross_sectional_features(frames: dict, cols=CS_COLUMNS, beta_window: int | None = 60,
+                                 min_tickers: int = 3) -> dict:
+    """``{ticker: frame}`` with ``cs_rank_<col>``, ``cs_z_<col>`` and ``cs_res_<col>`` joined back.
+
+    Each column is laid out once as a (date × ticker) matrix; ranks, z-scores and market
+    residuals are whole-matrix NumPy operations, so the cost is one argsort per date rather
+    than a loop per ticker. Only same-date values enter a row (no look-ahead); on dates with
+    fewer than ``min_tickers`` values the ticker gets neutral features (rank 0.5, z-score and
+    residual 0) instead of NaN, so a thin date (a weekend crypto bar) is not dropped downstream.
+    ``beta_window`` applies to ``ret`` (other columns
+    are residualised against the plain market mean). Columns missing everywhere are skipped.
+    """
+    stale = lambda df: [c for c in df.columns if c.startswith(CS_PREFIXES)]  # de una pasada anterior
+    frames = {t: df.drop(columns=stale(df)) if stale(df) else df for t, df in frames.items()}
+    cols = [c for c in cols if any(c in df.columns for df in frames.values())]
+    if not frames or not cols:
+        return frames
+    _, tickers, pos, mats = date_ticker_matrix(frames, cols)
+    names, blocks = [], []
+    for c, M in mats.items():
+        n, _, _ = _row_stats(M)
+        thin = (n < min_tickers) & np.isfinite(M)  # el ticker cotiza pero la fecha no tiene universo
+        M = np.where(n >= min_tickers, M, np.nan)
+        names += [f"cs_rank_{c}", f"cs_z_{c}", f"cs_res_{c}"]
+        blocks += [np.where(thin, 0.5, cs_rank(M)), np.where(thin, 0.0, cs_zscore(M)),
+                   np.where(thin, 0.0, cs_residual(M, beta_window if c == "ret" else None))]
+    # (ticker, fecha, feature): el bloque de cada ticker es contiguo y se une con una sola concatenación
+    # (insertar columna a columna domina el coste con miles de tickers)
+    S = np.stack([B.T for B in blocks], axis=2)
+    out = {}
+    for j, t in enumerate(tickers):
+        df = frames[t]
+        out[t] = pd.concat([df, pd.DataFrame(S[j, pos[j]], columns=names, index=df.index)], axis=1)
+    return out
@@ -0,0 +1,111 @@
+"""On-disk memo of walk-forward fold results for incremental retraining.
+
+A fold result (the model's predictions on the test block) is keyed by
+(hash of the data prefix it saw, fold bounds, model config). After appending new
+bars the prefixes of old folds are unchanged, so a rerun only fits new or
+invalidated folds. Fold bounds must be anchored for this to pay off: pass a fixed
+``initial_train`` to the trainers instead of the default fraction of ``n``.
+"""
+from __future__ import annotations
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable
+import numpy as np
+from utils.parallel import map_folds
+
+DEFAULT_DIR = Path("models/cache/folds")
+
+def prefix_digests(a: np.ndarray, bounds: Iterable[int]) -> Dict[int, str]:
+    """Digest of ``a[:b]`` for every bound in one incremental pass over the rows."""
+    a = np.ascontiguousarray(a)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str((a.dtype.str, a.shape[1:])).encode())
+    out, pos = {}, 0
+    for b in sorted(set(int(x) for x in bounds)):
+        if b > pos:
+            h.update(memoryview(a[pos:b]).cast("B"))
+            pos = b
+        out[b] = h.copy().hexdigest()
+    return out
+
+def model_digest(model, extra: object = None) -> str:
+    """Fingerprint of an (unfitted) estimator's hyperparameters; ``n_jobs`` does not change results."""
+    params = sorted((k, repr(v)) for k, v in model.get_params(deep=True).items()
+                    if not k.endswith("n_jobs") and not hasattr(v, "get_params"))
+    return hashlib.blake2b(repr((type(model).__name__, params, extra)).encode(), digest_size=16).hexdigest()
+
+class FoldCache:
+    def __init__(self, root: str | Path = DEFAULT_DIR):
+        self.root = Path(root); self.root.mkdir(parents=True, exist_ok=True)
+        self.hits = 0; self.misses = 0
+
+    @staticmethod
+    def key(x_digest: str, y_digest: str, bounds: tuple, model_fp: str) -> str:
+        return hashlib.blake2b(repr((x_digest, y_digest, bounds, model_fp)).encode(), digest_size=20).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.npy"
+
+    def get(self, key: str) -> np.ndarray | None:
+        p = self._path(key)
+        try:
+            out = np.load(p, allow_pickle=False)
+        except (FileNotFoundError, ValueError, OSError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return out
+
+    def put(self, key: str, value: np.ndarray) -> None:
+        p = self._path(key); p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(f"{p.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp, np.asarray(value), allow_pickle=False)
+        tmp.replace(p)
+
+def fold_keys(X: np.ndarray, y: np.ndarray, folds: list, model_fps: Dict[str, str]) -> list:
+    """Per-fold ``{model: key}``; folds are (train slice, test slice) with train starting at 0.
+
+    The prediction for a fold depends on X up to the end of the test block and y up to the
+    end of the training window, so those are the prefixes hashed.
+    """
+    xd = prefix_digests(X, [te.stop for _, te in folds])
+    yd = prefix_digests(y, [tr.stop for tr, _ in folds])
+    out = []
+    for tr, te in folds:
+        bounds = (tr.start or 0, tr.stop, te.start, te.stop)
+        out.append({name: FoldCache.key(xd[te.stop], yd[tr.stop], bounds, fp) for name, fp in model_fps.items()})
+    return out
+
+def map_folds_cached(fit_fn, arrays: Dict[str, np.ndarray], folds: list, models: dict,
+                     cache: FoldCache | None = None, workers: int | None = 1,
+                     mapper: Callable = map_folds, **kwargs) -> list:
+    """``map_folds`` that returns ``{model: prediction}`` per fold, fitting only the (fold, model)
+    pairs missing from ``cache``. ``fit_fn(arrays, fold, models=..., **kwargs)`` as in the trainers;
+    ``mapper`` runs the misses (e.g. ``map_folds_artifacts`` to reuse fitted estimators)."""
+    if cache is None:
+        return mapper(fit_fn, arrays, folds, workers=workers, models=models, **kwargs)
+    fps = {name: model_digest(m) for name, m in models.items()}
+    keys = fold_keys(arrays["X"], arrays["y"], folds, fps)
+    results: list = [{} for _ in folds]
+    todo: Dict[tuple, list] = {}  # modelos faltantes → folds
+    for i, k in enumerate(keys):
+        missing = []
+        for name in models:
+            v = cache.get(k[name])
+            if v is None:
+                missing.append(name)
+            else:
+                results[i][name] = v
+        if missing:
+            todo.setdefault(tuple(missing), []).append(i)
+    for names, idxs in todo.items():
+        def done(j, res, idxs=idxs):
+            # cada fold se guarda al terminar: un proceso interrumpido no pierde los folds ya hechos
+            i = idxs[j]
+            for name, v in res.items():
+                cache.put(keys[i][name], v)
+                results[i][name] = v
+        mapper(fit_fn, arrays, [folds[i] for i in idxs], workers=workers, on_result=done,
+               models={n: models[n] for n in names}, **kwargs)
+    return results
@@ -0,0 +1,219 @@
+"""Warm-start / partial-fit variants for expanding walk-forward folds.
+
+Fold k+1's training window is a superset of fold k's, so instead of refitting from scratch
+an estimator can be carried across folds:
+
+* forests (``warm_start``): keep the trees and grow ``grow`` new ones on the larger window;
+* ``HistGradientBoosting*`` (``warm_start``): keep the boosting stages and add ``grow`` iterations;
+* estimators with ``partial_fit`` (SGD, optionally behind a ``StandardScaler``): one pass over
+  the rows appended since the previous fold;
+* ``IncrementalLinear``: exact standardised OLS/ridge from running sufficient statistics, so each
+  fold costs O(new rows · p² + p³) instead of a refit on the whole prefix. Being exact, it is
+  always carried across folds.
+
+Folds are sequentially dependent, so warm models run in-process in fold order.
+"""
+from __future__ import annotations
+import warnings
+from typing import Dict, List
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+from sklearn.multioutput import MultiOutputClassifier, MultiOutputRegressor
+from sklearn.pipeline import Pipeline
+from models.artifact_cache import proba_up
+
+WARM_GROW = 8  # n_estimators / max_iter // WARM_GROW por fold
+
+class IncrementalLinear(RegressorMixin, BaseEstimator):
+    """StandardScaler + LinearRegression (``alpha=0``) or Ridge from sufficient statistics.
+
+    Keeps (n, Σx, Σxxᵀ, Σy, Σxy) of rows shifted by the first batch's mean (avoids cancellation
+    with price/volume scales). ``partial_fit`` adds rows, ``forget`` removes them (rolling window
+    of ``window`` rows when carried by ``WarmStarter``); the solve is O(p³) regardless of n.
+    ``y`` may be 2-D (one column per target, e.g. horizons): one factorisation for all of them.
+    """
+    def __init__(self, alpha: float = 0.0, window: int | None = None):
+        self.alpha = alpha
+        self.window = window
+
+    def _reset(self, X: np.ndarray, y: np.ndarray) -> None:
+        p = X.shape[1]
+        self.shift_x_ = X.mean(axis=0); self.shift_y_ = y.mean(axis=0) if y.ndim > 1 else float(y.mean())
+        self.n_ = 0; self.sx_ = np.zeros(p); self.sxx_ = np.zeros((p, p))
+        self.sy_ = np.zeros(y.shape[1:]) if y.ndim > 1 else 0.0; self.sxy_ = np.zeros((p, *y.shape[1:]))
+
+    def _update(self, X: np.ndarray, y: np.ndarray, sign: float) -> None:
+        Xc = np.asarray(X, dtype=float) - self.shift_x_
+        yc = np.asarray(y, dtype=float) - self.shift_y_
+        self.n_ += sign * len(Xc)
+        self.sx_ += sign * Xc.sum(axis=0); self.sxx_ += sign * (Xc.T @ Xc)
+        self.sy_ += sign * yc.sum(axis=0); self.sxy_ += sign * (Xc.T @ yc)
+
+    def fit(self, X, y) -> "IncrementalLinear":
+        X = np.asarray(X, dtype=float); y = np.asarray(y, dtype=float)
+        self._reset(X, y)
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y) -> "IncrementalLinear":
+        X = np.asarray(X, dtype=float); y = np.asarray(y, dtype=float)
+        if not hasattr(self, "n_"):
+            self._reset(X, y)
+        self._update(X, y, 1.0)
+        return self._solve()
+
+    def forget(self, X, y) -> "IncrementalLinear":
+        self._update(X, y, -1.0)
+        return self._solve()
+
+    def _solve(self) -> "IncrementalLinear":
+        n = self.n_
+        if n <= 0:
+            raise ValueError("IncrementalLinear sin filas")
+        mx = self.sx_ / n; my = self.sy_ / n
+        cov = self.sxx_ / n - np.outer(mx, mx)
+        cxy = self.sxy_ / n - np.multiply.outer(mx, my)
+        var = np.clip(np.diag(cov), 0.0, None)
+        scale = np.sqrt(var)
+        scale[scale < 10 * np.finfo(float).eps * np.maximum(1.0, np.abs(mx + self.shift_x_))] = 1.0  # constantes
+        A = n * cov / np.outer(scale, scale)
+        scale_b = scale if cxy.ndim == 1 else scale[:, None]
+        b = n * cxy / scale_b
+        if self.alpha:
+            coef_z = np.linalg.solve(A + self.alpha * np.eye(len(b)), b)
+        else:
+            coef_z = np.linalg.lstsq(A, b, rcond=None)[0]
+        self.coef_ = coef_z / scale_b
+        intercept = my + self.shift_y_ - (mx + self.shift_x_) @ self.coef_
+        self.intercept_ = float(intercept) if cxy.ndim == 1 else intercept
+        self.n_features_in_ = len(self.coef_)
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        return np.asarray(X, dtype=float) @ self.coef_ + self.intercept_
+
+def _final(model):
+    return model.steps[-1][1] if isinstance(model, Pipeline) else model
+
+def _per_target(est) -> bool:
+    return isinstance(est, (MultiOutputRegressor, MultiOutputClassifier))
+
+def warm_kind(model) -> str | None:
+    """``"stats"`` / ``"trees"`` / ``"boost"`` / ``"partial"``, or None if the model has no incremental mode.
+    A ``MultiOutput*`` wrapper has the kind of its estimator (one carried estimator per target)."""
+    est = _final(model)
+    if isinstance(est, IncrementalLinear) and not isinstance(model, Pipeline):
+        return "stats"
+    inner = est.estimator if _per_target(est) else est
+    params = inner.get_params()
+    if "warm_start" in params and "n_estimators" in params:
+        return "trees"
+    if "warm_start" in params and type(inner).__name__.startswith("HistGradientBoosting"):
+        return "boost"
+    steps = model.steps[:-1] if isinstance(model, Pipeline) else []
+    if hasattr(est, "partial_fit") and all(hasattr(t, "partial_fit") for _, t in steps):
+        return "partial"
+    return None
+
+class WarmStarter:
+    """Carries one estimator across expanding training windows ``[0, stop)``."""
+    def __init__(self, model, grow: int | None = None, classes: np.ndarray | None = None):
+        self.kind = warm_kind(model)
+        if self.kind is None:
+            raise ValueError(f"{type(_final(model)).__name__} no admite warm start ni partial_fit")
+        self.model = clone(model)
+        self.grow = grow
+        self.classes = classes
+        self._start = 0; self._stop = 0
+
+    def _size_param(self) -> str:
+        return "n_estimators" if self.kind == "trees" else "max_iter"
+
+    def fit(self, X: np.ndarray, y: np.ndarray, stop: int) -> "WarmStarter":
+        est = _final(self.model)
+        if self._stop == 0:
+            if self.kind in ("trees", "boost"):
+                est.set_params(**{"estimator__warm_start" if _per_target(est) else "warm_start": True})
+            start = max(0, stop - est.window) if self.kind == "stats" and est.window else 0
+            self.model.fit(X[start:stop], y[start:stop])
+            self._start = start
+        elif stop > self._stop:
+            if self.kind == "stats":
+                est.partial_fit(X[self._stop:stop], y[self._stop:stop])
+                start = max(0, stop - est.window) if est.window else 0
+                if start > self._start:
+                    est.forget(X[self._start:start], y[self._start:start])
+                    self._start = start
+            elif self.kind == "partial":
+                self._partial(X[self._stop:stop], y[self._stop:stop])
+            else:
+                size = self._size_param()
+                carried = est.estimators_ if _per_target(est) else [est]
+                grow = self.grow or max(1, carried[0].get_params()[size] // WARM_GROW)
+                for e in carried:
+                    e.set_params(**{size: e.get_params()[size] + grow})
+                with warnings.catch_warnings():
+                    # class_weight="balanced*" + warm_start: los árboles viejos conservan sus pesos
+                    warnings.filterwarnings("ignore", message=".*warm_start.*", category=UserWarning)
+                    if _per_target(est):
+                        self._fit_targets(X[:stop], y[:stop])
+                    else:
+                        self.model.fit(X[:stop], y[:stop])
+        self._stop = stop
+        return self
+
+    def _fit_targets(self, X: np.ndarray, y: np.ndarray) -> None:
+        # MultiOutput*.fit clonaría los estimadores: se crece cada columna sobre el suyo
+        if isinstance(self.model, Pipeline):
+            for _, t in self.model.steps[:-1]:
+                X = t.fit_transform(X, y)
+        for j, e in enumerate(_final(self.model).estimators_):
+            e.fit(X, y[:, j])
+
+    def _partial(self, X: np.ndarray, y: np.ndarray) -> None:
+        if isinstance(self.model, Pipeline):
+            for _, t in self.model.steps[:-1]:
+                t.partial_fit(X)
+                X = t.transform(X)
+        est = _final(self.model)
+        if self.classes is not None:
+            est.partial_fit(X, y, classes=self.classes)
+        else:
+            est.partial_fit(X, y)
+
+def fit_predict_warm(arrays: Dict[str, np.ndarray], folds: list, models: dict, n_jobs: int = -1,
+                     method: str = "predict", grow: int | None = None) -> List[dict]:
+    """Warm-start counterpart of ``map_folds(fit_fn, ...)``: ``{model: output}`` per fold, in order.
+
+    ``folds`` are (train slice, test slice) with train starting at 0 and non-decreasing ``stop``;
+    ``method`` is ``"predict"`` or ``"predict_proba"`` (positive-class column).
+    """
+    X, y = arrays["X"], arrays["y"]
+    classes = np.unique(y) if method == "predict_proba" else None
+    starters = {}
+    for name, model in models.items():
+        m = clone(model)
+        m.set_params(**{k: n_jobs for k, v in m.get_params().items() if k.endswith("n_jobs") and v is not None})
+        starters[name] = WarmStarter(m, grow=grow, classes=classes)
+    out = []
+    for tr, te in folds:
+        if (tr.start or 0) != 0:
+            raise ValueError("warm start requiere ventanas de entrenamiento expansivas desde 0")
+        res = {}
+        for name, ws in starters.items():
+            ws.fit(X, y, tr.stop)
+            res[name] = proba_up(ws.model, X[te]) if method == "predict_proba" else ws.model.predict(X[te])
+        out.append(res)
+    return out
+
+def split_warm(models: dict, warm: tuple | list | None) -> tuple[dict, dict]:
+    """Splits a zoo into (cold, warm) by name; unknown or unsupported names raise ``ValueError``.
+    Exact incremental models (``IncrementalLinear``) always go to warm."""
+    warm = set(warm or ()) | {k for k, m in models.items() if warm_kind(m) == "stats"}
+    unknown = warm - set(models)
+    if unknown:
+        raise ValueError(f"Modelos desconocidos para warm start: {sorted(unknown)}")
+    for name in warm:
+        if warm_kind(models[name]) is None:
+            raise ValueError(f"'{name}' no admite warm start ni partial_fit")
+    return ({k: m for k, m in models.items() if k not in warm},
+            {k: m for k, m in models.items() if k in warm})
@@ -0,0 +1,93 @@
+"""Streaming classifier leaderboard: top-N up / down / confidence without keeping every summary.
+
+``Leaderboard.add`` pushes each ticker's summary into three bounded heaps (O(log N) per
+ticker, O(N) memory) and appends it to ``<summary>.tmp`` as it arrives, so a 10,000-symbol
+screen never builds the full table; ``tables()`` gives the current (partial) leaderboards.
+``close()`` replaces the summary CSV with the finished file, so the dashboard and heatmap keep
+reading the previous complete summary during the run (and after a crash). The CSV keeps
+arrival order (the dashboard and heatmap sort it themselves).
+"""
+from __future__ import annotations
+import csv
+import heapq
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+import pandas as pd
+
+def summary_columns(members: Sequence[str]) -> List[str]:
+    """Summary CSV columns for an ensemble of ``members`` (no ``confidence``, as before)."""
+    return ["file", "ticker", "last_date", *[f"proba_{m}" for m in members], "proba_ens", "pred"]
+
+class Leaderboard:
+    def __init__(self, top_n: int | None = 10, path: str | Path | None = None, columns: Sequence[str] | None = None):
+        self.top_n = top_n
+        self.count = 0
+        self._all: List[dict] | None = [] if not top_n else None  # sin top-N: tablas completas
+        self._up: list = []; self._down: list = []; self._conf: list = []
+        self.path = Path(path) if path else None
+        self.columns = list(columns) if columns else None
+        self._f = None; self._w = None
+
+    def _push(self, heap: list, key: float, row: dict, size: int) -> None:
+        item = (key, -self.count, row)  # empates: gana el que llegó antes
+        if len(heap) < size:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def add(self, summary: dict) -> None:
+        self.count += 1
+        if self._all is not None:
+            self._all.append(summary)
+        else:
+            self._push(self._up, summary["proba_ens"], summary, self.top_n)
+            # bajistas excluyen a los alcistas: los N menores fuera del top-N están entre los 2N menores
+            self._push(self._down, -summary["proba_ens"], summary, 2 * self.top_n)
+            self._push(self._conf, summary["confidence"], summary, self.top_n)
+        if self.path is not None:
+            self._write(summary)
+
+    def extend(self, summaries: Iterable[dict]) -> "Leaderboard":
+        for s in summaries:
+            self.add(s)
+        return self
+
+    def _write(self, summary: dict) -> None:
+        if self._w is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._f = open(self._tmp, "w", newline="", encoding="utf-8")
+            cols = self.columns or [k for k in summary if k != "confidence"]
+            self._w = csv.DictWriter(self._f, fieldnames=cols, extrasaction="ignore")
+            self._w.writeheader()
+        self._w.writerow(summary)
+        self._f.flush()
+
+    def tables(self) -> Dict[str, pd.DataFrame]:
+        """``{"up", "down", "confidence"}`` leaderboards of the summaries added so far."""
+        if self._all is not None:
+            df = pd.DataFrame(self._all)
+            if df.empty:
+                return {"up": df, "down": df, "confidence": df}
+            up = df.sort_values("proba_ens", ascending=False, kind="stable")
+            down = df.sort_values("proba_ens", ascending=True, kind="stable")
+            return {"up": up, "down": down, "confidence": df.sort_values("confidence", ascending=False, kind="stable")}
+        ranked = lambda heap: [row for *_, row in sorted(heap, key=lambda it: it[:2], reverse=True)]
+        up = ranked(self._up)
+        in_up = {r["ticker"] for r in up}
+        down = [r for r in ranked(self._down) if r["ticker"] not in in_up][:self.top_n]
+        return {"up": pd.DataFrame(up), "down": pd.DataFrame(down), "confidence": pd.DataFrame(ranked(self._conf))}
+
+    @property
+    def _tmp(self) -> Path:
+        return self.path.with_suffix(self.path.suffix + ".tmp")
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close(); self._f = None; self._w = None
+            self._tmp.replace(self.path)  # los lectores nunca ven un resumen a medio escribir
+
+    def __enter__(self) -> "Leaderboard":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -2,17 +2,96 @@
 """Top ML regressors commonly effective for tabular time-series features."""
 from __future__ import annotations
 from typing import Dict
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.metrics import log_loss
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
-from sklearn.svm import SVR
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet, SGDRegressor
+from sklearn.svm import SVR, LinearSVR
+from sklearn.kernel_approximation import Nystroem, RBFSampler
+from sklearn.ensemble import (RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingClassifier,
+                              HistGradientBoostingRegressor)
 try:
     from xgboost import XGBRegressor  # optional
     HAS_XGB = True
 except Exception:
     HAS_XGB = False
 
+def approx_svr(n_components: int = 300, method: str = "nystroem", final: str = "ridge",
+               C: float = 10.0, epsilon: float = 0.001, random_state: int = 42) -> Pipeline:
+    """RBF kernel regression on ``n_components`` approximate features (Nystroem or random Fourier)
+    + a linear model: O(n·m²) fit instead of SVR's O(n²)–O(n³). ``gamma`` = SVR's ``"scale"`` on
+    standardised inputs (1 / n_features). ``method``: "nystroem" | "rff"; ``final``: "ridge" | "linear_svr"."""
+    if method not in ("nystroem", "rff"):
+        raise ValueError(f"method desconocido: {method!r} (nystroem | rff)")
+    if final not in ("ridge", "linear_svr"):
+        raise ValueError(f"final desconocido: {final!r} (ridge | linear_svr)")
+    feats = (Nystroem(kernel="rbf", n_components=n_components, random_state=random_state) if method == "nystroem"
+             else RBFSampler(gamma="scale", n_components=n_components, random_state=random_state))
+    head = (Ridge(alpha=1.0 / (2 * C)) if final == "ridge"
+            else LinearSVR(C=C, epsilon=epsilon, dual=True, max_iter=10_000, random_state=random_state))
+    return Pipeline([("scaler", StandardScaler()), ("features", feats), ("model", head)])
+
+class HGBTailClassifier(ClassifierMixin, BaseEstimator):
+    """HistGradientBoostingClassifier (binned features, native NaN) with early stopping on the
+    *last* ``validation_tail`` rows instead of sklearn's shuffled split, which would validate on
+    rows older than the training ones.
+
+    Boosting on the head grows in chunks of ``n_iter_no_change`` iterations until the tail
+    log-loss stops improving; the best iteration count is then refitted on all rows.
+    """
+    def __init__(self, max_iter: int = 300, learning_rate: float = 0.05, max_leaf_nodes: int = 31,
+                 min_samples_leaf: int = 40, l2_regularization: float = 1.0, max_bins: int = 255,
+                 class_weight="balanced", validation_tail: float = 0.15, n_iter_no_change: int = 20,
+                 random_state: int = 42):
+        self.max_iter = max_iter
+        self.learning_rate = learning_rate
+        self.max_leaf_nodes = max_leaf_nodes
+        self.min_samples_leaf = min_samples_leaf
+        self.l2_regularization = l2_regularization
+        self.max_bins = max_bins
+        self.class_weight = class_weight
+        self.validation_tail = validation_tail
+        self.n_iter_no_change = n_iter_no_change
+        self.random_state = random_state
+
+    def _hgb(self, max_iter: int, warm_start: bool = False) -> HistGradientBoostingClassifier:
+        return HistGradientBoostingClassifier(
+            max_iter=max_iter, learning_rate=self.learning_rate, max_leaf_nodes=self.max_leaf_nodes,
+            min_samples_leaf=self.min_samples_leaf, l2_regularization=self.l2_regularization,
+            max_bins=self.max_bins, class_weight=self.class_weight, early_stopping=False,
+            warm_start=warm_start, random_state=self.random_state)
+
+    def _best_iter(self, X: np.ndarray, y: np.ndarray) -> int:
+        head = len(y) - int(len(y) * self.validation_tail)
+        if len(y) - head < 20 or len(np.unique(y[:head])) < 2 or len(np.unique(y[head:])) < 2:
+            return self.max_iter  # cola demasiado corta o de una sola clase: sin parada temprana
+        m = self._hgb(0, warm_start=True)
+        best_loss, it = np.inf, 0
+        while it < self.max_iter:
+            it = min(self.max_iter, it + self.n_iter_no_change)
+            m.set_params(max_iter=it).fit(X[:head], y[:head])
+            loss = log_loss(y[head:], m.predict_proba(X[head:]), labels=m.classes_)
+            if loss >= best_loss:
+                break
+            best_loss = loss
+        losses = [log_loss(y[head:], p, labels=m.classes_) for p in m.staged_predict_proba(X[head:])]
+        return int(np.argmin(losses)) + 1
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=float); y = np.asarray(y)
+        self.best_iter_ = self._best_iter(X, y)
+        self.model_ = self._hgb(self.best_iter_).fit(X, y)
+        self.classes_ = self.model_.classes_
+        return self
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.model_.predict_proba(X)
+
+    def predict(self, X) -> np.ndarray:
+        return self.model_.predict(X)
+
 def get_model_zoo(random_state: int=42) -> Dict[str, Pipeline]:
     models = {
         "linreg": Pipeline([("scaler", StandardScaler()), ("model", LinearRegression())]),
@@ -20,8 +99,12 @@ def get_model_zoo(random_state: int=42) -> Dict[str, Pipeline]:
         "lasso":  Pipeline([("scaler", StandardScaler()), ("model", Lasso(alpha=0.001, random_state=random_state))]),
         "elastic":Pipeline([("scaler", StandardScaler()), ("model", ElasticNet(alpha=0.001, l1_ratio=0.5, random_state=random_state))]),
         "svr":    Pipeline([("scaler", StandardScaler()), ("model", SVR(C=10.0, epsilon=0.01))]),
+        "svr_nys":approx_svr(epsilon=0.01, random_state=random_state),
         "rf":     Pipeline([("model", RandomForestRegressor(n_estimators=300, max_depth=None, random_state=random_state, n_jobs=-1))]),
         "gbr":    Pipeline([("model", GradientBoostingRegressor(random_state=random_state))]),
+        # variantes incrementales (ver models/incremental.py: warm_start / partial_fit)
+        "sgd":    Pipeline([("scaler", StandardScaler()), ("model", SGDRegressor(alpha=1e-4, random_state=random_state))]),
+        "hgb":    Pipeline([("model", HistGradientBoostingRegressor(max_iter=200, early_stopping=False, random_state=random_state))]),
     }
     if HAS_XGB:
         models["xgb"] = Pipeline([("model", XGBRegressor(n_estimators=500, learning_rate=0.05, max_depth=6, subsample=0.8, colsample_bytree=0.8, random_state=random_state, tree_method="hist"))])
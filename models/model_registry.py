@@ -0,0 +1,131 @@
+"""Local model registry: versioned fitted classifiers per (ticker, model) plus a retrain policy.
+
+Layout: ``<root>/<key>/<model>/v0001.joblib`` (the nowcast key is ``<file stem>_h<horizon>``, so
+each label horizon has its own versions) with its metadata in ``v0001.json`` (training
+rows, last trained bar, feature columns, estimator fingerprint, per-feature mean/std). Between
+retrains a signal run only loads the latest version and scores the new bars.
+
+``RetrainPolicy.reason`` decides when a version is stale: no version yet, different features,
+estimator config or label horizon, ``every_bars`` new labelled bars, older than ``max_age_days``, or drift (median
+standardised mean shift of the bars seen since training above ``drift_threshold``).
+"""
+from __future__ import annotations
+import json
+import logging
+import uuid
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Sequence, Tuple
+from urllib.parse import quote
+import joblib
+import numpy as np
+from models.fold_cache import model_digest
+
+DEFAULT_DIR = Path("models/registry")
+
+class ModelRegistry:
+    def __init__(self, root: str | Path = DEFAULT_DIR, keep: int = 5):
+        self.root = Path(root)
+        self.keep = keep
+
+    def _dir(self, ticker: str, model: str) -> Path:
+        return self.root / quote(str(ticker), safe="") / model
+
+    def versions(self, ticker: str, model: str) -> List[int]:
+        d = self._dir(ticker, model)
+        return sorted(int(p.stem[1:]) for p in d.glob("v*.json")) if d.exists() else []
+
+    def metadata(self, ticker: str, model: str, version: int | None = None) -> dict | None:
+        vs = self.versions(ticker, model)
+        if not vs:
+            return None
+        v = vs[-1] if version is None else version
+        p = self._dir(ticker, model) / f"v{v:04d}.json"
+        return json.loads(p.read_text(encoding="utf-8")) if p.exists() else None
+
+    def load(self, ticker: str, model: str, version: int | None = None) -> Tuple[object, dict] | None:
+        """(estimator, metadata) of ``version`` (latest by default), or None."""
+        meta = self.metadata(ticker, model, version)
+        if meta is None:
+            return None
+        try:
+            # sin mmap: cientos de arrays pequeños (árboles) cargan más rápido en memoria
+            est = joblib.load(self._dir(ticker, model) / f"v{meta['version']:04d}.joblib")
+        except (FileNotFoundError, EOFError, OSError, ValueError) as e:
+            logging.warning(f"Registro: no se pudo cargar {ticker}/{model} v{meta['version']}: {e}")
+            return None
+        return est, meta
+
+    def register(self, ticker: str, model: str, estimator, meta: dict) -> int:
+        """Stores a new version (artifact first, metadata last) and prunes old ones; returns the version."""
+        d = self._dir(ticker, model); d.mkdir(parents=True, exist_ok=True)
+        vs = self.versions(ticker, model)
+        v = (vs[-1] + 1) if vs else 1
+        meta = {**meta, "ticker": ticker, "model": model, "version": v,
+                "trained_at": meta.get("trained_at") or datetime.now(timezone.utc).isoformat()}
+        for suffix, write in ((".joblib", lambda t: joblib.dump(estimator, t, compress=0)),
+                              (".json", lambda t: t.write_text(json.dumps(meta, default=str), encoding="utf-8"))):
+            tmp = d / f".v{v:04d}.{uuid.uuid4().hex}.tmp"
+            write(tmp)
+            tmp.replace(d / f"v{v:04d}{suffix}")
+        self.prune(ticker, model)
+        return v
+
+    def prune(self, ticker: str, model: str) -> None:
+        d = self._dir(ticker, model)
+        for v in self.versions(ticker, model)[:-self.keep] if self.keep else []:
+            for suffix in (".json", ".joblib"):
+                (d / f"v{v:04d}{suffix}").unlink(missing_ok=True)
+
+def training_metadata(model, X: np.ndarray, columns: Sequence[str], n_rows: int, last_bar, horizon: int,
+                      reason: str) -> dict:
+    """Metadata of ``model`` fitted on ``X[:n_rows]`` (reference stats for the drift check)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # columnas todo NaN
+        mu = np.nanmean(X[:n_rows], axis=0); sd = np.nanstd(X[:n_rows], axis=0)
+    return {"n_rows": int(n_rows), "last_bar": str(last_bar), "horizon": int(horizon), "features": list(columns),
+            "model_fp": model_digest(model), "reason": reason,
+            "mean": np.where(np.isfinite(mu), mu, 0.0).tolist(), "std": np.where(np.isfinite(sd), sd, 0.0).tolist()}
+
+class RetrainPolicy:
+    """When to refit a registered model (``None`` disables a criterion)."""
+    def __init__(self, every_bars: int | None = 20, max_age_days: float | None = 7.0,
+                 drift_threshold: float | None = 1.0, min_drift_bars: int = 5):
+        self.every_bars = every_bars
+        self.max_age_days = max_age_days
+        self.drift_threshold = drift_threshold
+        self.min_drift_bars = min_drift_bars
+
+    def drift(self, meta: dict, X: np.ndarray) -> float:
+        """Median over features of |mean(new bars) - training mean| / training std."""
+        new = X[meta["n_rows"]:]
+        if len(new) < self.min_drift_bars:
+            return 0.0
+        mu, sd = np.asarray(meta["mean"]), np.asarray(meta["std"])
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            z = np.abs(np.nanmean(new, axis=0) - mu) / sd
+        z = z[np.isfinite(z)]
+        return float(np.median(z)) if len(z) else 0.0
+
+    def reason(self, meta: dict | None, model, X: np.ndarray, columns: Sequence[str], n_rows: int,
+               now: datetime | None = None, horizon: int | None = None) -> str | None:
+        """Why ``model`` must be refitted on ``X[:n_rows]`` (labelled rows), or None to reuse ``meta``'s version."""
+        if meta is None:
+            return "nuevo"
+        if list(columns) != meta.get("features") or model_digest(model) != meta.get("model_fp"):
+            return "config"
+        if horizon is not None and meta.get("horizon") != horizon:
+            return "config"  # otra etiqueta: sus probabilidades no sirven para este horizonte
+        if n_rows < meta["n_rows"]:
+            return "datos"  # el histórico se recortó o se reescribió
+        if self.every_bars is not None and n_rows - meta["n_rows"] >= self.every_bars:
+            return "barras"
+        if self.max_age_days is not None:
+            age = (now or datetime.now(timezone.utc)) - datetime.fromisoformat(meta["trained_at"])
+            if age.total_seconds() >= self.max_age_days * 86400:
+                return "calendario"
+        if self.drift_threshold is not None and self.drift(meta, X) > self.drift_threshold:
+            return "deriva"
+        return None
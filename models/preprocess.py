@@ -0,0 +1,73 @@
+"""Fold-level preprocessing shared across models: fit each imputer / scaler prefix once per fold.
+
+Pipelines whose leading steps are stateless-in-``y`` transformers (``SHAREABLE``) with equal
+configuration share them: within a fold the prefix is fitted once on ``X[train]``, the
+transformed train/test matrices are cached and every model with that prefix only fits its
+remaining steps. ``imputer → scaler`` and ``imputer`` share the imputer pass. The fitted
+estimator is reassembled as a full ``Pipeline`` (same predictions as fitting it alone), so
+artifact / registry storage is unchanged.
+"""
+from __future__ import annotations
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+from sklearn.base import clone
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from models.fold_cache import model_digest
+
+SHAREABLE = (SimpleImputer, StandardScaler)
+
+def shared_prefix(model) -> int:
+    """Number of leading ``SHAREABLE`` steps of a ``Pipeline`` (0 for anything else)."""
+    if not isinstance(model, Pipeline):
+        return 0
+    k = 0
+    for _, step in model.steps[:-1]:  # el último paso es el estimador
+        if not isinstance(step, SHAREABLE):
+            break
+        k += 1
+    return k
+
+class PrefixCache:
+    """Fitted prefixes of one fold, keyed by the steps' configuration."""
+    def __init__(self, X_train: np.ndarray, X_test: np.ndarray):
+        self._cache: Dict[tuple, Tuple[list, np.ndarray, np.ndarray]] = {(): ([], X_train, X_test)}
+        self.fits = 0
+
+    def transform(self, steps: list) -> Tuple[list, np.ndarray, np.ndarray]:
+        """(fitted steps, transformed X_train, transformed X_test) for ``steps``, fitting only missing ones."""
+        key: tuple = ()
+        for _, step in steps:
+            nxt = key + (model_digest(step),)
+            if nxt not in self._cache:
+                fitted, Xtr, Xte = self._cache[key]
+                s = clone(step)
+                Xtr_t = s.fit_transform(Xtr)
+                self._cache[nxt] = (fitted + [s], Xtr_t, s.transform(Xte))
+                self.fits += 1
+            key = nxt
+        return self._cache[key]
+
+def fit_shared(models: dict, X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray,
+               n_jobs: int = -1) -> Iterator[Tuple[str, object, object, np.ndarray]]:
+    """Fits fresh clones of ``models``; yields ``(name, fitted pipeline, fitted head, transformed X_test)``.
+
+    The head (steps after the shared prefix) predicts on the transformed test matrix, so the
+    prefix's test transform also runs once per fold.
+    """
+    cache = PrefixCache(X_train, X_test)
+    for name, model in models.items():
+        m = clone(model)
+        m.set_params(**{k: n_jobs for k, v in m.get_params().items() if k.endswith("n_jobs") and v is not None})
+        k = shared_prefix(m)
+        if k == 0:
+            m.fit(X_train, y_train)
+            yield name, m, m, X_test
+            continue
+        fitted, Xtr, Xte = cache.transform(m.steps[:k])
+        rest: List[tuple] = m.steps[k:]
+        head = rest[0][1] if len(rest) == 1 else Pipeline(rest)
+        head.fit(Xtr, y_train)
+        full = Pipeline([(n, s) for (n, _), s in zip(m.steps[:k], fitted)] + rest)
+        yield name, full, head, Xte
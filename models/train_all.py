@@ -1,19 +1,29 @@
 from __future__ import annotations
+import logging
 from pathlib import Path
-from typing import List
+from typing import List, Sequence
+from concurrent.futures import as_completed
 import numpy as np
 import pandas as pd
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
-from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.multioutput import MultiOutputRegressor
 from sklearn.svm import SVR
+from etl.dataset_registry import REGISTRY, dataset_paths
+from etl.pred_store import HAS_PYARROW, PredictionWriter
+from models.datasets import load_frame
+from models.artifact_cache import ArtifactCache, evicting, features_digest
+from models.checkpoint import DEFAULT_DIR as CHECKPOINT_DIR, RunCheckpoint, new_run_id
+from models.cv import cross_validate, walk_forward
+from models.incremental import IncrementalLinear
+from models.ml_models import approx_svr, get_model_zoo
+from utils.parallel import cpu_budget, process_pool
 
 def _load_file(p: Path) -> pd.DataFrame:
-    df = pd.read_csv(p, parse_dates=["Datetime"])
-    df = df.sort_values("Datetime").reset_index(drop=True)
-    return df
+    return load_frame(p)
 
 def _feature_cols(df: pd.DataFrame, target: str) -> List[str]:
     drop = {"Datetime","Ticker","Interval"}
@@ -26,20 +36,51 @@ def _make_target(df: pd.DataFrame, target: str, horizon: int) -> pd.Series:
     else:
         return df["Close"].shift(-horizon)
 
-def _walk_splits(n: int, test_size: int=200, embargo: int=5):
-    start = max(test_size + embargo, int(n*0.5))
-    splits = []
-    while start < n - test_size:
-        tr_idx = np.arange(0, start - embargo)
-        te_idx = np.arange(start, start + test_size)
-        splits.append((tr_idx, te_idx))
-        start += test_size
+def _walk_splits(n: int, test_size: int=200, embargo: int=5, initial_train: int | None=None):
+    # initial_train fijo = folds anclados (estables al añadir datos, ver models/fold_cache.py)
+    start = max(test_size + embargo, int(n*0.5) if initial_train is None else int(initial_train))
+    # el embargo es la purga antes de cada ventana de test (models/cv.py); solo ventanas completas
+    # que empiezan antes de n - test_size (la que termina justo en n nunca fue un fold)
+    splits = [(tr, te) for tr, te in walk_forward(n, start, test_size, purge=embargo, tail=False)
+              if te.start < n - test_size]
     if not splits:
-        te = np.arange(max(0, n-test_size), n)
-        tr = np.arange(0, max(0, n-test_size))
-        splits.append((tr, te))
+        splits.append((slice(0, max(0, n-test_size)), slice(max(0, n-test_size), n)))
     return splits
 
+SVR_EXACT_MAX = 5000  # con svr="auto", más filas que esto → SVR aproximado (Nystroem)
+
+def _svr_approx(svr: str = "auto", n_rows: int = 0) -> bool:
+    if svr not in ("auto", "exact", "nystroem"):
+        raise ValueError(f"svr desconocido: {svr!r} (auto | exact | nystroem)")
+    return svr == "nystroem" or (svr == "auto" and n_rows > SVR_EXACT_MAX)
+
+def _svr_model(svr: str = "auto", n_rows: int = 0, n_components: int = 300):
+    if _svr_approx(svr, n_rows):
+        return approx_svr(n_components=n_components, epsilon=0.001)
+    return Pipeline([("scaler", StandardScaler()), ("m", SVR(C=10.0, epsilon=0.001))])
+
+REGRESSORS = ("linreg", "rf", "svr", "sgd", "hgb")
+DEFAULT_REGRESSORS = ("linreg", "rf", "svr")
+
+def _regression_models(n_jobs: int = -1, svr: str = "auto", n_rows: int = 0, svr_components: int = 300,
+                       members: Sequence[str] = DEFAULT_REGRESSORS) -> dict:
+    """Regression zoo by name; ``sgd`` (partial_fit) and ``hgb`` (warm_start) are the incremental
+    variants of ``models.ml_models.get_model_zoo`` for ``warm`` walk-forward folds. An approximate
+    SVR is reported as ``svr_nys`` (as in ``get_model_zoo``)."""
+    unknown = set(members) - set(REGRESSORS)
+    if unknown or not members:
+        raise ValueError(f"Regresores desconocidos: {sorted(unknown)} (disponibles: {', '.join(REGRESSORS)})")
+    zoo = {
+        # = StandardScaler + LinearRegression, resuelto por fold desde estadísticos acumulados
+        "linreg": lambda: IncrementalLinear(),
+        "rf": lambda: RandomForestRegressor(n_estimators=400, n_jobs=n_jobs, random_state=42),
+        "svr": lambda: _svr_model(svr, n_rows, svr_components),
+        "sgd": lambda: get_model_zoo()["sgd"],
+        "hgb": lambda: get_model_zoo()["hgb"],
+    }
+    label = lambda name: "svr_nys" if name == "svr" and _svr_approx(svr, n_rows) else name
+    return {label(name): zoo[name]() for name in members}
+
 def run_for_file(
     p: Path,
     metrics: List[dict],
@@ -48,8 +89,28 @@ def run_for_file(
     test_size=200,
     embargo=5,
     save_preds: bool=False,
-    preds_dir: Path=Path("data/preds")
+    preds_dir: Path=Path("data/preds"),
+    warehouse: Path | None=None,
+    run_id: str | None=None,
+    n_jobs: int=-1,
+    fold_jobs: int | None=1,
+    initial_train: int | None=None,
+    fold_cache: str | Path | None=None,
+    warm: tuple=(),
+    svr: str="auto",
+    svr_components: int=300,
+    preds_format: str="parquet",
+    artifacts: str | Path | ArtifactCache | None=None,
+    horizons: Sequence[int] | None=None,
+    members: Sequence[str]=DEFAULT_REGRESSORS
 ):
+    if horizons:
+        return run_multi_horizon_file(p, metrics, horizons=horizons, target=target, test_size=test_size,
+                                      embargo=embargo, save_preds=save_preds, preds_dir=preds_dir,
+                                      warehouse=warehouse, run_id=run_id, n_jobs=n_jobs, fold_jobs=fold_jobs,
+                                      initial_train=initial_train, fold_cache=fold_cache, warm=warm, svr=svr,
+                                      svr_components=svr_components, preds_format=preds_format,
+                                      artifacts=artifacts, members=members)
     df = _load_file(p)
     y = _make_target(df, target, horizon=horizon)
     X_cols = _feature_cols(df, target)
@@ -57,35 +118,142 @@ def run_for_file(
     data["y"] = y
     data = data.dropna().copy()
     if len(data) < 300: return
-    X = data[X_cols].values; yv = data["y"].values
+    X = np.ascontiguousarray(data[X_cols].values); yv = data["y"].values  # mismo layout en serie y en memoria compartida
     idx = data.index.values
-    models = {
-        "linreg": Pipeline([("scaler", StandardScaler()), ("m", LinearRegression())]),
-        "rf": RandomForestRegressor(n_estimators=400, n_jobs=-1, random_state=42),
-        "svr": Pipeline([("scaler", StandardScaler()), ("m", SVR(C=10.0, epsilon=0.001))]),
-    }
-    preds_dir.mkdir(parents=True, exist_ok=True)
+    models = _regression_models(n_jobs=n_jobs, svr=svr, n_rows=len(data), svr_components=svr_components,
+                                members=members)
+    # el embargo nunca es menor que el horizonte: sus etiquetas solaparían la ventana de test
+    splits = _walk_splits(len(data), test_size=test_size, embargo=max(embargo, horizon), initial_train=initial_train)
+    fold_preds = _fit_regression_folds(X, yv, splits, models, X_cols, n_jobs=n_jobs, fold_jobs=fold_jobs,
+                                       fold_cache=fold_cache, warm=warm, artifacts=artifacts)
+    _emit_regression(p, df, idx, yv, splits, fold_preds, list(models), metrics, save_preds=save_preds,
+                     preds_dir=preds_dir, preds_format=preds_format, warehouse=warehouse, run_id=run_id)
+
+NATIVE_MULTI_OUTPUT = (RandomForestRegressor, IncrementalLinear, LinearRegression, Ridge)
+
+def _multi_output(model):
+    """Native multi-output estimators as they are; others (SVR) get one fit per target in the same
+    fold (only the final step is wrapped, so the scaler is still fitted once)."""
+    if isinstance(model, Pipeline):
+        final = model.steps[-1][1]
+        return model if isinstance(final, NATIVE_MULTI_OUTPUT) else \
+            Pipeline(model.steps[:-1] + [(model.steps[-1][0], MultiOutputRegressor(final))])
+    return model if isinstance(model, NATIVE_MULTI_OUTPUT) else MultiOutputRegressor(model)
+
+def run_multi_horizon_file(p: Path, metrics: List[dict], horizons: Sequence[int] = (1, 5, 20), target: str = "ret",
+                           test_size: int = 200, embargo: int = 5, save_preds: bool = False,
+                           preds_dir: Path = Path("data/preds"), warehouse: Path | None = None,
+                           run_id: str | None = None, n_jobs: int = -1, fold_jobs: int | None = 1,
+                           initial_train: int | None = None, fold_cache: str | Path | None = None,
+                           warm: tuple = (), svr: str = "auto", svr_components: int = 300,
+                           preds_format: str = "parquet", artifacts: str | Path | ArtifactCache | None = None,
+                           members: Sequence[str] = DEFAULT_REGRESSORS):
+    """``run_for_file`` for several horizons in one pass: one load, a target column per horizon and
+    one fold loop whose models fit all targets at once (RF / linear natively, SVR per column).
+
+    Rows need every horizon's target, and the embargo is at least the longest horizon (its
+    labels overlap the test block otherwise). Metrics carry ``horizon``; predictions are stored
+    as ``<model>_h<horizon>``.
+    """
+    horizons = sorted(set(int(h) for h in horizons))
+    df = _load_file(p)
+    X_cols = _feature_cols(df, target)
+    data = df[X_cols].copy()
+    y_cols = [f"y_h{h}" for h in horizons]
+    for h, c in zip(horizons, y_cols):
+        data[c] = _make_target(df, target, horizon=h)
+    data = data.dropna().copy()
+    if len(data) < 300: return
+    X = np.ascontiguousarray(data[X_cols].values); Y = np.ascontiguousarray(data[y_cols].values)
+    idx = data.index.values
+    models = {name: _multi_output(m) for name, m in
+              _regression_models(n_jobs=n_jobs, svr=svr, n_rows=len(data), svr_components=svr_components,
+                                 members=members).items()}
+    splits = _walk_splits(len(data), test_size=test_size, embargo=max(embargo, horizons[-1]), initial_train=initial_train)
+    fold_preds = _fit_regression_folds(X, Y, splits, models, X_cols, n_jobs=n_jobs, fold_jobs=fold_jobs,
+                                       fold_cache=fold_cache, warm=warm, artifacts=artifacts)
+    for j, h in enumerate(horizons):
+        _emit_regression(p, df, idx, Y[:, j], splits, [{m: pr[m][:, j] for m in pr} for pr in fold_preds],
+                         list(models), metrics, save_preds=save_preds, preds_dir=preds_dir,
+                         preds_format=preds_format, warehouse=warehouse, run_id=run_id, horizon=h)
+
+def _fit_regression_folds(X: np.ndarray, yv: np.ndarray, splits: list, models: dict, X_cols: List[str],
+                          n_jobs: int = -1, fold_jobs: int | None = 1, fold_cache: str | Path | None = None,
+                          warm: tuple = (), artifacts: str | Path | ArtifactCache | None = None) -> List[dict]:
+    """``{model: y_pred}`` per split (``models.cv.cross_validate``).
+
+    Folds are independent: in parallel (shared memory) or serially, results in split order.
+    With fold_cache only new or invalidated folds are fitted; models in ``warm`` are carried
+    across folds (warm_start / partial_fit) serially; with artifacts, estimators already fitted
+    on the same slice are reloaded (joblib, mmap).
+    """
+    return cross_validate(models, X, yv, splits, method="predict", workers=fold_jobs, n_jobs=n_jobs,
+                          fold_cache=fold_cache, artifacts=artifacts, features_fp=features_digest(X_cols),
+                          warm=warm)
+
+def _emit_regression(p: Path, df: pd.DataFrame, idx: np.ndarray, yv: np.ndarray, splits: list, fold_preds: List[dict],
+                     model_names: List[str], metrics: List[dict], save_preds: bool = False,
+                     preds_dir: Path = Path("data/preds"), preds_format: str = "parquet",
+                     warehouse: Path | None = None, run_id: str | None = None, horizon: int | None = None) -> None:
+    """Per-split metrics (appended to ``metrics``) and predictions (store / CSV / warehouse);
+    with ``horizon`` metrics are tagged and models are named ``<model>_h<horizon>``."""
+    tag = f"_h{horizon}" if horizon is not None else ""
+    csv_preds = save_preds and (preds_format == "csv" or not HAS_PYARROW)
+    if csv_preds:
+        preds_dir.mkdir(parents=True, exist_ok=True)
+    keep = save_preds or warehouse
+    wh_frames = []
     split_id = 0
-    for tr, te in _walk_splits(len(data), test_size=test_size, embargo=embargo):
-        xtr, xte = X[tr], X[te]; ytr, yte = yv[tr], yv[te]
+    for (tr, te), preds in zip(splits, fold_preds):
+        yte = yv[te]
         dte = df.loc[idx[te], ["Datetime","Ticker"]].reset_index(drop=True)
         stack = []
-        for name, model in models.items():
-            model.fit(xtr, ytr)
-            pred = model.predict(xte)
+        for name in model_names:
+            pred = preds[name]
             rmse = mean_squared_error(yte, pred, squared=False)
             mae = mean_absolute_error(yte, pred)
-            metrics.append({"file": p.name, "ticker": p.stem.split("_")[0], "model": name, "split": split_id, "n_train": len(tr), "n_test": len(te), "rmse": rmse, "mae": mae})
-            if save_preds:
+            metrics.append({"file": p.name, "ticker": p.stem.split("_")[0], "model": name, "split": split_id, "n_train": len(yv[tr]), "n_test": len(yte), "rmse": rmse, "mae": mae,
+                            **({"horizon": horizon} if horizon is not None else {})})
+            if keep:
                 out = dte.copy(); out["y_true"] = yte; out["y_pred"] = pred
-                out.to_csv(preds_dir / f"{p.stem}_{name}_split{split_id}.csv", index=False)
+                if csv_preds:
+                    out.to_csv(preds_dir / f"{p.stem}_{name}{tag}_split{split_id}.csv", index=False)
+                wh_frames.append(out.assign(model=name + tag, split=split_id))
             stack.append(pred)
-        if stack and save_preds:
+        if stack and keep:
             ens = np.column_stack(stack).mean(axis=1)
             out = dte.copy(); out["y_true"] = yte; out["y_pred"] = ens
             # (FIX) guardar correctamente el CSV del ensemble
-            out.to_csv(preds_dir / f"{p.stem}_ensemble_weighted_split{split_id}.csv", index=False)
+            if csv_preds:
+                out.to_csv(preds_dir / f"{p.stem}_ensemble_weighted{tag}_split{split_id}.csv", index=False)
+            wh_frames.append(out.assign(model="ensemble_weighted" + tag, split=split_id))
         split_id += 1
+    if not wh_frames:
+        return
+    all_preds = pd.concat(wh_frames, ignore_index=True)
+    run_id = run_id or new_run_id()  # una corrida suelta es su propia corrida (ordena por fecha en list_runs)
+    if save_preds and not csv_preds:
+        # todas las predicciones del archivo → un Parquet en preds_dir/store/run_id=…/ticker=…/
+        with PredictionWriter(run_id, root=preds_dir / "store") as writer:
+            writer.append(all_preds, interval=p.stem.split("_")[1] if "_" in p.stem else None)
+    if warehouse:
+        # una sola inserción masiva por archivo
+        from etl.warehouse import write_predictions
+        write_predictions(all_preds, run_id=run_id, db_path=warehouse)
+
+def _run_file_task(p: Path, kwargs: dict, n_jobs: int) -> tuple[List[dict], int, int, str | None]:
+    """Metrics of one file, its artifact-cache (hits, misses) and the error, if any."""
+    metrics: List[dict] = []
+    art = kwargs.get("artifacts")
+    art = ArtifactCache(art.root, art.max_bytes) if art is not None else None  # contadores por archivo
+    error = None
+    with evicting(art):
+        try:
+            run_for_file(p, metrics, n_jobs=n_jobs, **{**kwargs, "artifacts": art})
+        except Exception as e:
+            logging.exception(f"train_all: falló {p.name}")
+            error = f"{type(e).__name__}: {e}"
+    return metrics, (art.hits if art else 0), (art.misses if art else 0), error
 
 def run_for_folder(
     folder: str="data/raw",
@@ -95,15 +263,106 @@ def run_for_folder(
     horizon: int=1,
     test_size: int=200,
     embargo: int=5,
-    save_preds: bool=False
+    save_preds: bool=False,
+    warehouse: str | Path | None=None,
+    n_workers: int | None=None,
+    fold_jobs: int | None=1,
+    initial_train: int | None=None,
+    fold_cache: str | Path | None=None,
+    warm: tuple=(),
+    svr: str="auto",
+    svr_components: int=300,
+    preds_format: str="parquet",
+    artifacts: str | Path | None=None,
+    resume: bool | str=False,
+    checkpoint_dir: str | Path=CHECKPOINT_DIR,
+    horizons: Sequence[int] | None=None,
+    members: Sequence[str]=DEFAULT_REGRESSORS
 ) -> str:
+    """Trains every file in ``n_workers`` processes (None = one per core, threads split between them);
+    checkpointed under ``checkpoint_dir`` so ``resume`` skips finished files and folds."""
     folder = Path(folder)
-    metrics = []
-    for p in sorted(folder.glob(pattern)):
-        try:
-            run_for_file(p, metrics, target=target, horizon=horizon, test_size=test_size, embargo=embargo, save_preds=save_preds, preds_dir=Path("data/preds"))
-        except Exception:
-            pass
+    ckpt = RunCheckpoint.open("regression", resume=resume, root=checkpoint_dir)
+    run_id = ckpt.run_id
+    ckpt.save_params(dict(folder=folder, pattern=pattern, target=target, horizon=horizon, test_size=test_size,
+                          embargo=embargo, initial_train=initial_train, warm=list(warm), svr=svr,
+                          svr_components=svr_components, save_preds=save_preds, preds_format=preds_format,
+                          warehouse=warehouse, horizons=list(horizons) if horizons else None,
+                          members=list(members)))
+    done = ckpt.completed()
+    metrics = [m for unit in done.values() for m in (unit or [])]
+    paths = [p for p in dataset_paths(folder, pattern) if p.name not in done]
+    if done:
+        logging.info(f"train_all: reanudando {run_id} ({len(done)} archivos ya completados, {len(paths)} pendientes)")
+    kwargs = dict(target=target, horizon=horizon, test_size=test_size, embargo=embargo, save_preds=save_preds,
+                  preds_dir=Path("data/preds"), warehouse=Path(warehouse) if warehouse else None, run_id=run_id,
+                  initial_train=initial_train, fold_cache=ckpt.fold_cache(fold_cache), warm=tuple(warm),
+                  svr=svr, svr_components=svr_components, preds_format=preds_format,
+                  artifacts=ArtifactCache(artifacts) if artifacts else None,
+                  horizons=tuple(horizons) if horizons else None, members=tuple(members))
+    workers, threads = cpu_budget(n_workers, n_tasks=max(1, len(paths)))
+    results = {}
+
+    def finished(p: Path, res: tuple) -> None:
+        # checkpoint por archivo: visible durante la corrida y base de resume
+        results[p] = res
+        if res[3] is None:
+            ckpt.record(p.name, res[0]); ckpt.append_rows(res[0])
+        else:
+            ckpt.record(p.name, error=res[3])
+
+    if workers <= 1:
+        for p in paths:
+            finished(p, _run_file_task(p, {**kwargs, "fold_jobs": fold_jobs}, n_jobs=threads))
+    else:
+        REGISTRY.flush()  # los workers (spawn) leen de disco
+        # más grandes primero: los archivos largos no quedan para el final
+        by_size = sorted(paths, key=lambda q: q.stat().st_size if q.exists() else 0, reverse=True)
+        with process_pool(workers, threads) as pool:
+            futures = {pool.submit(_run_file_task, p, kwargs, threads): p for p in by_size}
+            for f in as_completed(futures):
+                finished(futures[f], f.result())
+    for p in paths:
+        metrics.extend(results[p][0])
+    art = kwargs["artifacts"]
+    if art is not None:
+        art.hits = sum(r[1] for r in results.values()); art.misses = sum(r[2] for r in results.values())
+        logging.info(art.report())
     out = Path(metrics_out); out.parent.mkdir(parents=True, exist_ok=True)
     pd.DataFrame(metrics).to_csv(out, index=False)
+    failed = ckpt.failed()
+    if failed:
+        logging.warning(f"train_all: {len(failed)} archivos fallaron ({', '.join(failed[:10])}); reintentar con resume")
+    else:
+        ckpt.mark_complete()
     return str(out)
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--folder", type=str, default="data/raw")
+    ap.add_argument("--pattern", type=str, default="*_1d.csv")
+    ap.add_argument("--metrics-out", type=str, default="models/metrics_full.csv")
+    ap.add_argument("--horizon", type=int, default=1)
+    ap.add_argument("--horizons", type=int, nargs="+", default=None, help="varios horizontes en una pasada (p. ej. 1 5 20)")
+    ap.add_argument("--test-size", type=int, default=200)
+    ap.add_argument("--save-preds", action="store_true")
+    ap.add_argument("--warehouse", type=str, default=None)
+    ap.add_argument("--workers", type=int, default=0, help="procesos por archivo (0 = uno por núcleo)")
+    ap.add_argument("--initial-train", type=int, default=None,
+                    help="filas iniciales fijas: folds anclados, reutilizables por --fold-cache")
+    ap.add_argument("--fold-cache", type=str, default=None, help="directorio de caché de folds (reentrenamiento incremental)")
+    ap.add_argument("--members", nargs="+", default=list(DEFAULT_REGRESSORS), choices=REGRESSORS,
+                    help="modelos de regresión (sgd / hgb: variantes incrementales)")
+    ap.add_argument("--warm", nargs="*", default=[], help="modelos con warm start / partial_fit entre folds (rf, sgd, hgb)")
+    ap.add_argument("--artifacts", type=str, default=None)
+    ap.add_argument("--resume", nargs="?", const=True, default=False,
+                    help="continuar la última corrida incompleta (o el run_id indicado)")
+    args = ap.parse_args()
+    print(run_for_folder(folder=args.folder, pattern=args.pattern, metrics_out=args.metrics_out, horizon=args.horizon,
+                         test_size=args.test_size, save_preds=args.save_preds, warehouse=args.warehouse,
+                         n_workers=args.workers or None, initial_train=args.initial_train,
+                         fold_cache=args.fold_cache, artifacts=args.artifacts, resume=args.resume,
+                         members=tuple(args.members), warm=tuple(args.warm),
+                         horizons=args.horizons))
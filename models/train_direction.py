@@ -10,15 +10,23 @@ from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.multioutput import MultiOutputClassifier
+from sklearn.base import clone
+from etl.dataset_registry import dataset_paths
+from models.datasets import load_frame
+from models.artifact_cache import ArtifactCache, evicting, features_digest
+from models.checkpoint import DEFAULT_DIR as CHECKPOINT_DIR, RunCheckpoint
+from models.cv import cross_validate, walk_forward
+from models.model_registry import ModelRegistry, RetrainPolicy, training_metadata
+from models.leaderboard import Leaderboard, summary_columns
+from models.ml_models import HGBTailClassifier
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 
 ANSI_GREEN = "\033[92m"; ANSI_RED = "\033[91m"; ANSI_BOLD = "\033[1m"; ANSI_RESET = "\033[0m"
 
 def load_df(p: Path) -> pd.DataFrame:
-    df = pd.read_csv(p, parse_dates=["Datetime"])
-    df = df.sort_values("Datetime").reset_index(drop=True)
-    return df
+    return load_frame(p)
 
 def make_label(df: pd.DataFrame, target_col: str = "ret", horizon: int = 1) -> pd.Series:
     return (df[target_col].shift(-horizon) > 0).astype(int)
@@ -28,16 +36,9 @@ def feature_columns(df: pd.DataFrame) -> list[str]:
     num_cols = [c for c in df.select_dtypes(include=[np.number]).columns if c not in drop_cols]
     return num_cols
 
-def walk_forward_indices(n: int, initial_train: int, test_size: int):
-    start = initial_train
-    while start < n:
-        tr = np.arange(0, start)
-        te_end = min(n, start + test_size)
-        te = np.arange(start, te_end)
-        if len(te) == 0:
-            break
-        yield tr, te
-        start = te_end
+def walk_forward_indices(n: int, initial_train: int, test_size: int, purge: int = 0) -> list:
+    """Expanding (train, test) slices; training stops ``purge`` rows (label horizon) before each test block."""
+    return walk_forward(n, initial_train, test_size, purge=purge)
 
 def _fmt_pct(x: float | None) -> str:
     if x is None or (isinstance(x, float) and (np.isnan(x) or np.isinf(x))): return "—"
@@ -49,8 +50,36 @@ def _color_pred(label: str) -> str:
     if s == "DOWN": return f"{ANSI_RED}{label}{ANSI_RESET}"
     return label
 
-def train_one_file(p: Path, horizon: int = 1, initial_train: int | None = None, test_size: int = 200,
-                   save_trace: bool = False, trace_dir: Path | None = None) -> dict:
+CLASSIFIERS = ("logreg", "rf", "hgb")
+DEFAULT_MEMBERS = ("logreg", "rf")
+
+def classifier_models(n_jobs: int = -1, members: tuple = DEFAULT_MEMBERS) -> dict:
+    """Ensemble members by name (``hgb``: boosting on binned features, alternative to ``rf``)."""
+    unknown = set(members) - set(CLASSIFIERS)
+    if unknown or not members:
+        raise ValueError(f"Clasificadores desconocidos: {sorted(unknown)} (disponibles: {', '.join(CLASSIFIERS)})")
+    zoo = {
+        "logreg": lambda: Pipeline([
+            ("imputer", SimpleImputer(strategy="median")),
+            ("scaler", StandardScaler(with_mean=True)),
+            ("clf", LogisticRegression(max_iter=2000, class_weight="balanced"))
+        ]),
+        "rf": lambda: Pipeline([
+            ("imputer", SimpleImputer(strategy="median")),
+            ("clf", RandomForestClassifier(n_estimators=400, n_jobs=n_jobs,
+                                          class_weight="balanced_subsample", random_state=42))
+        ]),
+        # NaN nativos (sin imputer); parada temprana sobre la cola temporal del train
+        "hgb": lambda: Pipeline([("clf", HGBTailClassifier(class_weight="balanced", random_state=42))]),
+    }
+    return {name: zoo[name]() for name in members}
+
+def ensemble_proba(probas: dict) -> float:
+    """Equal-weight mean of the members' P(up)."""
+    return float(np.clip(np.mean(list(probas.values())), 0, 1))
+
+def _prepare(p: Path, horizon: int = 1) -> tuple[pd.DataFrame, np.ndarray, np.ndarray, list[str]]:
+    """(df, X, label, feature columns) for one file."""
     df = load_df(p)
     if df.empty or "ret" not in df.columns:
         raise ValueError("DataFrame vacío o sin columna 'ret'")
@@ -61,46 +90,122 @@ def train_one_file(p: Path, horizon: int = 1, initial_train: int | None = None,
     X_df = df[X_cols].copy().replace([np.inf, -np.inf], np.nan).dropna(axis=1, how="all")
     if X_df.shape[1] == 0:
         raise ValueError("Todas las columnas de features están vacías (NaN).")
-    X = X_df.to_numpy(dtype=float)
-    yv = y.to_numpy(dtype=int)
+    X = np.ascontiguousarray(X_df.to_numpy(dtype=float))  # mismo layout en serie y en memoria compartida
+    return df, X, y.to_numpy(dtype=int), list(X_df.columns)
+
+def train_one_file(p: Path, horizon: int = 1, initial_train: int | None = None, test_size: int = 200,
+                   save_trace: bool = False, trace_dir: Path | None = None, warehouse: Path | None = None,
+                   n_jobs: int = -1, fold_jobs: int | None = 1, fold_cache: str | Path | None = None,
+                   warm: tuple = (), artifacts: str | Path | ArtifactCache | None = None,
+                   members: tuple = DEFAULT_MEMBERS, cascade: float | None = None, purge: int | None = None) -> dict:
+    """Walk-forward probabilities of one file; ``cascade`` (band around 0.5) fits the members
+    after the first one only on folds where the first member is undecided (see ``cascade_probas``).
+    ``purge`` training rows before each test window are dropped (default: the horizon, whose
+    labels would overlap the window)."""
+    df, X, yv, X_cols = _prepare(p, horizon)
     idx = np.arange(len(df)); n = len(df)
 
     if initial_train is None:
         initial_train = max(500, int(n * 0.6))
 
-    models = {
-        "logreg": Pipeline([
-            ("imputer", SimpleImputer(strategy="median")),
-            ("scaler", StandardScaler(with_mean=True)),
-            ("clf", LogisticRegression(max_iter=2000, class_weight="balanced"))
-        ]),
-        "rf": Pipeline([
-            ("imputer", SimpleImputer(strategy="median")),
-            ("clf", RandomForestClassifier(n_estimators=400, n_jobs=-1,
-                                          class_weight="balanced_subsample", random_state=42))
-        ]),
-    }
-
+    models = classifier_models(n_jobs=n_jobs, members=members)
+    purge = horizon if purge is None else purge
+    splits = [(tr, te) for tr, te in walk_forward_indices(n, initial_train, test_size, purge=purge)
+              if len(np.unique(yv[tr])) >= 2]
+    fit = lambda sp, ms: _fit_classifier_folds(X, yv, sp, ms, X_cols, n_jobs=n_jobs, fold_jobs=fold_jobs,
+                                               fold_cache=fold_cache, warm=tuple(w for w in warm if w in ms),
+                                               artifacts=artifacts)
+    fold_probas = cascade_probas(fit, splits, models, cascade)
+    return _emit_classification(p, df, idx, yv, splits, fold_probas, list(models), save_trace=save_trace,
+                                trace_dir=trace_dir, warehouse=warehouse)
+
+NATIVE_MULTI_OUTPUT = (RandomForestClassifier,)
+
+def _multi_output(model):
+    """Multi-label version of a member: RF natively, others one fit per label (final step wrapped)."""
+    final = model.steps[-1][1] if isinstance(model, Pipeline) else model
+    if isinstance(final, NATIVE_MULTI_OUTPUT):
+        return model
+    if isinstance(model, Pipeline):
+        return Pipeline(model.steps[:-1] + [(model.steps[-1][0], MultiOutputClassifier(final))])
+    return MultiOutputClassifier(model)
+
+def train_multi_horizon_file(p: Path, horizons=(1, 5, 20), initial_train: int | None = None, test_size: int = 200,
+                             save_trace: bool = False, trace_dir: Path | None = None,
+                             warehouse: Path | None = None, n_jobs: int = -1, fold_jobs: int | None = 1,
+                             fold_cache: str | Path | None = None,
+                             artifacts: str | Path | ArtifactCache | None = None,
+                             members: tuple = DEFAULT_MEMBERS, warm: tuple = (), cascade: float | None = None) -> dict:
+    """``train_one_file`` for several horizons in one pass: one load, a label column per horizon
+    and one walk-forward loop fitting every label at once (purged by the longest horizon);
+    returns ``{horizon: summary}``."""
+    horizons = sorted(set(int(h) for h in horizons))
+    df, X, _, X_cols = _prepare(p, horizons[0])
+    Y = np.ascontiguousarray(np.column_stack([make_label(df, "ret", horizon=h).to_numpy(dtype=int) for h in horizons]))
+    idx = np.arange(len(df)); n = len(df)
+    if initial_train is None:
+        initial_train = max(500, int(n * 0.6))
+    models = {name: _multi_output(m) for name, m in classifier_models(n_jobs=n_jobs, members=members).items()}
+    # purga del horizonte más largo: los folds (y las filas de train) son comunes a todas las etiquetas
+    splits = [(tr, te) for tr, te in walk_forward_indices(n, initial_train, test_size, purge=horizons[-1])
+              if all(len(np.unique(Y[tr, j])) >= 2 for j in range(len(horizons)))]
+    fit = lambda sp, ms: _fit_classifier_folds(X, Y, sp, ms, X_cols, n_jobs=n_jobs, fold_jobs=fold_jobs,
+                                               fold_cache=fold_cache, warm=tuple(w for w in warm if w in ms),
+                                               artifacts=artifacts)
+    fold_probas = cascade_probas(fit, splits, models, cascade)
+    return {h: _emit_classification(p, df, idx, Y[:, j], splits, [{m: pr[m][:, j] for m in pr} for pr in fold_probas],
+                                    list(models), save_trace=save_trace, trace_dir=trace_dir,
+                                    warehouse=warehouse, horizon=h)
+            for j, h in enumerate(horizons)}
+
+def cascade_probas(fit, splits: list, models: dict, band: float | None = None) -> list[dict]:
+    """``fit(splits, models) -> [{model: proba_up}]`` with cascaded members.
+
+    With ``band`` the first (cheap) member runs on every split and the remaining (expensive)
+    ones only on splits whose reported bar (the last one) has a cheap probability within
+    ``band`` of 0.5 (any horizon, for multi-output members); elsewhere the split's dict only
+    holds the cheap member.
+    """
+    if band is None or len(models) == 1:
+        return fit(splits, models)
+    cheap, *rest = models
+    out = fit(splits, {cheap: models[cheap]})
+    need = [i for i, pr in enumerate(out) if np.any(np.abs(np.asarray(pr[cheap][-1], dtype=float) - 0.5) < band)]
+    if need:
+        for i, pr in zip(need, fit([splits[i] for i in need], {name: models[name] for name in rest})):
+            out[i].update(pr)
+    return out
+
+def _fit_classifier_folds(X: np.ndarray, yv: np.ndarray, splits: list, models: dict, X_cols: list[str],
+                          n_jobs: int = -1, fold_jobs: int | None = 1, fold_cache: str | Path | None = None,
+                          warm: tuple = (), artifacts: str | Path | ArtifactCache | None = None) -> list[dict]:
+    """``{model: proba_up}`` per split (``models.cv.cross_validate``: fold cache → artifact cache →
+    fit; ``warm`` models carried across folds)."""
+    return cross_validate(models, X, yv, splits, method="predict_proba", workers=fold_jobs, n_jobs=n_jobs,
+                          fold_cache=fold_cache, artifacts=artifacts, features_fp=features_digest(X_cols),
+                          warm=warm)
+
+def _emit_classification(p: Path, df: pd.DataFrame, idx: np.ndarray, yv: np.ndarray, splits: list,
+                         fold_probas: list[dict], model_names: list[str], save_trace: bool = False,
+                         trace_dir: Path | None = None, warehouse: Path | None = None,
+                         horizon: int | None = None) -> dict:
+    """Trace rows (CSV / warehouse SIGNALS) and the latest-window summary of one ticker; with
+    ``horizon`` the trace is ``<stem>_h<h>_trace.csv``, SIGNALS models are ``<model>_h<h>`` and
+    the summary carries ``horizon``."""
+    tag = f"_h{horizon}" if horizon is not None else ""
     last_proba = {}
     last_date = None
     trace_rows = []  # <<— rastro completo
 
-    for tr, te in walk_forward_indices(n, initial_train=initial_train, test_size=test_size):
-        X_tr, X_te = X[tr], X[te]
-        y_tr, y_te = yv[tr], yv[te]
+    for (tr, te), probas in zip(splits, fold_probas):
         te_idx = idx[te]
-        if len(np.unique(y_tr)) < 2:
-            continue
-
         row = {"Datetime": df.loc[te_idx[-1], "Datetime"], "ticker": p.stem.split("_")[0]}
 
-        for name, model in models.items():
-            model.fit(X_tr, y_tr)
-            proba = model.predict_proba(X_te)[:, 1]
-            row[f"proba_{name}"] = float(proba[-1])
-            last_proba[name] = float(proba[-1])
+        # con cascada un fold puede traer solo el miembro barato
+        last_proba = {name: float(probas[name][-1]) for name in model_names if name in probas}
+        row.update({f"proba_{name}": v for name, v in last_proba.items()})
 
-        proba_ens = float(np.clip(0.5*(row.get("proba_logreg",0.5)+row.get("proba_rf",0.5)),0,1))
+        proba_ens = ensemble_proba(last_proba)
         row["proba_ens"] = proba_ens
         row["pred"] = "UP" if proba_ens >= 0.5 else "DOWN"
         row["y_true_next"] = int(yv[te][-1])  # etiqueta de la última posición de esa ventana
@@ -112,11 +217,21 @@ def train_one_file(p: Path, horizon: int = 1, initial_train: int | None = None,
     if save_trace and trace_rows:
         outdir = (trace_dir or Path("models/traces"))
         outdir.mkdir(parents=True, exist_ok=True)
-        pd.DataFrame(trace_rows).to_csv(outdir / f"{p.stem}_trace.csv", index=False)
-
-    proba_logreg = last_proba.get("logreg", 0.5)
-    proba_rf     = last_proba.get("rf", 0.5)
-    proba_ens    = float(np.clip(0.5*(proba_logreg+proba_rf),0,1))
+        pd.DataFrame(trace_rows).to_csv(outdir / f"{p.stem}{tag}_trace.csv", index=False)
+    if warehouse and trace_rows:
+        from etl.warehouse import write_signals
+        # SIGNALS es (ticker, datetime, model): cada horizonte con su propio nombre de modelo
+        rows = [{(k + tag if k.startswith("proba_") else k): v for k, v in r.items()} for r in trace_rows] if tag else trace_rows
+        write_signals(rows, db_path=warehouse)
+
+    if not last_proba:
+        last_proba = {name: 0.5 for name in model_names}  # sin folds walk-forward: señal neutral por miembro
+    summary = _summary(p, last_date, last_proba, model_names)
+    return {**summary, "horizon": horizon} if horizon is not None else summary
+
+def _summary(p: Path, last_date, last_proba: dict, members=None) -> dict:
+    """Summary row with one ``proba_<member>`` per configured member (NaN if the cascade skipped it)."""
+    proba_ens    = ensemble_proba(last_proba)
     pred_label   = "UP" if proba_ens >= 0.5 else "DOWN"
     confidence   = abs(proba_ens - 0.5)
 
@@ -124,23 +239,81 @@ def train_one_file(p: Path, horizon: int = 1, initial_train: int | None = None,
         "file": p.name,
         "ticker": p.stem.split("_")[0],
         "last_date": last_date,
-        "proba_logreg": proba_logreg,
-        "proba_rf": proba_rf,
+        **{f"proba_{name}": last_proba.get(name, float("nan")) for name in (members or last_proba)},
         "proba_ens": proba_ens,
         "pred": pred_label,
         "confidence": confidence,
     }
 
+def _single_thread(est):
+    """Scoring one bar: threads cost more than they save (``n_jobs`` of any step set to 1)."""
+    params = {k: 1 for k in est.get_params() if k == "n_jobs" or k.endswith("__n_jobs")}
+    return est.set_params(**params) if params else est
+
+def _registered_probas(key: str, X: np.ndarray, yv: np.ndarray, X_cols: list, n_lab: int, last_bar,
+                       horizon: int, models: dict, registry: ModelRegistry, policy: RetrainPolicy) -> dict:
+    """Newest-bar probability per model from the registry; refits (and registers) only when ``policy`` says so."""
+    out = {}
+    for name, model in models.items():
+        loaded = registry.load(key, name)
+        reason = policy.reason(loaded[1] if loaded else None, model, X, X_cols, n_lab, horizon=horizon)
+        if reason is None:
+            est = _single_thread(loaded[0])
+        else:
+            est = clone(model).fit(X[:n_lab], yv[:n_lab])
+            v = registry.register(key, name, est,
+                                  training_metadata(model, X, X_cols, n_lab, last_bar, horizon, reason))
+            logging.info(f"Registro: {key}/{name} v{v} reentrenado ({reason})")
+        out[name] = float(est.predict_proba(X[-1:])[:, 1][0])
+    return out
+
+def nowcast_one_file(p: Path, horizon: int = 1, warehouse: Path | None = None, n_jobs: int = -1,
+                     artifacts: str | Path | ArtifactCache | None = None,
+                     registry: str | Path | ModelRegistry | None = None, policy: RetrainPolicy | None = None,
+                     members: tuple = DEFAULT_MEMBERS, cascade: float | None = None) -> dict:
+    """Latest probability only: one fit on every labelled row, scored on the newest bar.
+
+    Same summary as ``train_one_file`` without the historical walk-forward (that is the
+    evaluation job); the signal goes to the warehouse without ``y_true``. With ``registry`` the
+    fitted models are versioned there and only refitted when ``policy`` (default
+    ``RetrainPolicy()``) asks for it; otherwise the registered version just scores the bar.
+    ``cascade`` skips the expensive members when the first one is outside the band.
+    """
+    df, X, yv, X_cols = _prepare(p, horizon)
+    n = len(df); n_lab = n - horizon  # las últimas `horizon` filas aún no tienen etiqueta
+    if n_lab < 2 or len(np.unique(yv[:n_lab])) < 2:
+        raise ValueError("Sin suficientes filas etiquetadas (o una sola clase) para nowcast")
+    models = classifier_models(n_jobs=n_jobs, members=members)
+    last_date = df["Datetime"].iloc[-1]
+    if registry is not None:
+        if not isinstance(registry, ModelRegistry):
+            registry = ModelRegistry(registry)
+        fit = lambda sp, ms: [{name: np.array([v]) for name, v in _registered_probas(
+            f"{p.stem}_h{horizon}", X, yv, X_cols, n_lab, df["Datetime"].iloc[n_lab - 1], horizon, ms, registry,
+            policy or RetrainPolicy()).items()}]
+    else:
+        fit = lambda sp, ms: _fit_classifier_folds(X, yv, sp, ms, X_cols, n_jobs=n_jobs, artifacts=artifacts)
+    probas = cascade_probas(fit, [(slice(0, n_lab), slice(n - 1, n))], models, cascade)[0]
+    last_proba = {name: float(probas[name][-1]) for name in models if name in probas}
+    summary = _summary(p, last_date, last_proba, list(models))
+    if warehouse:
+        from etl.warehouse import write_signals
+        write_signals([{"Datetime": last_date, "ticker": summary["ticker"],
+                        **{f"proba_{k}": v for k, v in last_proba.items()}, "proba_ens": summary["proba_ens"]}],
+                      db_path=warehouse)
+    return summary
+
 def _print_table(df: pd.DataFrame, color_pred: bool = True):
     df_print = df.copy()
     if not pd.api.types.is_datetime64_any_dtype(df_print["last_date"]):
         df_print["last_date"] = pd.to_datetime(df_print["last_date"], errors="coerce")
     df_print["FECHA"] = df_print["last_date"].dt.date.astype(str)
-    df_print["PROBA_UP (LOGREG)"] = df_print["proba_logreg"].map(_fmt_pct)
-    df_print["PROBA_UP (RF)"] = df_print["proba_rf"].map(_fmt_pct)
-    df_print["PROBA_UP (ENS)"] = df_print["proba_ens"].map(_fmt_pct)
+    proba_cols = [c for c in df_print.columns if c.startswith("proba_") and c != "proba_ens"] + ["proba_ens"]
+    labels = [f"PROBA_UP ({c[len('proba_'):].upper()})" for c in proba_cols]
+    for c, label in zip(proba_cols, labels):
+        df_print[label] = df_print[c].map(_fmt_pct)
     df_print["pred_col"] = df_print["pred"].map(_color_pred) if color_pred else df_print["pred"]
-    df_print = df_print[["ticker","FECHA","PROBA_UP (LOGREG)","PROBA_UP (RF)","PROBA_UP (ENS)","pred_col"]]
+    df_print = df_print[["ticker","FECHA", *labels, "pred_col"]]
     df_print = df_print.rename(columns={"pred_col":"pred"})
     rows = [list(df_print.columns)] + df_print.astype(str).values.tolist()
     widths = [max(len(r[i]) for r in rows) for i in range(len(rows[0]))]
@@ -151,49 +324,144 @@ def _print_table(df: pd.DataFrame, color_pred: bool = True):
 def run_folder(folder: Path = Path("data/raw"), pattern: str = "*_1d.csv", horizon: int = 1,
                initial_train: int | None = None, test_size: int = 200, top_n: int | None = 10,
                save_summary: bool = False, summary_path: Path = Path("models/prob_summary.csv"),
-               print_summary: bool = True, save_trace: bool = False, trace_dir: Path | None = None) -> Path | None:
+               print_summary: bool = True, save_trace: bool = False, trace_dir: Path | None = None,
+               warehouse: Path | None = None, fold_jobs: int | None = 1,
+               fold_cache: str | Path | None = None, warm: tuple = (),
+               artifacts: str | Path | None = None, resume: bool | str = False,
+               checkpoint_dir: str | Path = CHECKPOINT_DIR, mode: str = "walkforward",
+               registry: str | Path | None = None, policy: RetrainPolicy | None = None,
+               members: tuple = DEFAULT_MEMBERS, cascade: float | None = None,
+               progress_every: int | None = None,
+               horizons: tuple | None = None) -> Path | dict[int, Path | None] | None:
+    """``mode="walkforward"`` evaluates every window (traces, SIGNALS history); ``mode="nowcast"``
+    only fits once per ticker and scores the newest bar (daily signal job), reusing the models
+    versioned in ``registry`` until ``policy`` asks for a retrain. ``cascade`` (e.g. 0.05) only runs
+    the members after the first one where the first is within that band of 0.5.
+
+    Summaries stream into a ``Leaderboard`` (bounded heaps + incremental summary CSV), so memory
+    does not grow with the universe; ``progress_every`` prints the partial top tables every N tickers.
+
+    ``horizons`` (walk-forward only) trains every horizon in one pass per ticker
+    (``train_multi_horizon_file``) with one leaderboard and summary CSV (``<stem>_h<h>.csv``) per
+    horizon; ``{horizon: CSV path}`` is returned then (the CSV path otherwise)."""
+    if mode not in ("walkforward", "nowcast"):
+        raise ValueError(f"mode desconocido: {mode!r} (walkforward | nowcast)")
+    if horizons and mode != "walkforward":
+        raise ValueError("horizons solo está disponible en mode='walkforward'")
+    if mode == "nowcast" and save_trace:
+        logging.warning("run_folder: nowcast no escribe trazas ni historial de SIGNALS; usar mode='walkforward'")
+    horizons = sorted(set(int(h) for h in horizons)) if horizons else None
+    summary_path = Path(summary_path)
     folder = Path(folder)
-    summaries = []
-    for p in sorted(folder.glob(pattern)):
-        try:
-            summaries.append(train_one_file(p, horizon=horizon, initial_train=initial_train, test_size=test_size,
-                                            save_trace=save_trace, trace_dir=trace_dir))
-        except Exception as e:
-            print(f"⚠ Error con {p.name}: {e}")
-
-    if not summaries:
+    # checkpoint por ticker (models/runs/classification/<run_id>/): resume salta los ya resueltos
+    ckpt = RunCheckpoint.open("classification", resume=resume, root=checkpoint_dir)
+    ckpt.save_params(dict(folder=folder, pattern=pattern, horizon=horizon, initial_train=initial_train,
+                          test_size=test_size, warm=list(warm), mode=mode, members=list(members), cascade=cascade,
+                          horizons=horizons, save_trace=save_trace, trace_dir=trace_dir, warehouse=warehouse,
+                          registry=registry, policy=vars(policy) if policy else None))
+    done = ckpt.completed()
+    paths = {h: summary_path.with_name(f"{summary_path.stem}_h{h}{summary_path.suffix}") for h in horizons} \
+        if horizons else {None: summary_path}
+    boards = {h: Leaderboard(top_n, path=path if save_summary else None, columns=summary_columns(members))
+              for h, path in paths.items()}
+    for res in done.values():
+        if res:  # checkpoint multi-horizonte: {"<h>": resumen}
+            for h, summary in (res.items() if horizons else [(None, res)]):
+                boards[int(h) if horizons else None].add(summary)
+    if done:
+        print(f"↻ Reanudando {ckpt.run_id}: {len(done)} tickers ya completados")
+    art = ArtifactCache(artifacts) if artifacts else None
+    reg = ModelRegistry(registry) if registry else None
+    for p in dataset_paths(folder, pattern):
+        if p.name in done:
+            continue
+        with evicting(art):
+            try:
+                if mode == "nowcast":
+                    summary = nowcast_one_file(p, horizon=horizon, warehouse=warehouse, artifacts=art,
+                                               registry=reg, policy=policy, members=tuple(members),
+                                               cascade=cascade)
+                elif horizons:
+                    summary = train_multi_horizon_file(p, horizons=horizons, initial_train=initial_train,
+                                                       test_size=test_size, save_trace=save_trace, trace_dir=trace_dir,
+                                                       warehouse=warehouse, fold_jobs=fold_jobs,
+                                                       fold_cache=ckpt.fold_cache(fold_cache), artifacts=art,
+                                                       members=tuple(members), warm=tuple(warm), cascade=cascade)
+                else:
+                    summary = train_one_file(p, horizon=horizon, initial_train=initial_train, test_size=test_size,
+                                             save_trace=save_trace, trace_dir=trace_dir, warehouse=warehouse,
+                                             fold_jobs=fold_jobs, fold_cache=ckpt.fold_cache(fold_cache),
+                                             warm=tuple(warm), artifacts=art, members=tuple(members),
+                                             cascade=cascade)
+                results = summary if horizons else {None: summary}
+                for h, res in results.items():
+                    boards[h].add(res)
+                ckpt.record(p.name, {str(h): res for h, res in results.items()} if horizons else summary)
+                ckpt.append_rows(list(results.values()))
+                count = next(iter(boards.values())).count
+                if progress_every and print_summary and count % progress_every == 0:
+                    print(f"\n{ANSI_BOLD}--- parcial: {count} tickers ---{ANSI_RESET}")
+                    for h, board in boards.items():
+                        if h is not None:
+                            print(f"{ANSI_BOLD}[horizonte {h}]{ANSI_RESET}")
+                        print_leaderboard(board, confidence=False)
+            except Exception as e:
+                print(f"⚠ Error con {p.name}: {e}")
+                ckpt.record(p.name, error=f"{type(e).__name__}: {e}")
+    if not ckpt.failed():
+        ckpt.mark_complete()
+
+    if art is not None:
+        logging.info(art.report())
+
+    out = []
+    for h, board in boards.items():
+        board.close()
+        if h is not None and print_summary:
+            print(f"\n{ANSI_BOLD}##### HORIZONTE {h} #####{ANSI_RESET}")
+        out.append(_report_board(board, print_summary=print_summary, save_summary=save_summary, summary_path=paths[h]))
+    return dict(zip(horizons, out)) if horizons else out[0]
+
+def print_leaderboard(board: Leaderboard, confidence: bool = True) -> None:
+    top_n = board.top_n
+    tables = board.tables()
+    titles = [("up", f"=== TOP-{top_n} ALCISTAS (\"calls\") por PROBA_UP (ENS) ==="),
+              ("down", f"=== TOP-{top_n} BAJISTAS (\"puts\") por PROBA_UP (ENS) ===")]
+    if confidence:
+        titles.append(("confidence", "=== PROBABILIDADES (sube) — ordenadas por confianza ==="))
+    for key, title in titles:
+        print(f"\n{ANSI_BOLD}{title}{ANSI_RESET}")
+        if not tables[key].empty:
+            _print_table(tables[key])
+
+def _report_board(board: Leaderboard, print_summary: bool = True, save_summary: bool = False,
+                  summary_path: Path = Path("models/prob_summary.csv")) -> Path | None:
+    if not board.count:
         print("Sin resultados para clasificador.")
         return None
-
-    df = pd.DataFrame(summaries)
-    if "confidence" in df.columns:
-        df = df.sort_values("confidence", ascending=False).reset_index(drop=True)
-
     if print_summary:
-        top_up   = df.sort_values("proba_ens", ascending=False).head(top_n) if top_n else df
-        candidatos_down = df.sort_values("proba_ens", ascending=True)
-        top_down = candidatos_down[~candidatos_down["ticker"].isin(top_up["ticker"])].head(top_n) if top_n else candidatos_down
-
-        print(f"\n{ANSI_BOLD}=== TOP-{top_n} ALCISTAS (\"calls\") por PROBA_UP (ENS) ==={ANSI_RESET}")
-        _print_table(top_up)
-        print(f"\n{ANSI_BOLD}=== TOP-{top_n} BAJISTAS (\"puts\") por PROBA_UP (ENS) ==={ANSI_RESET}")
-        _print_table(top_down)
-        print(f"\n{ANSI_BOLD}=== PROBABILIDADES (sube) — ordenadas por confianza ==={ANSI_RESET}")
-        df_show = df.head(top_n) if (top_n is not None) else df
-        _print_table(df_show)
-
+        print_leaderboard(board)
     if save_summary:
-        summary_path.parent.mkdir(parents=True, exist_ok=True)
-        df.drop(columns=["confidence"]).to_csv(summary_path, index=False)
         print(f"\nResumen guardado en: {summary_path}")
-
     return summary_path if save_summary else None
 
+def report_summaries(summaries: list[dict], top_n: int | None = 10, print_summary: bool = True,
+                     save_summary: bool = False, summary_path: Path = Path("models/prob_summary.csv")) -> Path | None:
+    """Top-N up/down tables and the summary CSV from per-ticker ``train_one_file`` results."""
+    members = list(dict.fromkeys(k[len("proba_"):] for s in summaries for k in s
+                                 if k.startswith("proba_") and k != "proba_ens"))
+    with Leaderboard(top_n, path=summary_path if save_summary else None,
+                     columns=summary_columns(members) if members else None) as board:
+        board.extend(summaries)
+    return _report_board(board, print_summary=print_summary, save_summary=save_summary, summary_path=summary_path)
+
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--folder", type=str, default="data/raw")
     ap.add_argument("--pattern", type=str, default="*_1d.csv")
     ap.add_argument("--horizon", type=int, default=1)
+    ap.add_argument("--horizons", type=int, nargs="+", default=None,
+                    help="varios horizontes en una pasada (modelos multi-salida), p. ej. 1 5 20")
     ap.add_argument("--initial-train", type=int, default=None)
     ap.add_argument("--test-size", type=int, default=200)
     ap.add_argument("--top-n", type=int, default=10)
@@ -201,10 +469,43 @@ if __name__ == "__main__":
     ap.add_argument("--summary-path", type=str, default="models/prob_summary.csv")
     ap.add_argument("--save-trace", action="store_true")
     ap.add_argument("--trace-dir", type=str, default="models/traces")
+    ap.add_argument("--warehouse", type=str, default=None)
+    ap.add_argument("--fold-jobs", type=int, default=1, help="procesos para folds walk-forward (0 = uno por núcleo)")
+    ap.add_argument("--fold-cache", type=str, default=None, help="directorio de caché de folds (reentrenamiento incremental)")
+    ap.add_argument("--warm", nargs="*", default=[], help="modelos con warm start entre folds (p. ej. rf)")
+    ap.add_argument("--artifacts", type=str, default=None, help="directorio de estimadores ajustados (se reutilizan si los datos no cambian)")
+    ap.add_argument("--resume", nargs="?", const=True, default=False,
+                    help="continuar la última corrida incompleta (o el run_id indicado)")
+    ap.add_argument("--mode", choices=["walkforward", "nowcast"], default="walkforward",
+                    help="nowcast: un ajuste por ticker y solo la probabilidad de la última barra")
+    ap.add_argument("--members", nargs="+", default=list(DEFAULT_MEMBERS), choices=CLASSIFIERS,
+                    help="miembros del ensemble (p. ej. logreg hgb); el primero es el barato de la cascada")
+    ap.add_argument("--cascade", type=float, default=None,
+                    help="banda alrededor de 0.5: los demás miembros solo si el primero cae dentro (p. ej. 0.05)")
+    ap.add_argument("--progress-every", type=int, default=None, help="imprimir el top parcial cada N tickers")
+    ap.add_argument("--registry", type=str, default=None,
+                    help="registro de modelos (nowcast): solo se reentrena según la política")
+    ap.add_argument("--retrain-every", type=int, default=20, help="barras nuevas que fuerzan reentrenar (0 = nunca)")
+    ap.add_argument("--max-age-days", type=float, default=7.0, help="días de antigüedad que fuerzan reentrenar (0 = nunca)")
+    ap.add_argument("--drift", type=float, default=1.0, help="umbral de deriva de features (0 = desactivado)")
     args = ap.parse_args()
     run_folder(
         folder=Path(args.folder), pattern=args.pattern, horizon=args.horizon,
         initial_train=args.initial_train, test_size=args.test_size,
         top_n=args.top_n, save_summary=args.save_summary, summary_path=Path(args.summary_path),
         print_summary=True, save_trace=bool(args.save_trace), trace_dir=Path(args.trace_dir),
+        warehouse=Path(args.warehouse) if args.warehouse else None,
+        fold_jobs=args.fold_jobs or None,
+        fold_cache=args.fold_cache,
+        warm=tuple(args.warm),
+        artifacts=args.artifacts,
+        resume=args.resume,
+        mode=args.mode,
+        registry=args.registry,
+        members=tuple(args.members),
+        cascade=args.cascade,
+        progress_every=args.progress_every,
+        horizons=args.horizons,
+        policy=RetrainPolicy(every_bars=args.retrain_every or None, max_age_days=args.max_age_days or None,
+                             drift_threshold=args.drift or None),
     )
@@ -0,0 +1,170 @@
+"""Fused per-ticker training: one load and feature pass, shared walk-forward folds, both zoos.
+
+``train_all.run_for_file`` and ``train_direction.train_one_file`` each load the CSV, build a
+feature matrix and generate their own splits. Here the file is read once, the numeric matrix
+(inf → NaN) is built once and both targets are derived from it: the future ``ret`` for the
+regression zoo and the up/down label for the classifiers. Both zoos are fitted on one fold
+schedule over the raw rows (the regression folds are the same windows restricted to rows with
+complete features and target) and both outputs are written as the separate trainers do.
+
+Because the schedule is shared (classifier default ``initial_train``, regression ``embargo``
+applied to both), metrics differ slightly from running the two trainers separately.
+"""
+from __future__ import annotations
+import logging
+from pathlib import Path
+from typing import List
+import numpy as np
+import pandas as pd
+from etl.dataset_registry import dataset_paths
+from models.artifact_cache import ArtifactCache, evicting
+from models.checkpoint import DEFAULT_DIR as CHECKPOINT_DIR, RunCheckpoint
+from models.cv import walk_forward
+from models.datasets import load_frame
+from models.train_all import _emit_regression, _fit_regression_folds, _make_target, _regression_models
+from models.leaderboard import Leaderboard, summary_columns
+from models.train_direction import (DEFAULT_MEMBERS, _emit_classification, _fit_classifier_folds, _report_board,
+                                    classifier_models, feature_columns, make_label)
+
+def fused_schedule(n: int, initial_train: int, test_size: int, embargo: int = 0) -> List[tuple]:
+    """(train_stop, test_start, test_stop) over raw rows; the last window may be partial."""
+    return [(tr.stop, te.start, te.stop) for tr, te in walk_forward(n, initial_train, test_size, purge=embargo, min_train=0)]
+
+def train_fused_file(p: Path, metrics: List[dict], horizon: int = 1, initial_train: int | None = None,
+                     test_size: int = 200, embargo: int = 5, save_preds: bool = False,
+                     preds_dir: Path = Path("data/preds"), preds_format: str = "parquet", save_trace: bool = False,
+                     trace_dir: Path | None = None, warehouse: Path | None = None, run_id: str | None = None,
+                     n_jobs: int = -1, fold_jobs: int | None = 1, fold_cache: str | Path | None = None,
+                     warm: tuple = (), artifacts: str | Path | ArtifactCache | None = None,
+                     svr: str = "auto", svr_components: int = 300, members: tuple = DEFAULT_MEMBERS) -> dict:
+    """Regression metrics go to ``metrics``; returns the classifier summary (as ``train_one_file``)."""
+    df = load_frame(p)
+    if df.empty or "ret" not in df.columns:
+        raise ValueError("DataFrame vacío o sin columna 'ret'")
+    n = len(df)
+    F = df[feature_columns(df)].replace([np.inf, -np.inf], np.nan)  # una sola pasada de features
+    if initial_train is None:
+        initial_train = max(500, int(n * 0.6))
+    # el embargo cubre al menos el horizonte de la etiqueta (purga, models/cv.py)
+    schedule = fused_schedule(n, initial_train, test_size, max(embargo, horizon))
+
+    # --- clasificación: todas las filas (imputer), etiqueta sube/baja
+    Xc_df = F.dropna(axis=1, how="all")
+    if Xc_df.shape[1] == 0:
+        raise ValueError("Todas las columnas de features están vacías (NaN).")
+    Xc = np.ascontiguousarray(Xc_df.to_numpy(dtype=float))
+    yc = make_label(df, "ret", horizon=horizon).to_numpy(dtype=int)
+    cls_splits = [(slice(0, tr_stop), slice(te_start, te_stop)) for tr_stop, te_start, te_stop in schedule
+                  if tr_stop > 0 and len(np.unique(yc[:tr_stop])) >= 2]
+    cls_models = classifier_models(n_jobs=n_jobs, members=members)
+    probas = _fit_classifier_folds(Xc, yc, cls_splits, cls_models, list(Xc_df.columns), n_jobs=n_jobs,
+                                   fold_jobs=fold_jobs, fold_cache=fold_cache, warm=warm, artifacts=artifacts)
+    summary = _emit_classification(p, df, np.arange(n), yc, cls_splits, probas, list(cls_models),
+                                   save_trace=save_trace, trace_dir=trace_dir, warehouse=warehouse)
+
+    # --- regresión: mismas ventanas sobre las filas con features y objetivo completos
+    reg_cols = [c for c in F.columns if c != "ret"]
+    yr = _make_target(df, "ret", horizon=horizon)
+    valid = np.flatnonzero(F[reg_cols].notna().all(axis=1).to_numpy() & yr.notna().to_numpy())
+    if len(valid) < 300:
+        return summary
+    Xr = np.ascontiguousarray(F[reg_cols].to_numpy(dtype=float)[valid])
+    yrv = yr.to_numpy(dtype=float)[valid]
+    reg_splits = []
+    for tr_stop, te_start, te_stop in schedule:
+        a, b, c = np.searchsorted(valid, [tr_stop, te_start, te_stop])
+        if a > 1 and c > b:
+            reg_splits.append((slice(0, int(a)), slice(int(b), int(c))))
+    reg_models = _regression_models(n_jobs=n_jobs, svr=svr, n_rows=len(valid), svr_components=svr_components)
+    preds = _fit_regression_folds(Xr, yrv, reg_splits, reg_models, reg_cols, n_jobs=n_jobs, fold_jobs=fold_jobs,
+                                  fold_cache=fold_cache, warm=warm, artifacts=artifacts)
+    _emit_regression(p, df, df.index.values[valid], yrv, reg_splits, preds, list(reg_models), metrics,
+                     save_preds=save_preds, preds_dir=preds_dir, preds_format=preds_format,
+                     warehouse=warehouse, run_id=run_id)
+    return summary
+
+def run_fused_folder(folder: str | Path = "data/raw", pattern: str = "*_1d.csv",
+                     metrics_out: str = "models/metrics_full.csv", horizon: int = 1,
+                     initial_train: int | None = None, test_size: int = 200, embargo: int = 5,
+                     save_preds: bool = False, save_trace: bool = False, trace_dir: Path | None = None,
+                     warehouse: str | Path | None = None, top_n: int | None = 10, print_summary: bool = True,
+                     save_summary: bool = False, summary_path: Path = Path("models/prob_summary.csv"),
+                     fold_jobs: int | None = 1, fold_cache: str | Path | None = None, warm: tuple = (),
+                     artifacts: str | Path | None = None, svr: str = "auto", resume: bool | str = False,
+                     checkpoint_dir: str | Path = CHECKPOINT_DIR, members: tuple = DEFAULT_MEMBERS) -> str:
+    """Both trainers' outputs (metrics CSV, preds, traces, summary) in one pass per ticker."""
+    folder = Path(folder)
+    ckpt = RunCheckpoint.open("fused", resume=resume, root=checkpoint_dir)
+    ckpt.save_params(dict(folder=folder, pattern=pattern, horizon=horizon, initial_train=initial_train,
+                          test_size=test_size, embargo=embargo, warm=list(warm), svr=svr, members=list(members),
+                          save_preds=save_preds, save_trace=save_trace, trace_dir=trace_dir, warehouse=warehouse))
+    done = ckpt.completed()
+    metrics = [m for unit in done.values() for m in (unit or {}).get("metrics", [])]
+    board = Leaderboard(top_n, path=summary_path if save_summary else None, columns=summary_columns(members))
+    board.extend(unit["summary"] for unit in done.values() if unit and unit.get("summary"))
+    art = ArtifactCache(artifacts) if artifacts else None
+    wh = Path(warehouse) if warehouse else None
+    for p in dataset_paths(folder, pattern):
+        if p.name in done:
+            continue
+        file_metrics: List[dict] = []
+        with evicting(art):
+            try:
+                summary = train_fused_file(p, file_metrics, horizon=horizon, initial_train=initial_train,
+                                           test_size=test_size, embargo=embargo, save_preds=save_preds,
+                                           save_trace=save_trace, trace_dir=trace_dir, warehouse=wh, run_id=ckpt.run_id,
+                                           fold_jobs=fold_jobs, fold_cache=ckpt.fold_cache(fold_cache), warm=tuple(warm),
+                                           artifacts=art, svr=svr, members=tuple(members))
+            except Exception as e:
+                logging.exception(f"train_fused: falló {p.name}")
+                ckpt.record(p.name, error=f"{type(e).__name__}: {e}")
+                continue
+        metrics.extend(file_metrics); board.add(summary)
+        ckpt.record(p.name, {"metrics": file_metrics, "summary": summary}); ckpt.append_rows(file_metrics)
+    if not ckpt.failed():
+        ckpt.mark_complete()
+    if art is not None:
+        logging.info(art.report())
+    out = Path(metrics_out); out.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(metrics).to_csv(out, index=False)
+    board.close()
+    _report_board(board, print_summary=print_summary, save_summary=save_summary, summary_path=summary_path)
+    return str(out)
+
+def main():
+    import argparse
+    from models.train_direction import CLASSIFIERS
+    ap = argparse.ArgumentParser(description="Regresión + clasificación en una sola pasada por ticker")
+    ap.add_argument("--folder", type=str, default="data/raw")
+    ap.add_argument("--pattern", type=str, default="*_1d.csv")
+    ap.add_argument("--metrics-out", type=str, default="models/metrics_full.csv")
+    ap.add_argument("--horizon", type=int, default=1)
+    ap.add_argument("--initial-train", type=int, default=None)
+    ap.add_argument("--test-size", type=int, default=200)
+    ap.add_argument("--embargo", type=int, default=5)
+    ap.add_argument("--save-preds", action="store_true")
+    ap.add_argument("--save-trace", action="store_true")
+    ap.add_argument("--trace-dir", type=str, default="models/traces")
+    ap.add_argument("--warehouse", type=str, default=None)
+    ap.add_argument("--top-n", type=int, default=10)
+    ap.add_argument("--save-summary", action="store_true")
+    ap.add_argument("--summary-path", type=str, default="models/prob_summary.csv")
+    ap.add_argument("--fold-jobs", type=int, default=1, help="procesos para folds walk-forward (0 = uno por núcleo)")
+    ap.add_argument("--fold-cache", type=str, default=None)
+    ap.add_argument("--artifacts", type=str, default=None)
+    ap.add_argument("--svr", choices=["auto", "exact", "nystroem"], default="auto")
+    ap.add_argument("--members", nargs="+", default=list(DEFAULT_MEMBERS), choices=CLASSIFIERS)
+    ap.add_argument("--resume", nargs="?", const=True, default=False,
+                    help="continuar la última corrida incompleta (o el run_id indicado)")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    print(run_fused_folder(folder=args.folder, pattern=args.pattern, metrics_out=args.metrics_out,
+                           horizon=args.horizon, initial_train=args.initial_train, test_size=args.test_size,
+                           embargo=args.embargo, save_preds=args.save_preds, save_trace=args.save_trace,
+                           trace_dir=Path(args.trace_dir), warehouse=args.warehouse, top_n=args.top_n,
+                           save_summary=args.save_summary, summary_path=Path(args.summary_path),
+                           fold_jobs=args.fold_jobs or None, fold_cache=args.fold_cache, artifacts=args.artifacts,
+                           svr=args.svr, resume=args.resume, members=tuple(args.members)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Pooled (panel) direction classifier: one model per fold for the whole ticker universe.
+
+``train_direction`` fits every member per ticker and fold (N × folds × members fits on small
+training sets). Here all tickers' features are stacked into one panel sorted by ``Datetime``,
+optionally with one-hot ticker and sector encodings, and the walk-forward runs over dates:
+each fold fits one model per member on every ticker's history before the cutoff and scores
+all tickers of the test window with a single batched ``predict_proba``.
+
+Because the panel is date-sorted, a fold's train rows are a prefix and its test rows the next
+block, so the folds are plain slices and go through the same fold / artifact caches and
+shared preprocessing as the per-ticker trainer. Only feature columns present in every file
+are used.
+"""
+from __future__ import annotations
+import argparse
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List
+import numpy as np
+import pandas as pd
+from etl.dataset_registry import dataset_paths
+from models.artifact_cache import ArtifactCache
+from models.cv import walk_forward
+from models.features import add_cross_sectional_features
+from models.leaderboard import Leaderboard, summary_columns
+from models.train_direction import (CLASSIFIERS, DEFAULT_MEMBERS, _fit_classifier_folds, _report_board, _summary,
+                                    classifier_models, feature_columns, load_df, make_label)
+
+def load_sectors(sectors: str | Path | Dict[str, str] | None) -> Dict[str, str]:
+    """``{ticker: sector}`` from a dict or a CSV with ``ticker,sector`` columns."""
+    if sectors is None or isinstance(sectors, dict):
+        return dict(sectors or {})
+    df = pd.read_csv(sectors)
+    df.columns = [c.lower() for c in df.columns]
+    if not {"ticker", "sector"} <= set(df.columns):
+        raise ValueError(f"{sectors}: se esperan columnas 'ticker' y 'sector'")
+    return dict(zip(df["ticker"].astype(str), df["sector"].astype(str)))
+
+def load_panel(paths: Iterable[Path], horizon: int = 1, encode_ticker: bool = False,
+               sectors: str | Path | Dict[str, str] | None = None,
+               cross_sectional: bool = False) -> tuple[pd.DataFrame, np.ndarray, np.ndarray, list[str]]:
+    """(index frame ``Datetime/ticker/file``, X, label, feature columns) of the stacked universe.
+
+    Rows are sorted by (``Datetime``, ticker); encodings are appended as ``tk_<ticker>`` and
+    ``sector_<sector>`` columns (tickers missing from ``sectors`` get ``sector_other``).
+    ``cross_sectional`` (re)computes the ``cs_*`` features over the loaded universe first."""
+    loaded = {}
+    for p in paths:
+        df = load_df(p)
+        if df.empty or "ret" not in df.columns:
+            logging.warning(f"panel: {p.name} vacío o sin 'ret', se omite")
+            continue
+        loaded[p] = df
+    if cross_sectional:
+        loaded = add_cross_sectional_features(loaded)
+    frames, cols = [], None
+    for p, df in loaded.items():
+        fc = feature_columns(df)
+        df = df.assign(file=p.name, ticker=p.stem.split("_")[0], _label=make_label(df, "ret", horizon=horizon))
+        cols = fc if cols is None else [c for c in cols if c in set(fc)]  # solo las comunes a todos
+        frames.append(df)
+    if not frames:
+        raise ValueError("Sin ficheros válidos para el panel")
+    panel = pd.concat([f[["Datetime", "ticker", "file", "_label", *cols]] for f in frames], ignore_index=True)
+    panel = panel.sort_values(["Datetime", "ticker"], kind="stable", ignore_index=True)
+    X_df = panel[cols].replace([np.inf, -np.inf], np.nan).dropna(axis=1, how="all")
+    if X_df.shape[1] == 0:
+        raise ValueError("Todas las columnas de features están vacías (NaN).")
+    blocks = [X_df]
+    if encode_ticker:
+        blocks.append(pd.get_dummies(panel["ticker"], prefix="tk", dtype=float))
+    if sectors is not None:
+        sector = panel["ticker"].map(load_sectors(sectors)).fillna("other")
+        blocks.append(pd.get_dummies(sector, prefix="sector", dtype=float))
+    X_df = pd.concat(blocks, axis=1)
+    X = np.ascontiguousarray(X_df.to_numpy(dtype=float))
+    return panel[["Datetime", "ticker", "file"]], X, panel["_label"].to_numpy(dtype=int), list(X_df.columns)
+
+def panel_splits(dates: pd.Series, y: np.ndarray, initial_train: int | None = None,
+                 test_size: int = 200, purge: int = 0) -> List[tuple]:
+    """Walk-forward over distinct dates as row slices of the date-sorted panel.
+
+    ``initial_train`` / ``test_size`` / ``purge`` count dates (the per-ticker windows when every
+    ticker shares the calendar); folds whose train rows hold a single class are skipped."""
+    codes, uniq = pd.factorize(dates, sort=True)
+    if initial_train is None:
+        initial_train = max(500, int(len(uniq) * 0.6))
+    splits = []
+    for tr, te in walk_forward(len(uniq), initial_train, test_size, purge=purge):
+        a, b, c = (int(i) for i in np.searchsorted(codes, [tr.stop, te.start, te.stop]))
+        if c > b and len(np.unique(y[:a])) >= 2:
+            splits.append((slice(0, a), slice(b, c)))
+    return splits
+
+def train_panel(paths: Iterable[Path], horizon: int = 1, initial_train: int | None = None, test_size: int = 200,
+                members: tuple = DEFAULT_MEMBERS, encode_ticker: bool = False,
+                sectors: str | Path | Dict[str, str] | None = None, cross_sectional: bool = False,
+                n_jobs: int = -1, fold_jobs: int | None = 1,
+                fold_cache: str | Path | None = None,
+                artifacts: str | Path | ArtifactCache | None = None) -> tuple[pd.DataFrame, List[dict]]:
+    """(out-of-sample scores, per-ticker summaries).
+
+    Scores hold one row per tested (date, ticker) with ``y``, ``proba_<member>`` and
+    ``proba_ens``; summaries are those of ``train_one_file`` (each ticker's newest scored bar)."""
+    index, X, y, X_cols = load_panel(paths, horizon=horizon, encode_ticker=encode_ticker, sectors=sectors,
+                                     cross_sectional=cross_sectional)
+    splits = panel_splits(index["Datetime"], y, initial_train=initial_train, test_size=test_size, purge=horizon)
+    if not splits:
+        raise ValueError("Panel demasiado corto para el walk-forward (initial_train en fechas)")
+    models = classifier_models(n_jobs=n_jobs, members=members)
+    fold_probas = _fit_classifier_folds(X, y, splits, models, X_cols, n_jobs=n_jobs, fold_jobs=fold_jobs,
+                                        fold_cache=fold_cache, artifacts=artifacts)
+    tested = np.concatenate([np.arange(te.start, te.stop) for _, te in splits])
+    scores = index.iloc[tested].reset_index(drop=True).assign(y=y[tested])
+    for name in models:
+        scores[f"proba_{name}"] = np.concatenate([pr[name] for pr in fold_probas])
+    scores["proba_ens"] = np.clip(scores[[f"proba_{m}" for m in models]].mean(axis=1), 0, 1)
+
+    # resumen por ticker: su última barra puntuada (los tickers que terminan antes, en un fold anterior)
+    last = scores.groupby("ticker", sort=True).tail(1)
+    summaries = [_summary(Path(r["file"]), r["Datetime"], {m: float(r[f"proba_{m}"]) for m in models})
+                 for _, r in last.iterrows()]
+    return scores, summaries
+
+def run_panel(folder: str | Path = "data/raw", pattern: str = "*_1d.csv", horizon: int = 1,
+              initial_train: int | None = None, test_size: int = 200, members: tuple = DEFAULT_MEMBERS,
+              encode_ticker: bool = False, sectors: str | Path | Dict[str, str] | None = None,
+              cross_sectional: bool = False, top_n: int | None = 10, print_summary: bool = True,
+              save_summary: bool = False, summary_path: Path = Path("models/prob_summary.csv"),
+              save_scores: bool = False, scores_path: Path = Path("models/panel_scores.csv"), fold_jobs: int | None = 1,
+              fold_cache: str | Path | None = None, artifacts: str | Path | None = None) -> Path | None:
+    """``train_direction.run_folder`` with one pooled model per fold; same leaderboard / summary CSV."""
+    paths = dataset_paths(Path(folder), pattern)
+    art = ArtifactCache(artifacts) if artifacts else None
+    scores, summaries = train_panel(paths, horizon=horizon, initial_train=initial_train, test_size=test_size,
+                                    members=tuple(members), encode_ticker=encode_ticker, sectors=sectors,
+                                    cross_sectional=cross_sectional,
+                                    fold_jobs=fold_jobs, fold_cache=fold_cache, artifacts=art)
+    if save_scores:
+        scores_path = Path(scores_path); scores_path.parent.mkdir(parents=True, exist_ok=True)
+        scores.to_csv(scores_path, index=False)
+    if art is not None:
+        art.enforce_limit()
+        logging.info(art.report())
+    summary_path = Path(summary_path)
+    with Leaderboard(top_n, path=summary_path if save_summary else None, columns=summary_columns(members)) as board:
+        board.extend(summaries)
+    return _report_board(board, print_summary=print_summary, save_summary=save_summary, summary_path=summary_path)
+
+def main():
+    ap = argparse.ArgumentParser(description="Clasificador de dirección agrupado (panel de todos los tickers)")
+    ap.add_argument("--folder", type=str, default="data/raw")
+    ap.add_argument("--pattern", type=str, default="*_1d.csv")
+    ap.add_argument("--horizon", type=int, default=1)
+    ap.add_argument("--initial-train", type=int, default=None, help="fechas iniciales de entrenamiento")
+    ap.add_argument("--test-size", type=int, default=200, help="fechas por ventana de test")
+    ap.add_argument("--members", nargs="+", default=list(DEFAULT_MEMBERS), choices=CLASSIFIERS)
+    ap.add_argument("--ticker-encoding", action="store_true", help="añadir one-hot del ticker")
+    ap.add_argument("--sectors", type=str, default=None, help="CSV ticker,sector para one-hot de sector")
+    ap.add_argument("--cross-sectional", action="store_true",
+                    help="recalcular cs_rank_* / cs_z_* / cs_res_* sobre el universo cargado")
+    ap.add_argument("--top-n", type=int, default=10)
+    ap.add_argument("--save-summary", action="store_true")
+    ap.add_argument("--summary-path", type=str, default="models/prob_summary.csv")
+    ap.add_argument("--save-scores", action="store_true", help="guardar todas las probabilidades fuera de muestra")
+    ap.add_argument("--scores-path", type=str, default="models/panel_scores.csv")
+    ap.add_argument("--fold-jobs", type=int, default=1, help="procesos para folds walk-forward (0 = uno por núcleo)")
+    ap.add_argument("--fold-cache", type=str, default=None)
+    ap.add_argument("--artifacts", type=str, default=None)
+    args = ap.parse_args()
+    run_panel(folder=args.folder, pattern=args.pattern, horizon=args.horizon, initial_train=args.initial_train,
+              test_size=args.test_size, members=tuple(args.members), encode_ticker=args.ticker_encoding,
+              sectors=args.sectors, cross_sectional=args.cross_sectional, top_n=args.top_n,
+              save_summary=args.save_summary, summary_path=Path(args.summary_path), save_scores=args.save_scores, scores_path=Path(args.scores_path),
+              fold_jobs=args.fold_jobs or None, fold_cache=args.fold_cache, artifacts=args.artifacts)
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,9 @@ import numpy as np
 import pandas as pd
 
 from models.features import add_technical_features, make_supervised
-from models.cv import ExpandingWindowSplit
+from models.cv import CombinatorialPurgedSplit, ExpandingWindowSplit, cross_validate, take
 from models.metrics import regression_metrics
+from models.datasets import load_frame
 
 # Lazy imports to keep deps optional
 from sklearn.pipeline import Pipeline
@@ -22,10 +23,26 @@ except Exception:
     HAS_XGB = False
 
 def load_df(p: Path) -> pd.DataFrame:
-    df = pd.read_csv(p, parse_dates=["Datetime"]).sort_values("Datetime").reset_index(drop=True)
-    return df
+    return load_frame(p)
 
-def objective_svr(trial: optuna.Trial, df: pd.DataFrame, target: str="ret", horizon: int=1, lags: int=5) -> float:
+def splitter(n: int, horizon: int = 1, cv: str = "expanding"):
+    """Three expanding walk-forward folds, or combinatorial purged CV (``cv="cpcv"``); both purged by ``horizon``."""
+    if cv == "cpcv":
+        return CombinatorialPurgedSplit(n_groups=6, n_test_groups=2, purge=horizon, embargo=horizon)
+    if cv != "expanding":
+        raise ValueError("cv desconocido: 'expanding' o 'cpcv'")
+    return ExpandingWindowSplit(n_splits=3, test_size=int(0.2*n), initial_train_size=max(300, int(0.6*n)),
+                                purge=horizon)
+
+def cv_rmse(model, X: np.ndarray, y: np.ndarray, horizon: int = 1, cv: str = "expanding") -> float:
+    """Mean out-of-sample RMSE over the folds of ``splitter`` (``models.cv.cross_validate``)."""
+    X = np.ascontiguousarray(X, dtype=float); y = np.asarray(y, dtype=float)
+    folds = list(splitter(len(y), horizon, cv).split(len(y)))
+    preds = cross_validate({"model": model}, X, y, folds)
+    return float(np.mean([np.sqrt(np.mean((p["model"] - take(y, te))**2)) for p, (_, te) in zip(preds, folds)]))
+
+def objective_svr(trial: optuna.Trial, df: pd.DataFrame, target: str="ret", horizon: int=1, lags: int=5,
+                  cv: str="expanding") -> float:
     C = trial.suggest_float("C", 0.1, 100.0, log=True)
     eps = trial.suggest_float("epsilon", 1e-4, 0.5, log=True)
     gamma = trial.suggest_categorical("gamma", ["scale","auto"])
@@ -35,22 +52,11 @@ def objective_svr(trial: optuna.Trial, df: pd.DataFrame, target: str="ret", hori
     y_col = f"y_{target}_t+{horizon}"
     X = df_f.drop(columns=["Datetime","Ticker","Interval", y_col], errors="ignore").values
     y = df_f[y_col].values
-    n = len(df_f)
-    initial_train = max(300, int(0.6*n))
-    splitter = ExpandingWindowSplit(n_splits=3, test_size=int(0.2*n), initial_train_size=initial_train)
-
     pipe = Pipeline([("scaler", StandardScaler()), ("model", SVR(C=C, epsilon=eps, gamma=gamma))])
-    rmses = []
-    for tr, te in splitter.split(n):
-        X_tr, X_te = X[tr], X[te]
-        y_tr, y_te = y[tr], y[te]
-        pipe.fit(X_tr, y_tr)
-        y_hat = pipe.predict(X_te)
-        rmse = float(((y_hat - y_te)**2).mean()**0.5)
-        rmses.append(rmse)
-    return float(np.mean(rmses))
+    return cv_rmse(pipe, X, y, horizon=horizon, cv=cv)
 
-def objective_xgb(trial: optuna.Trial, df: pd.DataFrame, target: str="ret", horizon: int=1, lags: int=5) -> float:
+def objective_xgb(trial: optuna.Trial, df: pd.DataFrame, target: str="ret", horizon: int=1, lags: int=5,
+                  cv: str="expanding") -> float:
     if not HAS_XGB:
         raise optuna.TrialPruned()
     params = dict(
@@ -71,32 +77,19 @@ def objective_xgb(trial: optuna.Trial, df: pd.DataFrame, target: str="ret", hori
     y_col = f"y_{target}_t+{horizon}"
     X = df_f.drop(columns=["Datetime","Ticker","Interval", y_col], errors="ignore").values
     y = df_f[y_col].values
-    n = len(df_f)
-    initial_train = max(300, int(0.6*n))
-    splitter = ExpandingWindowSplit(n_splits=3, test_size=int(0.2*n), initial_train_size=initial_train)
-
-    rmses = []
-    for tr, te in splitter.split(n):
-        X_tr, X_te = X[tr], X[te]
-        y_tr, y_te = y[tr], y[te]
-        model = XGBRegressor(**params)
-        model.fit(X_tr, y_tr)
-        y_hat = model.predict(X_te)
-        rmse = float(((y_hat - y_te)**2).mean()**0.5)
-        rmses.append(rmse)
-    return float(np.mean(rmses))
+    return cv_rmse(XGBRegressor(**params), X, y, horizon=horizon, cv=cv)
 
 def tune_file(csv_path: str | Path, model: str = "svr", n_trials: int = 30,
-              target: str="ret", horizon: int=1, lags: int=5) -> Path:
+              target: str="ret", horizon: int=1, lags: int=5, cv: str="expanding") -> Path:
     p = Path(csv_path)
     df = load_df(p)
     study = optuna.create_study(direction="minimize")
     if model == "svr":
-        study.optimize(lambda tr: objective_svr(tr, df, target, horizon, lags), n_trials=n_trials)
+        study.optimize(lambda tr: objective_svr(tr, df, target, horizon, lags, cv), n_trials=n_trials)
     elif model == "xgb":
         if not HAS_XGB:
             raise RuntimeError("xgboost not available")
-        study.optimize(lambda tr: objective_xgb(tr, df, target, horizon, lags), n_trials=n_trials)
+        study.optimize(lambda tr: objective_xgb(tr, df, target, horizon, lags, cv), n_trials=n_trials)
     else:
         raise ValueError("Unknown model: choose 'svr' or 'xgb'")
     out = Path("models")/f"best_params_{model}_{p.stem}.json"
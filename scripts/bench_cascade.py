@@ -0,0 +1,66 @@
+"""Benchmark: cascaded ensemble (cheap member first, expensive ones only near 0.5) vs the full ensemble.
+
+Nowcast screen over a synthetic universe; reports time, share of tickers escalated to the
+expensive members and ranking agreement with the full ensemble (Spearman, top-N overlap).
+"""
+import argparse
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from models.train_direction import nowcast_one_file
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--tickers", type=int, default=30)
+ap.add_argument("--rows", type=int, default=1500)
+ap.add_argument("--bands", type=float, nargs="*", default=[0.02, 0.05, 0.1, 0.2])
+ap.add_argument("--members", nargs="+", default=["logreg", "rf"])
+ap.add_argument("--top-n", type=int, default=5)
+args = ap.parse_args()
+warnings.filterwarnings("ignore")
+
+def write_universe(folder: Path) -> list:
+    rng = np.random.default_rng(7)
+    paths = []
+    for k in range(args.tickers):
+        n = args.rows
+        F = rng.normal(size=(n, 8))
+        beta = rng.normal(0, 0.004, 8)
+        ret = np.r_[0.0, F[:-1] @ beta + 0.5 * np.tanh(F[:-1, 0] * F[:-1, 1]) * 0.004 + rng.normal(0, 0.01, n - 1)]
+        df = pd.DataFrame(F, columns=[f"f{i}" for i in range(8)])
+        df.insert(0, "Datetime", pd.date_range("2015-01-01", periods=n, freq="D", tz="UTC"))
+        df.insert(1, "Ticker", f"T{k:03d}")
+        df["ret"] = ret
+        p = folder / f"T{k:03d}_1d.csv"; df.to_csv(p, index=False); paths.append(p)
+    return paths
+
+def screen(paths: list, band) -> tuple:
+    t = time.perf_counter()
+    rows = [nowcast_one_file(p, n_jobs=1, members=tuple(args.members), cascade=band) for p in paths]
+    return pd.DataFrame(rows).set_index("ticker"), time.perf_counter() - t
+
+def overlap(a: pd.Series, b: pd.Series, ascending: bool) -> float:
+    top = lambda s: set(s.sort_values(ascending=ascending).head(args.top_n).index)
+    return len(top(a) & top(b)) / args.top_n
+
+with tempfile.TemporaryDirectory() as tmp:
+    paths = write_universe(Path(tmp))
+    full, t_full = screen(paths, None)
+    report = [{"band": "completo", "seconds": round(t_full, 2), "escalated": 1.0, "spearman": 1.0,
+               "top_up": 1.0, "top_down": 1.0, "same_pred": 1.0}]
+    expensive = [f"proba_{m}" for m in args.members[1:]]
+    for band in args.bands:
+        cas, secs = screen(paths, band)
+        report.append({"band": band, "seconds": round(secs, 2),
+                       "escalated": round(float(cas.reindex(columns=expensive).notna().all(axis=1).mean()), 3),
+                       "spearman": round(float(full["proba_ens"].corr(cas["proba_ens"], method="spearman")), 3),
+                       "top_up": overlap(full["proba_ens"], cas["proba_ens"], False),
+                       "top_down": overlap(full["proba_ens"], cas["proba_ens"], True),
+                       "same_pred": round(float((full["pred"] == cas["pred"]).mean()), 3)})
+print(f"{args.tickers} tickers × {args.rows} filas, miembros {'+'.join(args.members)}, top-{args.top_n}")
+print(pd.DataFrame(report).to_string(index=False))
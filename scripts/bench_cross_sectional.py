@@ -0,0 +1,62 @@
+"""Benchmark: cross-sectional features on a (date × ticker) matrix vs pandas long-format groupby.
+
+Synthetic universe with staggered listing dates; the baseline stacks every ticker and uses
+``groupby("Datetime")`` rank / mean / std transforms (market residuals without beta), and
+the matrix version is ``models.features.add_cross_sectional_features``. Results are compared.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from models.features import add_cross_sectional_features
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--tickers", type=int, nargs="+", default=[100, 500, 2000])
+ap.add_argument("--dates", type=int, default=1000)
+ap.add_argument("--out", type=str, default=None, help="CSV con el informe")
+args = ap.parse_args()
+COLS = ("ret", "rsi_14", "vol_20")
+
+def universe(n_tickers: int) -> dict:
+    rng = np.random.default_rng(3)
+    days = pd.date_range("2015-01-01", periods=args.dates, freq="D", tz="UTC")
+    frames = {}
+    for k in range(n_tickers):
+        d = days[rng.integers(0, args.dates // 4):]
+        frames[f"T{k:05d}"] = pd.DataFrame({"Datetime": d, "ret": rng.normal(0, 0.01, len(d)),
+                                            "rsi_14": rng.uniform(0, 100, len(d)),
+                                            "vol_20": rng.uniform(0.005, 0.03, len(d))})
+    return frames
+
+def groupby_baseline(frames: dict) -> dict:
+    long = pd.concat([df.assign(_t=t) for t, df in frames.items()], ignore_index=True)
+    g = long.groupby("Datetime")
+    for c in COLS:
+        mean = g[c].transform("mean")
+        long[f"cs_rank_{c}"] = (g[c].rank(method="first") - 1) / (g[c].transform("count") - 1)
+        long[f"cs_z_{c}"] = (long[c] - mean) / g[c].transform(lambda s: s.std(ddof=0))
+        long[f"cs_res_{c}"] = long[c] - mean
+    return {t: df.drop(columns="_t").reset_index(drop=True) for t, df in long.groupby("_t", sort=False)}
+
+rows = []
+for n in args.tickers:
+    frames = universe(n)
+    t = time.perf_counter(); base = groupby_baseline(frames); t_base = time.perf_counter() - t
+    t = time.perf_counter(); mat = add_cross_sectional_features(frames, cols=COLS, beta_window=None, min_tickers=1)
+    t_mat = time.perf_counter() - t
+    cs = [f"{p}{c}" for c in COLS for p in ("cs_rank_", "cs_z_", "cs_res_")]
+    err = max(float(np.nanmax(np.abs(base[k][cs].to_numpy() - mat[k][cs].to_numpy()))) for k in frames)
+    t = time.perf_counter(); add_cross_sectional_features(frames, cols=COLS, beta_window=60, min_tickers=1)
+    rows.append({"tickers": n, "rows": sum(len(df) for df in frames.values()), "groupby_s": round(t_base, 2),
+                 "matrix_s": round(t_mat, 2), "matrix_beta_s": round(time.perf_counter() - t, 2),
+                 "speedup": round(t_base / t_mat, 1), "max_abs_diff": err})
+    print(rows[-1])
+
+report = pd.DataFrame(rows)
+print(f"\n{args.dates} fechas\n" + report.to_string(index=False))
+if args.out:
+    report.to_csv(args.out, index=False)
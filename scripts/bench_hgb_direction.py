@@ -0,0 +1,53 @@
+"""Benchmark: RF vs tail-early-stopped HistGradientBoosting in the direction ensemble (time vs AUC)."""
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from models.train_direction import _fit_classifier_folds, _prepare, classifier_models, walk_forward_indices
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--file", type=str, default=None, help="CSV de data/raw (por defecto: datos sintéticos)")
+ap.add_argument("--rows", type=int, default=6000)
+ap.add_argument("--features", type=int, default=30)
+ap.add_argument("--test-size", type=int, default=200)
+ap.add_argument("--out", type=str, default=None, help="CSV con el informe")
+args = ap.parse_args()
+warnings.filterwarnings("ignore")
+
+if args.file:
+    _, X, y, cols = _prepare(Path(args.file))
+else:
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(args.rows, args.features))
+    X[rng.random(X.shape) < 0.01] = np.nan
+    Z = np.nan_to_num(X)
+    y = (0.3 * np.tanh(Z[:, 0] * Z[:, 1]) + 0.2 * Z[:, 2] + rng.normal(0, 1, args.rows) > 0).astype(int)
+    cols = [f"f{i}" for i in range(args.features)]
+
+n = len(y)
+splits = [(tr, te) for tr, te in walk_forward_indices(n, max(500, int(n * 0.6)), args.test_size)
+          if len(np.unique(y[tr])) >= 2]
+y_test = np.concatenate([y[te] for _, te in splits])
+
+rows = []
+for members in (("logreg", "rf"), ("logreg", "hgb"), ("logreg", "rf", "hgb"), ("rf",), ("hgb",)):
+    t = time.perf_counter()
+    probas = _fit_classifier_folds(X, y, splits, classifier_models(members=members), cols)
+    secs = time.perf_counter() - t
+    per_model = {m: np.concatenate([p[m] for p in probas]) for m in members}
+    ens = np.mean(list(per_model.values()), axis=0)
+    rows.append({"members": "+".join(members), "seconds": round(secs, 2),
+                 "auc_ens": round(float(roc_auc_score(y_test, ens)), 4),
+                 **{f"auc_{m}": round(float(roc_auc_score(y_test, v)), 4) for m, v in per_model.items()}})
+    print(rows[-1])
+
+report = pd.DataFrame(rows)
+print(f"\n{n} filas, {len(splits)} folds\n" + report.to_string(index=False))
+if args.out:
+    report.to_csv(args.out, index=False)
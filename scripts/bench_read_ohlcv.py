@@ -0,0 +1,52 @@
+"""Benchmark: pd.read_csv(parse_dates) vs etl.readers.read_ohlcv on ~10 years of minute bars."""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from etl.readers import read_ohlcv, HAS_PYARROW
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--rows", type=int, default=10 * 252 * 390)  # 10 años × 252 sesiones × 390 minutos
+ap.add_argument("--features", type=int, default=20)
+ap.add_argument("--repeat", type=int, default=3)
+args = ap.parse_args()
+
+rng = np.random.default_rng(42)
+n = args.rows
+close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-4, n)))
+df = pd.DataFrame({
+    "Datetime": pd.date_range("2015-01-02 14:30", periods=n, freq="min", tz="UTC"),
+    "Open": close, "High": close * 1.0005, "Low": close * 0.9995, "Close": close,
+    "Volume": rng.integers(1_000, 100_000, n).astype(float),
+})
+for i in range(args.features):
+    df[f"f_{i}"] = rng.normal(size=n)
+df["Ticker"] = "SPY"; df["Interval"] = "1m"
+
+path = Path(tempfile.mkdtemp()) / "SPY_1m.csv"
+df.to_csv(path, index=False)
+print(f"Archivo: {path} ({path.stat().st_size / 1e6:.0f} MB, {n} filas, {df.shape[1]} columnas) | pyarrow={HAS_PYARROW}")
+
+def best(fn) -> float:
+    times = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter(); fn(); times.append(time.perf_counter() - t0)
+    return min(times)
+
+cases = {
+    "pd.read_csv(parse_dates)": lambda: pd.read_csv(path, parse_dates=["Datetime"]),
+    "read_ohlcv (todas)": lambda: read_ohlcv(path),
+    "read_ohlcv (Datetime, Close, ret-like)": lambda: read_ohlcv(path, columns=["Datetime", "Close", "f_0"]),
+}
+base = None
+for name, fn in cases.items():
+    t = best(fn)
+    base = base or t
+    print(f"{name:<42} {t:7.2f}s  x{base / t:5.1f}")
+
+path.unlink()
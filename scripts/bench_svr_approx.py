@@ -0,0 +1,53 @@
+"""Benchmark: exact SVR vs Nystroem / random-Fourier kernel approximation (models.ml_models.approx_svr)."""
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVR
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from models.ml_models import approx_svr
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--rows", type=int, nargs="*", default=[1000, 2000, 4000, 8000, 16000])
+ap.add_argument("--features", type=int, default=20)
+ap.add_argument("--components", type=int, default=300)
+ap.add_argument("--exact-max", type=int, default=16000, help="no ajustar SVR exacto por encima de estas filas")
+ap.add_argument("--out", type=str, default=None, help="CSV con el informe")
+args = ap.parse_args()
+
+rng = np.random.default_rng(42)
+k = args.features
+beta = rng.normal(size=k)
+
+def make(n: int):
+    X = rng.normal(size=(n, k))
+    y = 0.01 * (np.tanh(X @ beta / np.sqrt(k)) + 0.3 * np.sin(2 * X[:, 0])) + rng.normal(0, 0.005, n)
+    return X, y
+
+X_te, y_te = make(2000)
+cases = {
+    "svr_exact": lambda: Pipeline([("scaler", StandardScaler()), ("m", SVR(C=10.0, epsilon=0.001))]),
+    "nystroem+ridge": lambda: approx_svr(args.components),
+    "nystroem+linsvr": lambda: approx_svr(args.components, final="linear_svr"),
+    "rff+ridge": lambda: approx_svr(args.components, method="rff"),
+}
+rows = []
+for n in args.rows:
+    X, y = make(n)
+    for name, build in cases.items():
+        if name == "svr_exact" and n > args.exact_max:
+            continue
+        t0 = time.perf_counter(); m = build().fit(X, y); t = time.perf_counter() - t0
+        rmse = float(np.sqrt(np.mean((m.predict(X_te) - y_te) ** 2)))
+        rows.append({"rows": n, "model": name, "fit_s": t, "rmse": rmse})
+        print(f"n={n:<6} {name:<16} {t:8.2f}s  rmse={rmse:.5f}")
+
+if args.out:
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(rows).to_csv(args.out, index=False)
+    print(f"Informe: {args.out}")
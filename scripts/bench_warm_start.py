@@ -0,0 +1,50 @@
+"""Benchmark: full refit per walk-forward fold vs warm start / partial_fit (models/incremental.py)."""
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from models.incremental import fit_predict_warm
+from models.ml_models import get_model_zoo
+from models.cv import fit_predict_fold
+from models.train_all import _walk_splits
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--rows", type=int, default=3000)
+ap.add_argument("--features", type=int, default=20)
+ap.add_argument("--test-size", type=int, default=200)
+ap.add_argument("--models", nargs="*", default=["rf", "hgb", "sgd"])
+ap.add_argument("--out", type=str, default=None, help="CSV con el informe")
+args = ap.parse_args()
+
+rng = np.random.default_rng(42)
+n, k = args.rows, args.features
+X = rng.normal(size=(n, k))
+beta = rng.normal(size=k) * (rng.random(k) < 0.5)
+y = X @ beta + 0.5 * np.sin(3 * X[:, 0]) + rng.normal(0, 1.0, n)
+arrays = {"X": np.ascontiguousarray(X), "y": y}
+folds = _walk_splits(n, test_size=args.test_size, initial_train=n // 3)
+zoo = get_model_zoo()
+print(f"{n} filas × {k} features, {len(folds)} folds")
+
+def rmse(preds: list, name: str) -> float:
+    err = np.concatenate([p[name] - y[te] for p, (_, te) in zip(preds, folds)])
+    return float(np.sqrt(np.mean(err ** 2)))
+
+rows = []
+for name in args.models:
+    models = {name: zoo[name]}
+    t0 = time.perf_counter(); cold = [fit_predict_fold(arrays, f, models) for f in folds]; t_cold = time.perf_counter() - t0
+    t0 = time.perf_counter(); warm = fit_predict_warm(arrays, folds, models); t_warm = time.perf_counter() - t0
+    rows += [{"model": name, "mode": "refit", "fit_s": t_cold, "rmse": rmse(cold, name)},
+             {"model": name, "mode": "warm", "fit_s": t_warm, "rmse": rmse(warm, name)}]
+    print(f"{name:<5} refit {t_cold:7.2f}s rmse={rows[-2]['rmse']:.4f} | "
+          f"warm {t_warm:7.2f}s rmse={rows[-1]['rmse']:.4f} | x{t_cold / t_warm:4.1f}")
+
+if args.out:
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(rows).to_csv(args.out, index=False)
+    print(f"Informe: {args.out}")
@@ -9,12 +9,14 @@ OUT.parent.mkdir(parents=True, exist_ok=True)
 
 df = pd.read_csv(SRC)
 # Normalizamos formato y orden
-df = df[["ticker","proba_logreg","proba_rf","proba_ens"]].copy()
+proba_cols = [c for c in df.columns if c.startswith("proba_") and c != "proba_ens"] + ["proba_ens"]
+df = df[["ticker", *proba_cols]].copy()
 df = df.sort_values("proba_ens", ascending=False).reset_index(drop=True)
 
-mat = df[["proba_logreg","proba_rf","proba_ens"]].to_numpy()
+mat = df[proba_cols].to_numpy()
 tickers = df["ticker"].tolist()
-cols = ["LogReg","RandomForest","Ensemble"]
+NAMES = {"logreg": "LogReg", "rf": "RandomForest", "hgb": "HistGB", "ens": "Ensemble"}
+cols = [NAMES.get(c[len("proba_"):], c[len("proba_"):]) for c in proba_cols]
 
 plt.figure(figsize=(8, max(4, 0.35*len(tickers))))
 plt.imshow(mat, aspect="auto", interpolation="nearest")
@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+@pytest.fixture
+def ticker_csv(tmp_path):
+    """``write(n)`` → ``(path, frame)`` of a synthetic random-walk ticker saved as ``tmp_path/TST_1d.csv``."""
+    def write(n: int = 300):
+        rng = np.random.default_rng(0)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        df = pd.DataFrame({"Datetime": pd.date_range("2020-01-01", periods=n, freq="D", tz="UTC"),
+                           "Ticker": "TST", "Close": close, "ret": np.r_[np.nan, np.diff(np.log(close))],
+                           "rsi_14": rng.uniform(0, 100, n), "sma_10": close})
+        p = tmp_path / "TST_1d.csv"; df.to_csv(p, index=False)
+        return p, df
+    return write
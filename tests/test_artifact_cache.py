@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from models.artifact_cache import ArtifactCache, evicting, map_folds_artifacts, store_fitted
+
+def _fit(arrays, fold, models, n_jobs=1, artifacts=None, features_fp=""):
+    tr, te = fold
+    out = {}
+    for name, model in models.items():
+        m = LinearRegression().fit(arrays["X"][tr], arrays["y"][tr])
+        store_fitted(artifacts, arrays, tr, model, m, features_fp)
+        out[name] = m.predict(arrays["X"][te])
+    return out
+
+def test_reload_on_unchanged_inputs(tmp_path):
+    rng = np.random.default_rng(0)
+    arrays = {"X": rng.normal(size=(80, 2)), "y": rng.normal(size=80)}
+    folds = [(slice(0, 40), slice(40, 60)), (slice(0, 60), slice(60, 80))]
+    first = map_folds_artifacts(_fit, arrays, folds, {"lr": LinearRegression()}, ArtifactCache(tmp_path))
+    cache = ArtifactCache(tmp_path)
+    again = map_folds_artifacts(_fit, arrays, folds, {"lr": LinearRegression()}, cache, features_fp="")
+    assert cache.hits == 2 and cache.hit_rate == 1.0
+    assert all(np.allclose(a["lr"], b["lr"]) for a, b in zip(first, again))
+    arrays["X"][10, 0] += 1.0  # datos cambiados → fallo
+    cache = ArtifactCache(tmp_path)
+    map_folds_artifacts(_fit, arrays, folds, {"lr": LinearRegression()}, cache)
+    assert cache.misses == 2
+
+def test_size_limit_evicts_oldest(tmp_path):
+    cache = ArtifactCache(tmp_path, max_bytes=1)
+    cache.save("aa" + "0" * 38, np.zeros(1000))
+    cache.save("bb" + "0" * 38, np.zeros(1000))
+    assert cache.enforce_limit() == 2 and cache.size_bytes() == 0
+    with pytest.raises(RuntimeError), evicting(cache):  # la pasada corre aunque el archivo falle
+        cache.save("cc" + "0" * 38, np.zeros(1000))
+        raise RuntimeError
+    assert cache.size_bytes() == 0
+    with evicting(None):
+        pass
@@ -0,0 +1,44 @@
+import pytest
+from models.checkpoint import RunCheckpoint
+
+def test_resume_skips_completed_and_retries_failed(tmp_path):
+    ckpt = RunCheckpoint.open("regression", root=tmp_path)
+    ckpt.record("A.csv", [{"rmse": 1.0}])
+    ckpt.record("B.csv", error="ValueError: boom")
+    with open(ckpt.dir / "units.jsonl", "a") as f:
+        f.write('{"unit": "C.csv", "ok": tr')  # proceso muerto a mitad de línea
+    again = RunCheckpoint.open("regression", resume=True, root=tmp_path)
+    assert again.run_id == ckpt.run_id
+    assert again.completed() == {"A.csv": [{"rmse": 1.0}]} and again.failed() == ["B.csv"]
+    again.mark_complete()
+    assert RunCheckpoint.latest_incomplete("regression", root=tmp_path) is None
+    ckpt.record("D.csv", [])
+    assert "D.csv" in RunCheckpoint(ckpt.run_id, "regression", root=tmp_path).completed()
+
+def test_resume_refuses_other_params_and_prefers_persistent_folds(tmp_path):
+    ckpt = RunCheckpoint.open("direction", root=tmp_path)
+    ckpt.save_params({"horizon": 1, "folder": tmp_path})
+    again = RunCheckpoint.open("direction", resume=True, root=tmp_path)
+    again.save_params({"horizon": 1, "folder": tmp_path})
+    with pytest.raises(ValueError, match="horizon"):
+        again.save_params({"horizon": 5, "folder": tmp_path})
+    assert again.fold_cache(tmp_path / "folds") == tmp_path / "folds" and again.fold_cache() == again.fold_dir
+
+def test_partial_rows_follow_the_first_header(tmp_path):
+    import pandas as pd
+    ckpt = RunCheckpoint.open("classification", root=tmp_path)
+    ckpt.append_rows([{"ticker": "A", "proba_logreg": 0.9, "proba_ens": 0.9, "pred": "UP"}])
+    ckpt.append_rows([{"ticker": "B", "proba_logreg": 0.52, "proba_rf": 0.3, "proba_ens": 0.41, "pred": "DOWN"}])
+    df = pd.read_csv(ckpt.dir / "partial.csv")
+    assert list(df.columns) == ["ticker", "proba_logreg", "proba_ens", "pred"]
+    assert df.iloc[1].tolist() == ["B", 0.52, 0.41, "DOWN"]
+
+def test_folder_resume_checks_every_output_setting(tmp_path):
+    from models.train_all import run_for_folder
+    kw = dict(folder=tmp_path, metrics_out=str(tmp_path / "m.csv"), checkpoint_dir=tmp_path / "runs", n_workers=1)
+    run_for_folder(svr_components=300, **kw)
+    run_id = next((tmp_path / "runs" / "regression").iterdir()).name
+    with pytest.raises(ValueError, match="svr_components"):
+        run_for_folder(svr_components=100, resume=run_id, **kw)
+    with pytest.raises(ValueError, match="save_preds"):
+        run_for_folder(save_preds=True, resume=run_id, **kw)
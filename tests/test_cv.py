@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from models.cv import (CombinatorialPurgedSplit, ExpandingWindowSplit, RollingWindowSplit, block_indices,
+                       cross_validate, purged_train, take, walk_forward)
+
+def test_walk_forward_slices_with_purge():
+    folds = walk_forward(1000, 600, 200, purge=5)
+    assert folds == [(slice(0, 595), slice(600, 800)), (slice(0, 795), slice(800, 1000))]
+    X = np.arange(20.0).reshape(10, 2)
+    assert np.shares_memory(take(X, folds[0][0]), X)  # una vista, sin índices
+    assert list(ExpandingWindowSplit(2, 200, 600, purge=5).split(1100)) == folds
+    assert list(RollingWindowSplit(300, 200, purge=5).split(1000)) == [(slice(0, 300), slice(305, 505)),
+                                                                        (slice(200, 500), slice(505, 705)),
+                                                                        (slice(400, 700), slice(705, 905))]
+
+def test_purged_train_drops_purge_and_embargo_around_each_block():
+    train = purged_train(100, (slice(20, 30), slice(60, 70)), purge=3, embargo=2)
+    assert train == (slice(0, 17), slice(32, 57), slice(72, 100))
+
+def test_combinatorial_purged_split_paths():
+    cv = CombinatorialPurgedSplit(n_groups=6, n_test_groups=2, purge=2, embargo=1)
+    folds = list(cv.split(120))
+    assert len(folds) == cv.n_splits == 15 and cv.n_paths == 5
+    tested = np.concatenate([block_indices(te) for _, te in folds])
+    assert (np.bincount(tested, minlength=120) == cv.n_paths).all()  # cada fila, una vez por camino
+    for tr, te in folds:
+        tr_i, te_i = block_indices(tr), block_indices(te)
+        assert not np.intersect1d(tr_i, te_i).size
+        gaps = np.abs(tr_i[:, None] - te_i[None, :]).min()
+        assert gaps >= 2
+    with pytest.raises(ValueError):
+        CombinatorialPurgedSplit(n_groups=3, n_test_groups=3)
+
+def test_cross_validate_matches_manual_fits():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 3)); y = X @ [1.0, -2.0, 0.5] + rng.normal(0, 0.1, 300)
+    cv = CombinatorialPurgedSplit(n_groups=5, n_test_groups=2, purge=3)
+    out = cross_validate({"lin": LinearRegression()}, X, y, cv, n_jobs=1)
+    for pred, (tr, te) in zip(out, cv.split(300)):
+        ref = LinearRegression().fit(take(X, tr), take(y, tr)).predict(take(X, te))
+        np.testing.assert_allclose(pred["lin"], ref)
+    fwd = walk_forward(300, 200, 50, purge=3)
+    assert len(cross_validate({"lin": LinearRegression()}, X, y, fwd, n_jobs=1)) == 2
+
+def test_train_all_walk_splits_keep_the_original_fold_count():
+    from models.train_all import _walk_splits
+    assert _walk_splits(800, test_size=200, embargo=5) == [(slice(0, 395), slice(400, 600))]
+    assert _walk_splits(300, test_size=200, embargo=5) == [(slice(0, 100), slice(100, 300))]  # sin folds: último bloque
@@ -0,0 +1,17 @@
+import pandas as pd
+from pathlib import Path
+from etl.dataset_registry import DatasetRegistry, dataset_paths
+from etl.load import stage_csv_idempotent
+
+def test_stage_registers_then_persists(tmp_path: Path):
+    reg = DatasetRegistry()
+    df = pd.DataFrame({"Datetime": pd.to_datetime(["2024-01-02","2024-01-01"], utc=True), "Close": [2.0, 1.0], "Ticker": ["SPY","SPY"]})
+    out = stage_csv_idempotent(df, tmp_path/"SPY_1d.csv", registry=reg)
+    assert reg.get(out)["Close"].tolist() == [1.0, 2.0]
+    assert [p.name for p in dataset_paths(tmp_path, "*_1d.csv", registry=reg)] == ["SPY_1d.csv"]
+    # una segunda carga se fusiona con el frame en memoria, no con el disco
+    more = pd.DataFrame({"Datetime": pd.to_datetime(["2024-01-03"], utc=True), "Close": [3.0], "Ticker": ["SPY"]})
+    stage_csv_idempotent(more, out, registry=reg)
+    assert reg.flush() == 0
+    assert pd.read_csv(out)["Close"].tolist() == [1.0, 2.0, 3.0]
+    reg.clear()
@@ -0,0 +1,18 @@
+import os
+import pandas as pd
+from pathlib import Path
+from models.datasets import load_frame, cache_info, clear_cache
+
+def test_load_frame_parses_once_until_file_changes(tmp_path: Path):
+    clear_cache()
+    p = tmp_path/"SPY_1d.csv"
+    pd.DataFrame({"Datetime": ["2024-01-02 00:00:00+00:00","2024-01-01 00:00:00+00:00"], "ret": [0.2, 0.1], "Ticker": "SPY"}).to_csv(p, index=False)
+    for _ in range(3):
+        df = load_frame(p)
+    assert df["ret"].tolist() == [0.1, 0.2]
+    assert load_frame(p, columns=["Datetime","ret"]).shape == (2, 2)
+    assert cache_info()["misses"] == 1
+    pd.DataFrame({"Datetime": ["2024-01-03 00:00:00+00:00"], "ret": [0.3], "Ticker": "SPY"}).to_csv(p, index=False)
+    os.utime(p, ns=(0, 10**18))
+    assert load_frame(p)["ret"].tolist() == [0.3]
+    assert cache_info()["misses"] == 2
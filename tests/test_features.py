@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from models.features import add_cross_sectional_features, cs_rank, cs_residual, cs_zscore
+
+def test_cross_sectional_ops_per_date():
+    M = np.array([[1.0, 3.0, 2.0, np.nan], [5.0, 5.0, 5.0, 5.0]])
+    assert np.allclose(cs_rank(M), [[0, 1, 0.5, np.nan], [0, 1 / 3, 2 / 3, 1]], equal_nan=True)
+    assert np.allclose(cs_zscore(M)[0, :3], (M[0, :3] - 2) / np.std([1, 3, 2]))
+    assert (cs_zscore(M)[1] == 0).all() and np.isnan(cs_zscore(M)[0, 3])
+    assert np.allclose(cs_residual(M)[0, :3], [-1, 1, 0])
+
+def test_cross_sectional_join_back(tmp_path):
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2020-01-01", periods=30, freq="D", tz="UTC")
+    frames = {t: pd.DataFrame({"Datetime": days[k:], "ret": rng.normal(0, 0.01, 30 - k)})
+              for k, t in enumerate(["A", "B", "C", "D"])}
+    out = add_cross_sectional_features(frames, cols=("ret", "rsi_14"), beta_window=10, min_tickers=3)
+    assert [c for c in out["D"].columns if c.startswith("cs_")] == ["cs_rank_ret", "cs_z_ret", "cs_res_ret"]
+    assert len(out["D"]) == 27 and out["D"]["cs_rank_ret"].notna().all()
+    assert (out["A"]["cs_rank_ret"].iloc[:2] == 0.5).all()  # menos de 3 tickers esas fechas: neutro
+    assert (out["A"][["cs_z_ret", "cs_res_ret"]].iloc[:2] == 0).all().all()
+    # sin look-ahead: cambiar la última fecha no toca las anteriores; recalcular reemplaza las columnas cs
+    frames["A"].loc[29, "ret"] = 1.0
+    again = add_cross_sectional_features({t: out[t] for t in frames} | {"A": frames["A"]}, cols=("ret",),
+                                         beta_window=10, min_tickers=3)
+    assert np.allclose(again["B"]["cs_res_ret"].iloc[:-1], out["B"]["cs_res_ret"].iloc[:-1], equal_nan=True)
+    assert list(again["B"].columns) == list(out["B"].columns)
+
+def test_cross_sectional_aligns_stock_and_crypto_on_the_trading_date():
+    rng = np.random.default_rng(1)
+    days = pd.date_range("2024-03-04", periods=20, freq="D")
+    stock_days = days[days.dayofweek < 5]
+    ny = stock_days.tz_localize("America/New_York").tz_convert("UTC")  # 05:00 / 04:00 UTC (cambio de hora)
+    frames = {t: pd.DataFrame({"Datetime": ny, "ret": rng.normal(0, 0.01, len(ny))}) for t in ("AAPL", "MSFT")}
+    frames["BTC-USD"] = pd.DataFrame({"Datetime": days.tz_localize("UTC"), "ret": rng.normal(0, 0.02, 20)})
+    out = add_cross_sectional_features(frames, cols=("ret",), beta_window=None, min_tickers=3)
+    btc = out["BTC-USD"].set_index(out["BTC-USD"]["Datetime"].dt.dayofweek)
+    assert btc.notna().all().all() and len(btc) == 20  # nada que descartar con dropna
+    assert (btc.loc[[5, 6], "cs_rank_ret"] == 0.5).all()  # fin de semana: solo cripto
+    assert btc.loc[[0, 1, 2, 3, 4], "cs_rank_ret"].isin([0.0, 0.5, 1.0]).all()
+    day = out["AAPL"]["cs_res_ret"].iloc[0] + out["MSFT"]["cs_res_ret"].iloc[0] + out["BTC-USD"]["cs_res_ret"].iloc[0]
+    assert abs(day) < 1e-12  # los tres en la misma fila: residuos contra la media suman 0
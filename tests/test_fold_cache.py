@@ -0,0 +1,27 @@
+import numpy as np
+from pathlib import Path
+from sklearn.linear_model import LinearRegression
+from models.fold_cache import FoldCache, map_folds_cached, prefix_digests
+
+def _fit(arrays, fold, models, n_jobs=1):
+    tr, te = fold
+    return {k: m.fit(arrays["X"][tr], arrays["y"][tr]).predict(arrays["X"][te]) for k, m in models.items()}
+
+def test_prefix_digests_are_incremental():
+    a = np.arange(20.0).reshape(10, 2)
+    d = prefix_digests(a, [4, 8])
+    assert d[4] == prefix_digests(a[:4], [4])[4]
+    assert d[8] != d[4]
+
+def test_only_new_folds_are_fitted(tmp_path: Path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(60, 3)); y = X @ [1.0, -2.0, 0.5]
+    models = {"lr": LinearRegression()}
+    folds = [(slice(0, 20), slice(20, 30)), (slice(0, 30), slice(30, 40))]
+    cache = FoldCache(tmp_path)
+    first = map_folds_cached(_fit, {"X": X[:40], "y": y[:40]}, folds, models, cache=cache)
+    cache = FoldCache(tmp_path)
+    folds.append((slice(0, 40), slice(40, 50)))
+    again = map_folds_cached(_fit, {"X": X[:50], "y": y[:50]}, folds, models, cache=cache)
+    assert cache.hits == 2 and cache.misses == 1
+    assert np.allclose(first[1]["lr"], again[1]["lr"])
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.svm import SVR
+from models.incremental import WarmStarter, fit_predict_warm, split_warm, warm_kind
+from models.ml_models import get_model_zoo
+
+def test_warm_kinds():
+    zoo = get_model_zoo()
+    assert warm_kind(zoo["rf"]) == "trees"
+    assert warm_kind(zoo["hgb"]) == "boost"
+    assert warm_kind(zoo["sgd"]) == "partial"
+    assert warm_kind(zoo["svr"]) is None
+    with pytest.raises(ValueError):
+        split_warm({"svr": SVR()}, ["svr"])
+
+def test_forest_grows_across_folds():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(120, 3)); y = X[:, 0] + rng.normal(0, 0.1, 120)
+    ws = WarmStarter(RandomForestRegressor(n_estimators=16, random_state=0), grow=4)
+    ws.fit(X, y, 60).fit(X, y, 90)
+    assert len(ws.model.estimators_) == 20
+    folds = [(slice(0, 60), slice(60, 90)), (slice(0, 90), slice(90, 120))]
+    out = fit_predict_warm({"X": X, "y": y}, folds, {"sgd": get_model_zoo()["sgd"]})
+    assert [len(o["sgd"]) for o in out] == [30, 30]
+
+def test_incremental_linear_matches_sklearn_and_rolls():
+    from sklearn.linear_model import LinearRegression, Ridge
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    from models.incremental import IncrementalLinear
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(600, 4)) * [1, 100, 1e6, 0.01] + [0, 500, 1e7, 0]
+    y = X @ [1, 0.02, 1e-6, 30] + rng.normal(size=600)
+    for alpha, ref in ((0.0, LinearRegression()), (2.0, Ridge(alpha=2.0))):
+        sk = make_pipeline(StandardScaler(), ref).fit(X, y)
+        m = IncrementalLinear(alpha=alpha).fit(X[:200], y[:200]).partial_fit(X[200:], y[200:])
+        assert np.allclose(sk.predict(X), m.predict(X), atol=1e-9)
+    ws = WarmStarter(IncrementalLinear(window=250))
+    for stop in (300, 450, 600):
+        ws.fit(X, y, stop)
+    sk = make_pipeline(StandardScaler(), LinearRegression()).fit(X[350:], y[350:])
+    assert np.allclose(sk.predict(X), ws.model.predict(X), atol=1e-9)
+
+def test_incremental_linear_multi_output_matches_per_column():
+    from models.incremental import IncrementalLinear
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(300, 3)); Y = np.column_stack([X @ [1, 2, 0], X @ [0, -1, 3]]) + rng.normal(size=(300, 2))
+    m = IncrementalLinear(alpha=1.0).fit(X[:100], Y[:100]).partial_fit(X[100:], Y[100:])
+    assert m.predict(X).shape == (300, 2)
+    for j in range(2):
+        assert np.allclose(m.predict(X)[:, j], IncrementalLinear(alpha=1.0).fit(X, Y[:, j]).predict(X), atol=1e-9)
+
+def test_trainer_zoo_exposes_incremental_members(tmp_path):
+    from models.train_all import _regression_models, run_for_file
+    models = _regression_models(n_jobs=1, members=("linreg", "sgd", "hgb"))
+    cold, warm = split_warm(models, ("sgd", "hgb"))
+    assert list(cold) == [] and sorted(warm) == ["hgb", "linreg", "sgd"]
+    with pytest.raises(ValueError):
+        _regression_models(members=("xgb",))
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"Datetime": pd.date_range("2020-01-01", periods=600, freq="D", tz="UTC"),
+                       "Ticker": "TST", "f0": rng.normal(size=600), "ret": rng.normal(0, 0.01, 600)})
+    p = tmp_path / "TST_1d.csv"; df.to_csv(p, index=False)
+    metrics = []
+    run_for_file(p, metrics, n_jobs=1, initial_train=300, members=("sgd", "hgb"), warm=("sgd", "hgb"))
+    assert {m["model"] for m in metrics} == {"sgd", "hgb"}
+
+def test_multi_horizon_warm_hgb_carries_one_booster_per_target(tmp_path):
+    from sklearn.multioutput import MultiOutputRegressor
+    from models.train_all import _multi_output, run_for_file
+    hgb = _multi_output(get_model_zoo()["hgb"])
+    assert warm_kind(hgb) == "boost"
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(120, 3)); Y = np.column_stack([X[:, 0], X[:, 1]]) + rng.normal(0, 0.1, (120, 2))
+    ws = WarmStarter(hgb, grow=10).fit(X, Y, 60).fit(X, Y, 90)
+    wrapper = ws.model.steps[-1][1]
+    assert isinstance(wrapper, MultiOutputRegressor)
+    assert [e.n_iter_ for e in wrapper.estimators_] == [210, 210]  # 200 + 10 en el mismo booster
+    df = pd.DataFrame({"Datetime": pd.date_range("2020-01-01", periods=600, freq="D", tz="UTC"),
+                       "Ticker": "TST", "f0": rng.normal(size=600), "ret": rng.normal(0, 0.01, 600)})
+    p = tmp_path / "TST_1d.csv"; df.to_csv(p, index=False)
+    metrics = []
+    run_for_file(p, metrics, n_jobs=1, initial_train=300, members=("hgb",), warm=("hgb",), horizons=(1, 5))
+    assert {(m["model"], m["horizon"]) for m in metrics} == {("hgb", 1), ("hgb", 5)}
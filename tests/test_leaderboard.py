@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+from models.leaderboard import Leaderboard, summary_columns
+
+def _summaries(n, seed=0):
+    rng = np.random.default_rng(seed)
+    p = rng.uniform(0.2, 0.8, n)
+    return [{"file": f"T{i}_1d.csv", "ticker": f"T{i}", "last_date": "2024-01-02", "proba_logreg": 0.5,
+             "proba_rf": float(v), "proba_ens": float(v), "pred": "UP" if v >= 0.5 else "DOWN",
+             "confidence": float(abs(v - 0.5))} for i, v in enumerate(p)]
+
+def test_heaps_match_full_sort(tmp_path):
+    rows = _summaries(500)
+    path = tmp_path / "summary.csv"
+    with Leaderboard(10, path=path, columns=summary_columns(["logreg", "rf"])) as board:
+        board.extend(rows)
+    t = board.tables()
+    df = pd.DataFrame(rows)
+    up = df.nlargest(10, "proba_ens")
+    down = df[~df["ticker"].isin(up["ticker"])].nsmallest(10, "proba_ens")
+    assert t["up"]["ticker"].tolist() == up["ticker"].tolist()
+    assert t["down"]["ticker"].tolist() == down["ticker"].tolist()
+    assert t["confidence"]["ticker"].tolist() == df.nlargest(10, "confidence")["ticker"].tolist()
+    written = pd.read_csv(path)
+    assert len(written) == 500 and "confidence" not in written.columns
+
+def test_down_excludes_up_in_small_universe():
+    board = Leaderboard(3).extend(_summaries(4))
+    t = board.tables()
+    assert len(t["up"]) == 3 and len(t["down"]) == 1
+    assert not set(t["up"]["ticker"]) & set(t["down"]["ticker"])
+
+def test_summary_csv_is_replaced_only_on_close(tmp_path):
+    path = tmp_path / "summary.csv"
+    path.write_text("ticker\nOLD\n")
+    board = Leaderboard(3, path=path)
+    board.extend(_summaries(5))
+    assert pd.read_csv(path)["ticker"].tolist() == ["OLD"]  # durante la corrida: el resumen anterior
+    board.close()
+    assert len(pd.read_csv(path)) == 5 and not path.with_suffix(".csv.tmp").exists()
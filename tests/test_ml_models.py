@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from models.ml_models import HGBTailClassifier, approx_svr
+from models.train_all import SVR_EXACT_MAX, _regression_models, _svr_model
+
+def test_approx_svr_fits_nonlinear_target():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 3)); y = np.sin(X[:, 0]) + 0.1 * X[:, 1]
+    for method in ("nystroem", "rff"):
+        assert approx_svr(100, method=method).fit(X, y).score(X, y) > 0.8
+    with pytest.raises(ValueError):
+        approx_svr(100, method="fourier")
+    with pytest.raises(ValueError):
+        approx_svr(100, final="svr")
+
+def test_svr_auto_switches_on_size():
+    assert "features" not in _svr_model("auto", SVR_EXACT_MAX).named_steps
+    assert "features" in _svr_model("auto", SVR_EXACT_MAX + 1).named_steps
+    assert list(_regression_models(n_jobs=1, n_rows=SVR_EXACT_MAX)) == ["linreg", "rf", "svr"]
+    assert list(_regression_models(n_jobs=1, n_rows=SVR_EXACT_MAX + 1)) == ["linreg", "rf", "svr_nys"]
+    assert "svr_nys" in _regression_models(n_jobs=1, svr="nystroem")
+    with pytest.raises(ValueError):
+        _svr_model("rbf")
+
+def test_hgb_tail_early_stopping_uses_last_rows():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 4)); X[rng.random(X.shape) < 0.05] = np.nan
+    y = (np.nan_to_num(X[:, 0]) + rng.normal(0, 0.5, 600) > 0).astype(int)
+    m = HGBTailClassifier(max_iter=200, n_iter_no_change=10).fit(X, y)
+    assert 1 <= m.best_iter_ <= 200 and m.model_.n_iter_ == m.best_iter_
+    assert m.predict_proba(X).shape == (600, 2) and (m.predict(X) == y).mean() > 0.7
+    # cola de una sola clase: sin parada temprana
+    y1 = y.copy(); y1[-90:] = 1
+    assert HGBTailClassifier(max_iter=15).fit(X, y1).best_iter_ == 15
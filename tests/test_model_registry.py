@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from models.model_registry import ModelRegistry, RetrainPolicy, training_metadata
+
+def _fit(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3)); y = (X[:, 0] > 0).astype(int)
+    return X, y, LogisticRegression().fit(X, y)
+
+def test_register_load_and_prune(tmp_path):
+    X, y, est = _fit()
+    reg = ModelRegistry(tmp_path, keep=2)
+    for _ in range(3):
+        reg.register("EURUSD=X_1d", "logreg", est, training_metadata(LogisticRegression(), X, list("abc"), 200, "t", 1, "nuevo"))
+    assert reg.versions("EURUSD=X_1d", "logreg") == [2, 3]
+    loaded, meta = reg.load("EURUSD=X_1d", "logreg")
+    assert meta["version"] == 3 and meta["n_rows"] == 200
+    np.testing.assert_allclose(loaded.predict_proba(X), est.predict_proba(X))
+
+def test_retrain_policy_reasons():
+    X, y, _ = _fit(260)
+    model = LogisticRegression()
+    meta = {**training_metadata(model, X, list("abc"), 250, "t", 1, "nuevo"),
+            "trained_at": datetime.now(timezone.utc).isoformat()}
+    pol = RetrainPolicy(every_bars=20, max_age_days=7, drift_threshold=1.0)
+    assert pol.reason(None, model, X, list("abc"), 250) == "nuevo"
+    assert pol.reason(meta, model, X, list("abc"), 255) is None
+    assert pol.reason(meta, model, X, list("abd"), 255) == "config"
+    assert pol.reason(meta, LogisticRegression(C=2), X, list("abc"), 255) == "config"
+    assert pol.reason(meta, model, X, list("abc"), 270) == "barras"
+    assert pol.reason(meta, model, X, list("abc"), 255, now=datetime.now(timezone.utc) + timedelta(days=8)) == "calendario"
+    Xd = X.copy(); Xd[250:] += 5.0
+    assert pol.reason(meta, model, Xd, list("abc"), 255) == "deriva"
+
+def test_retrain_policy_checks_the_horizon():
+    X, y, _ = _fit(260)
+    model = LogisticRegression()
+    meta = {**training_metadata(model, X, list("abc"), 250, "t", 5, "nuevo"),
+            "trained_at": datetime.now(timezone.utc).isoformat()}
+    pol = RetrainPolicy()
+    assert pol.reason(meta, model, X, list("abc"), 255, horizon=5) is None
+    assert pol.reason(meta, model, X, list("abc"), 255, horizon=1) == "config"
+
+def test_nowcast_keeps_one_registry_entry_per_horizon(tmp_path, ticker_csv):
+    from models.train_direction import nowcast_one_file
+    ticker_csv(300)
+    reg = ModelRegistry(tmp_path / "reg")
+    kw = dict(n_jobs=1, members=("logreg",), registry=reg)
+    first = nowcast_one_file(tmp_path / "TST_1d.csv", horizon=1, **kw)
+    nowcast_one_file(tmp_path / "TST_1d.csv", horizon=5, **kw)
+    again = nowcast_one_file(tmp_path / "TST_1d.csv", horizon=1, **kw)
+    assert reg.versions("TST_1d_h1", "logreg") == [1] and reg.versions("TST_1d_h5", "logreg") == [1]
+    assert reg.metadata("TST_1d_h1", "logreg")["horizon"] == 1
+    assert again["proba_logreg"] == first["proba_logreg"]
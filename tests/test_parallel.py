@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+from utils.parallel import SharedArrays, as_slice, attach_arrays, cpu_budget, map_folds
+
+def test_cpu_budget_never_oversubscribes():
+    assert cpu_budget(None, total=8) == (8, 1)
+    assert cpu_budget(3, total=8) == (3, 2)
+    assert cpu_budget(None, n_tasks=2, total=8) == (2, 4)
+
+def test_as_slice_and_shared_views():
+    assert as_slice(np.arange(3, 7)) == slice(3, 7)
+    with pytest.raises(ValueError):
+        as_slice(np.array([0, 2]))
+    X = np.arange(12.0).reshape(6, 2)
+    with SharedArrays(X=X) as shared:
+        view = attach_arrays(shared.spec)["X"][as_slice(np.arange(0, 3))]
+        assert np.array_equal(view, X[:3]) and not view.flags.writeable
+
+def test_map_folds_serial_keeps_order():
+    folds = [slice(0, 2), slice(2, 5)]
+    out = map_folds(lambda a, f, k: (a["y"][f].sum(), k), {"y": np.arange(5)}, folds, workers=1, k=7)
+    assert out == [(1, 7), (9, 7)]
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+from etl.pred_store import HAS_PYARROW, PredictionWriter, list_runs, read_predictions
+
+pytestmark = pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow no instalado")
+
+def test_buffered_writes_and_filtered_reads(tmp_path):
+    df = pd.DataFrame({"Datetime": pd.date_range("2024-01-01", periods=4, tz="UTC"),
+                       "Ticker": ["EURUSD=X", "EURUSD=X", "SPY", "SPY"], "model": ["rf", "svr", "rf", "rf"],
+                       "split": 0, "y_true": 0.1, "y_pred": 0.2})
+    with PredictionWriter("r1", root=tmp_path, buffer_rows=3) as w:
+        w.append(df, interval="1d")
+        w.append(df.assign(split=1), interval="1d")
+    assert w.written == 8 and list_runs(tmp_path) == ["r1"]
+    got = read_predictions(tmp_path, ticker="EURUSD=X", model="rf")
+    assert len(got) == 2 and set(got["split"]) == {0, 1} and (got["ticker"] == "EURUSD=X").all()
+    assert len(read_predictions(tmp_path, run_id="r1", model=["rf", "svr"])) == 8
+
+def test_backtest_store_keeps_intervals_apart(tmp_path, monkeypatch):
+    import models.backtest as bt
+    df = pd.DataFrame({"Datetime": pd.date_range("2024-01-01", periods=3, tz="UTC"), "Ticker": "SPY",
+                       "model": "rf", "split": 0, "y_true": 0.1, "y_pred": 0.2})
+    with PredictionWriter("r1", root=tmp_path) as w:
+        w.append(df, interval="1d")
+        w.append(df.assign(y_pred=-0.2), interval="1h")
+    calls = []
+    def fake(g, ticker, interval, **kw):
+        calls.append((ticker, interval, len(g)))
+        return pd.DataFrame({"strategy_ret": [0.0], "equity": [1.0], "bench": [1.0]})
+    monkeypatch.setattr(bt, "backtest_frame", fake)
+    out = bt.backtest_store(root=tmp_path)
+    assert sorted(calls) == [("SPY", "1d", 3), ("SPY", "1h", 3)] and list(out["interval"]) == ["1d", "1h"]
+
+def test_adhoc_run_gets_a_timestamp_run_id(tmp_path):
+    import re
+    import numpy as np
+    from models.train_all import run_for_file
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"Datetime": pd.date_range("2020-01-01", periods=400, freq="D", tz="UTC"),
+                       "Ticker": "TST", "f0": rng.normal(size=400), "ret": rng.normal(0, 0.01, 400)})
+    p = tmp_path / "TST_1d.csv"; df.to_csv(p, index=False)
+    run_for_file(p, [], n_jobs=1, members=("linreg",), save_preds=True, preds_dir=tmp_path)
+    runs = list_runs(tmp_path / "store")
+    assert len(runs) == 1 and re.fullmatch(r"\d{8}T\d{6}Z", runs[0])  # ordena junto a las corridas de carpeta
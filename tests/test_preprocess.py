@@ -0,0 +1,31 @@
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from models.preprocess import PrefixCache, fit_shared, shared_prefix
+
+def test_shared_prefix_matches_separate_fits():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4)); X[rng.random(X.shape) < 0.05] = np.nan
+    y = (np.nan_to_num(X[:, 0]) > 0).astype(int)
+    imp = SimpleImputer(strategy="median")
+    models = {
+        "logreg": Pipeline([("imputer", imp), ("scaler", StandardScaler()), ("clf", LogisticRegression())]),
+        "rf": Pipeline([("imputer", imp), ("clf", RandomForestClassifier(n_estimators=10, random_state=0))]),
+        "lr_mean": Pipeline([("imputer", SimpleImputer()), ("clf", LogisticRegression())]),
+    }
+    assert [shared_prefix(m) for m in models.values()] == [2, 1, 1]
+    for name, full, head, Xte in fit_shared(models, X[:200], y[:200], X[200:]):
+        ref = clone(models[name]).fit(X[:200], y[:200])
+        np.testing.assert_array_equal(head.predict_proba(Xte), ref.predict_proba(X[200:]))
+        np.testing.assert_array_equal(full.predict_proba(X[200:]), ref.predict_proba(X[200:]))
+
+def test_prefix_cache_fits_each_prefix_once():
+    X = np.arange(20.0).reshape(10, 2)
+    cache = PrefixCache(X[:8], X[8:])
+    steps = [("imputer", SimpleImputer(strategy="median")), ("scaler", StandardScaler())]
+    cache.transform(steps); cache.transform(steps[:1]); cache.transform(steps)
+    assert cache.fits == 2
@@ -0,0 +1,15 @@
+import pandas as pd
+from pathlib import Path
+from etl.readers import read_ohlcv
+
+def test_read_ohlcv_schema_and_projection(tmp_path: Path):
+    df = pd.DataFrame({
+        "Datetime": pd.to_datetime(["2024-01-01","2024-01-02"], utc=True),
+        "Close": [10, 11], "Volume": [100, 200], "ret": [None, 0.1],
+        "Ticker": ["AAPL","AAPL"], "Interval": ["1d","1d"],
+    })
+    p = tmp_path/"AAPL_1d.csv"; df.to_csv(p, index=False)
+    out = read_ohlcv(p)
+    assert str(out["Datetime"].dtype) == "datetime64[ns, UTC]"
+    assert out["Volume"].dtype == float and out["Ticker"].tolist() == ["AAPL","AAPL"]
+    assert list(read_ohlcv(p, columns=["Datetime","ret"]).columns) == ["Datetime","ret"]
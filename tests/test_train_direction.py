@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from models.train_direction import (classifier_models, ensemble_proba, nowcast_one_file, train_multi_horizon_file,
+                                    train_one_file)
+
+def test_nowcast_scores_newest_bar(ticker_csv):
+    p, df = ticker_csv()
+    s = nowcast_one_file(p, n_jobs=1)
+    assert s["ticker"] == "TST" and s["last_date"] == df["Datetime"].iloc[-1]
+    assert 0 <= s["proba_ens"] <= 1 and s["pred"] in ("UP", "DOWN")
+
+def test_members_and_n_way_ensemble():
+    assert list(classifier_models(members=("logreg", "hgb"))) == ["logreg", "hgb"]
+    with pytest.raises(ValueError):
+        classifier_models(members=("xgb",))
+    assert ensemble_proba({"logreg": 0.2, "rf": 0.6, "hgb": 0.7}) == pytest.approx(0.5)
+
+def test_cascade_only_escalates_undecided_splits():
+    calls = []
+    cheap = {0: 0.9, 1: 0.52, 2: 0.1}
+    def fit(splits, models):
+        calls.append((list(models), list(splits)))
+        return [{m: np.array([cheap[s] if m == "logreg" else 0.7]) for m in models} for s in splits]
+    from models.train_direction import cascade_probas
+    out = cascade_probas(fit, [0, 1, 2], {"logreg": None, "rf": None}, band=0.05)
+    assert calls == [(["logreg"], [0, 1, 2]), (["rf"], [1])]
+    assert [sorted(o) for o in out] == [["logreg"], ["logreg", "rf"], ["logreg"]]
+    assert len(cascade_probas(fit, [0], {"logreg": None, "rf": None}, band=None)[0]) == 2
+
+def test_multi_horizon_matches_single_horizon_runs(tmp_path, ticker_csv):
+    p, _ = ticker_csv(n=400)
+    kw = dict(initial_train=250, test_size=50, n_jobs=1, members=("logreg",))
+    multi = train_multi_horizon_file(p, horizons=(5, 1), save_trace=True, trace_dir=tmp_path, **kw)
+    assert sorted(multi) == [1, 5] and multi[5]["horizon"] == 5
+    for h in (1, 5):
+        # logreg no es multi-salida nativo: una regresión por etiqueta, igual que por separado
+        # (con la misma purga: la del horizonte más largo)
+        single = train_one_file(p, horizon=h, purge=5, **kw)
+        assert multi[h]["proba_logreg"] == pytest.approx(single["proba_logreg"])
+        assert (tmp_path / f"TST_1d_h{h}_trace.csv").exists()
+
+def test_anchored_folds_hit_the_fold_cache_after_new_bars(tmp_path, ticker_csv):
+    from models.fold_cache import FoldCache
+    p, df = ticker_csv(n=420)
+    kw = dict(initial_train=250, test_size=50, n_jobs=1, members=("logreg",))
+    df.iloc[:400].to_csv(p, index=False)
+    train_one_file(p, fold_cache=FoldCache(tmp_path / "folds"), **kw)
+    df.to_csv(p, index=False)  # 20 barras nuevas
+    cache = FoldCache(tmp_path / "folds")
+    train_one_file(p, fold_cache=cache, **kw)
+    # initial_train fijo: los folds cuyo train + test no cambian se reutilizan
+    assert cache.hits >= 2 and cache.misses <= 2
+
+def test_file_without_folds_gets_a_neutral_summary(ticker_csv):
+    p, _ = ticker_csv(n=400)  # initial_train por defecto = 500: ningún fold
+    s = train_one_file(p, n_jobs=1, members=("logreg", "rf"))
+    assert s["proba_logreg"] == s["proba_rf"] == s["proba_ens"] == 0.5
+    assert s["pred"] == "UP" and s["confidence"] == 0.0
+
+def test_cascade_summaries_keep_every_member_column(ticker_csv):
+    p, _ = ticker_csv(n=400)
+    s = train_one_file(p, initial_train=250, test_size=50, n_jobs=1, members=("logreg", "rf"), cascade=0.0)
+    # banda 0: rf nunca se escala, pero su columna existe (NaN) para el CSV parcial
+    assert list(k for k in s if k.startswith("proba_")) == ["proba_logreg", "proba_rf", "proba_ens"]
+    assert np.isnan(s["proba_rf"]) and s["proba_ens"] == s["proba_logreg"]
+
+def test_multi_horizon_run_folder_passes_cascade_and_returns_every_path(tmp_path, ticker_csv):
+    from models.train_direction import run_folder
+    p, _ = ticker_csv(n=400)
+    kw = dict(initial_train=250, test_size=50, n_jobs=1, members=("logreg", "rf"))
+    multi = train_multi_horizon_file(p, horizons=(1, 5), cascade=0.0, warm=("rf",), **kw)
+    assert all(np.isnan(multi[h]["proba_rf"]) for h in (1, 5))  # banda 0: rf nunca se escala
+    warm = train_multi_horizon_file(p, horizons=(1, 5), warm=("rf",), **kw)
+    assert all(0 <= warm[h]["proba_rf"] <= 1 for h in (1, 5))
+    out = run_folder(folder=tmp_path, pattern="TST_1d.csv", initial_train=250, test_size=50, members=("logreg",),
+                     horizons=(1, 5), save_summary=True, summary_path=tmp_path / "s.csv", print_summary=False,
+                     checkpoint_dir=tmp_path / "runs")
+    assert out == {1: tmp_path / "s_h1.csv", 5: tmp_path / "s_h5.csv"} and all(q.exists() for q in out.values())
@@ -0,0 +1,18 @@
+import pytest
+from models.train_direction import train_one_file
+from models.train_fused import fused_schedule, train_fused_file
+
+def test_fused_schedule_covers_tail_with_embargo():
+    assert fused_schedule(1000, 600, 200, embargo=5) == [(595, 600, 800), (795, 800, 1000)]
+    assert fused_schedule(950, 600, 200)[-1] == (800, 800, 950)
+
+def test_fused_file_matches_the_classifier_and_writes_metrics(tmp_path, ticker_csv):
+    p, _ = ticker_csv(500)
+    metrics = []
+    summary = train_fused_file(p, metrics, initial_train=350, test_size=50, embargo=5, svr="exact", n_jobs=1,
+                               members=("logreg",), save_trace=True, trace_dir=tmp_path)
+    # mismo calendario (purga = embargo) que el clasificador por separado
+    single = train_one_file(p, initial_train=350, test_size=50, purge=5, n_jobs=1, members=("logreg",))
+    assert summary["proba_logreg"] == pytest.approx(single["proba_logreg"])
+    assert (tmp_path / "TST_1d_trace.csv").exists()
+    assert {m["model"] for m in metrics} == {"linreg", "rf", "svr"} and all(m["n_test"] > 0 for m in metrics)
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from models.train_panel import load_panel, panel_splits, train_panel
+
+def _universe(tmp_path, n=120):
+    rng = np.random.default_rng(0)
+    paths = []
+    for k, start in enumerate(("2020-01-01", "2020-01-01", "2020-02-01")):
+        df = pd.DataFrame({"Datetime": pd.date_range(start, periods=n, freq="D", tz="UTC"), "Ticker": f"T{k}",
+                           "f0": rng.normal(size=n), "ret": rng.normal(0, 0.01, n)})
+        if k == 0:
+            df["extra"] = 1.0  # solo en un fichero: fuera del panel
+        p = tmp_path / f"T{k}_1d.csv"; df.to_csv(p, index=False); paths.append(p)
+    return paths
+
+def test_panel_is_date_sorted_with_encodings(tmp_path):
+    index, X, y, cols = load_panel(_universe(tmp_path), encode_ticker=True, sectors={"T0": "tech", "T1": "tech"})
+    assert cols == ["f0", "ret", "tk_T0", "tk_T1", "tk_T2", "sector_other", "sector_tech"]
+    assert index["Datetime"].is_monotonic_increasing and X.shape == (360, 7) and len(y) == 360
+    assert (X[index["ticker"].to_numpy() == "T2", cols.index("sector_other")] == 1).all()
+
+def test_panel_folds_are_date_slices(tmp_path):
+    paths = _universe(tmp_path)
+    index, _, y, _ = load_panel(paths)
+    splits = panel_splits(index["Datetime"], y, initial_train=100, test_size=20)
+    dates = index["Datetime"].to_numpy()
+    for tr, te in splits:
+        assert tr.stop == te.start and dates[tr.stop - 1] < dates[te.start]
+    scores, summaries = train_panel(paths, initial_train=100, test_size=20, members=("logreg",), n_jobs=1)
+    assert len(scores) == sum(te.stop - te.start for _, te in splits)
+    assert [s["ticker"] for s in summaries] == ["T0", "T1", "T2"]
+    # cada ticker resume su última barra puntuada (T2 termina un mes después)
+    assert summaries[2]["last_date"] > summaries[0]["last_date"]
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+from etl.validate import dedupe_and_validate
+
+def test_dedupe_keeps_last_and_sorts_per_ticker():
+    df = pd.DataFrame({
+        "Datetime": pd.to_datetime(["2024-01-03","2024-01-01","2024-01-02","2024-01-01","2024-01-02"], utc=True),
+        "Ticker": ["MSFT","MSFT","AAPL","MSFT","AAPL"],
+        "Close": [3.0, 1.0, 2.0, 1.5, 2.5],
+    })
+    out, rep = dedupe_and_validate(df)
+    assert out["Ticker"].tolist() == ["AAPL","MSFT","MSFT"]
+    assert out["Close"].tolist() == [2.5, 1.5, 3.0]
+    assert rep["duplicates"] == 2 and rep["out_of_order"] == 1
+
+def test_gaps_and_nat():
+    dt = pd.date_range("2024-01-01", periods=10, freq="D", tz="UTC").append(pd.DatetimeIndex(["2024-03-01"], tz="UTC"))
+    out, rep = dedupe_and_validate(pd.DataFrame({"Datetime": dt, "Ticker": "SPY"}))
+    assert rep["gaps"] == 1 and rep["median_step_s"] == 86400
+    bad = pd.DataFrame({"Datetime": [pd.Timestamp("2024-01-01", tz="UTC"), pd.NaT], "Ticker": ["SPY","SPY"]})
+    with pytest.raises(ValueError):
+        dedupe_and_validate(bad)
+
+def test_merge_with_datetime_only_keys_keeps_caller_subset(tmp_path):
+    from etl.load import merge_idempotent
+    df = pd.DataFrame({"Datetime": pd.to_datetime(["2024-01-01", "2024-01-01"], utc=True),
+                       "Ticker": ["AAPL", "MSFT"], "Close": [1.0, 2.0]})
+    # solo Datetime: la fila de MSFT reemplaza a la de AAPL (no se deduplica por ticker)
+    assert len(merge_idempotent(df, tmp_path / "x.csv", dedupe_keys=["Datetime"])) == 1
+    assert len(merge_idempotent(df, tmp_path / "x.csv")) == 2
@@ -0,0 +1,26 @@
+import pandas as pd
+from pathlib import Path
+from etl.warehouse import write_signals, write_predictions, query_signals, query_predictions, latest_signals
+
+def test_signals_roundtrip_and_latest(tmp_path: Path):
+    db = tmp_path/"wh.db"
+    rows = [
+        {"Datetime": pd.Timestamp("2024-01-02", tz="UTC"), "ticker": "AAPL", "proba_logreg": 0.6, "proba_rf": 0.4, "proba_ens": 0.5, "pred": "UP", "y_true_next": 1},
+        {"Datetime": pd.Timestamp("2024-01-03", tz="UTC"), "ticker": "AAPL", "proba_logreg": 0.7, "proba_rf": 0.3, "proba_ens": 0.45, "pred": "DOWN", "y_true_next": 0},
+    ]
+    assert write_signals(rows, db) == 6
+    # reinsertar es idempotente (clave ticker, datetime, model)
+    write_signals(rows, db)
+    sig = query_signals(db, ticker="AAPL", model="rf")
+    assert len(sig) == 2 and sig["proba_up"].tolist() == [0.4, 0.3]
+    last = latest_signals(db)
+    assert last.loc[0, "proba_ens"] == 0.45 and last.loc[0, "pred"] == "DOWN"
+
+def test_predictions_filter_by_run(tmp_path: Path):
+    db = tmp_path/"wh.db"
+    df = pd.DataFrame({"Datetime": pd.to_datetime(["2024-01-01","2024-01-02"], utc=True), "Ticker": ["SPY","SPY"],
+                       "model": ["rf","rf"], "split": [0,0], "y_true": [0.01,-0.02], "y_pred": [0.0,0.01]})
+    write_predictions(df, run_id="r1", db_path=db)
+    write_predictions(df, run_id="r2", db_path=db)
+    assert len(query_predictions(db, ticker="SPY")) == 4
+    assert len(query_predictions(db, run_id="r2", start="2024-01-02")) == 1
@@ -21,8 +21,20 @@ def load_config(path: str = "config.yaml") -> dict:
                 "bollinger":{"window":20,"k":2.0},
                 "atr_window":14,
                 "lags":[1,2,3,5],
+                "vol_window":20,
+                "cross_sectional":{"cols":["ret","rsi_14","vol_20"],"beta_window":60,"min_tickers":5},
             },
             "seed": 42,
+            "warehouse": "data/warehouse.db",
+            "svr": "auto",
+            "initial_train": 500,
+            "fold_cache": "models/cache/folds",
+            "artifacts": None,
+            "fused": False,
+            "signal_mode": "nowcast",
+            "registry": "models/registry",
+            "classifiers": ["logreg", "rf"],
+            "cascade_band": None,
         }
     with open(p, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
@@ -0,0 +1,119 @@
+"""CPU budgeting for process pools (workers × threads-per-worker never exceeds the cores)
+and fold-level parallelism over shared-memory arrays."""
+from __future__ import annotations
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Sequence
+import numpy as np
+try:
+    from threadpoolctl import threadpool_limits  # sklearn dependency
+    HAS_THREADPOOLCTL = True
+except Exception:
+    HAS_THREADPOOLCTL = False
+
+_THREAD_ENV = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+               "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+def available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Windows / macOS
+        return os.cpu_count() or 1
+
+def cpu_budget(n_workers: int | None = None, n_tasks: int | None = None, total: int | None = None) -> tuple[int, int]:
+    """Returns (workers, threads_per_worker). ``n_workers=None`` uses one worker per core."""
+    total = total or available_cpus()
+    workers = total if n_workers is None or n_workers <= 0 else min(n_workers, total)
+    if n_tasks is not None:
+        workers = max(1, min(workers, n_tasks))
+    return workers, max(1, total // workers)
+
+def limit_threads(n_threads: int) -> None:
+    """Caps BLAS/OpenMP pools in the current process (env for late imports + threadpoolctl for loaded libs)."""
+    for var in _THREAD_ENV:
+        os.environ[var] = str(n_threads)
+    if HAS_THREADPOOLCTL:
+        threadpool_limits(limits=n_threads)
+
+def process_pool(n_workers: int, n_threads: int) -> ProcessPoolExecutor:
+    # nunca "fork": el padre ya tiene hilos de OpenMP/joblib y el hijo puede bloquearse
+    ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+    return ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx, initializer=limit_threads, initargs=(n_threads,))
+
+def as_slice(idx) -> slice:
+    """Contiguous index arrays (walk-forward folds) as slices, so ``X[s]`` is a view, not a copy."""
+    if isinstance(idx, slice):
+        return idx
+    idx = np.asarray(idx)
+    if len(idx) == 0:
+        return slice(0, 0)
+    if idx[-1] - idx[0] + 1 != len(idx) or (len(idx) > 1 and (np.diff(idx) != 1).any()):
+        raise ValueError("Índices de fold no contiguos")
+    return slice(int(idx[0]), int(idx[-1]) + 1)
+
+class SharedArrays:
+    """Copies arrays once into ``multiprocessing.shared_memory``; workers attach by name via ``spec``."""
+    def __init__(self, **arrays: np.ndarray):
+        self._shms: List[shared_memory.SharedMemory] = []
+        self.spec: Dict[str, tuple] = {}
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self._shms.append(shm)
+            self.spec[name] = (shm.name, arr.shape, arr.dtype.str)
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for shm in self._shms:
+            shm.close(); shm.unlink()
+        self._shms = []
+
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+def attach_arrays(spec: Dict[str, tuple]) -> Dict[str, np.ndarray]:
+    out = {}
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = _attached.get(shm_name)
+        if shm is None:
+            shm = _attached[shm_name] = shared_memory.SharedMemory(name=shm_name)
+        arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        arr.flags.writeable = False
+        out[name] = arr
+    return out
+
+def _fold_task(fn: Callable, spec: Dict[str, tuple], fold, kwargs: dict):
+    return fn(attach_arrays(spec), fold, **kwargs)
+
+def map_folds(fn: Callable, arrays: Dict[str, np.ndarray], folds: Sequence, workers: int | None = 1,
+              on_result: Callable[[int, object], None] | None = None, **kwargs) -> list:
+    """Runs ``fn(arrays, fold, **kwargs)`` per fold and returns results in fold order.
+
+    With ``workers > 1`` (None = one per core) the arrays are placed once in shared memory,
+    each worker process fits on zero-copy views and ``n_jobs`` is overridden with the
+    worker's thread budget; otherwise folds run in-process with ``kwargs`` unchanged.
+    ``on_result(i, result)`` is called as each fold finishes (e.g. to checkpoint it).
+    """
+    n_workers, threads = cpu_budget(workers, n_tasks=len(folds))
+    if n_workers <= 1:
+        out = []
+        for i, f in enumerate(folds):
+            out.append(fn(arrays, f, **kwargs))
+            if on_result is not None:
+                on_result(i, out[-1])
+        return out
+    with SharedArrays(**arrays) as shared:
+        with process_pool(n_workers, threads) as pool:
+            futures = {pool.submit(_fold_task, fn, shared.spec, f, {**kwargs, "n_jobs": threads}): i
+                       for i, f in enumerate(folds)}
+            out: list = [None] * len(folds)
+            for fut in as_completed(futures):
+                i = futures[fut]
+                out[i] = fut.result()
+                if on_result is not None:
+                    on_result(i, out[i])
+            return out